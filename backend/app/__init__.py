@@ -27,6 +27,10 @@ def create_app(config_name=None):
     """Application factory pattern"""
     app = Flask(__name__)
     
+    # Serialize responses with the fast JSON provider (orjson when available)
+    from app.utils.json_provider import FastJSONProvider
+    app.json = FastJSONProvider(app)
+    
     # Configuration
     if config_name is None:
         config_name = os.getenv('FLASK_ENV', 'development')
@@ -48,6 +52,30 @@ def create_app(config_name=None):
     jwt.init_app(app)
     limiter.init_app(app)
     
+    # Cache tenant (Business) lookups keyed by JWT identity
+    from app.utils.tenant import tenant_cache
+    tenant_cache.init_app(app)
+    
+    # Cache the authenticated user's role and active flag keyed by JWT identity
+    from app.utils.current_user import user_cache
+    user_cache.init_app(app)
+    
+    # Serve mock data from memory, reloading files when they change
+    from app.utils.mockdata import mock_store
+    mock_store.init_app(app)
+    
+    # Count SQL statements and database time per request
+    from app.utils.query_stats import query_instrumentation
+    query_instrumentation.init_app(app)
+    
+    # Prometheus request, status and pool metrics at /metrics
+    from app.utils.metrics import request_metrics
+    request_metrics.init_app(app)
+    
+    # Hash passwords at the configured cost with bounded concurrency
+    from app.utils.passwords import password_hasher
+    password_hasher.init_app(app)
+    
     # Configure CORS - More permissive for development
     cors_origins = app.config.get('CORS_ORIGINS', [
         'http://localhost:3000',  # Frontend
@@ -71,7 +99,9 @@ def create_app(config_name=None):
     from app.routes.payroll import payroll_bp
     from app.routes.users import users_bp
     from app.routes.businesses import businesses_bp
+    from app.routes.dashboard import dashboard_bp
     from app.routes.mockdata import mockdata_bp
+    from app.routes.health import health_bp
     
     app.register_blueprint(auth_bp, url_prefix='/api/v1/auth')
     app.register_blueprint(invoices_bp, url_prefix='/api/v1/invoices')
@@ -83,7 +113,10 @@ def create_app(config_name=None):
     app.register_blueprint(payroll_bp, url_prefix='/api/v1/payroll')
     app.register_blueprint(users_bp, url_prefix='/api/v1/users')
     app.register_blueprint(businesses_bp, url_prefix='/api/v1/businesses')
+    app.register_blueprint(dashboard_bp, url_prefix='/api/v1/dashboard')
     app.register_blueprint(mockdata_bp)  # No prefix for mockdata routes
+    app.register_blueprint(health_bp, url_prefix='/health')
+    limiter.exempt(health_bp)  # Polled every second by orchestration
     
     # Error handlers
     @app.errorhandler(404)
@@ -2,11 +2,12 @@ from .user import User
 from .business import Business
 from .invoice import Invoice, InvoiceItem
 from .expense import Expense, ExpenseCategory
-from .wallet import Wallet, Transaction
+from .wallet import Wallet, Transaction, BalanceCheckpoint, TransactionArchive
 from .payment import Payment
 from .tax import TaxRecord, TaxPeriod
 from .credit import CreditProfile, CreditScore
 from .payroll import Payroll, Employee
+from .dashboard import DashboardAggregate
 
 __all__ = [
     'User',
@@ -17,11 +18,14 @@ __all__ = [
     'ExpenseCategory',
     'Wallet',
     'Transaction',
+    'BalanceCheckpoint',
+    'TransactionArchive',
     'Payment',
     'TaxRecord',
     'TaxPeriod',
     'CreditProfile',
     'CreditScore',
     'Payroll',
-    'Employee'
+    'Employee',
+    'DashboardAggregate'
 ] 
\ No newline at end of file
@@ -7,6 +7,10 @@ class Business(db.Model):
     """Business model for multi-tenant architecture"""
     
     __tablename__ = 'businesses'
+    __table_args__ = (
+        # Composite index backing keyset pagination
+        db.Index('ix_businesses_created', 'created_at', 'id'),
+    )
     
     id = db.Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     name = db.Column(db.String(255), nullable=False)
@@ -57,42 +61,47 @@ class Business(db.Model):
     payrolls = db.relationship('Payroll', backref='business', lazy='dynamic')
     employees = db.relationship('Employee', backref='business', lazy='dynamic')
     
-    def to_dict(self):
-        """Convert business to dictionary"""
+    @staticmethod
+    def serialize(source):
+        """Build the business dictionary from an instance or a result row"""
         return {
-            'id': str(self.id),
-            'name': self.name,
-            'legal_name': self.legal_name,
-            'business_type': self.business_type,
-            'industry': self.industry,
-            'tax_id': self.tax_id,
-            'registration_number': self.registration_number,
+            'id': source.id,
+            'name': source.name,
+            'legal_name': source.legal_name,
+            'business_type': source.business_type,
+            'industry': source.industry,
+            'tax_id': source.tax_id,
+            'registration_number': source.registration_number,
             'address': {
-                'line_1': self.address_line_1,
-                'line_2': self.address_line_2,
-                'city': self.city,
-                'state': self.state,
-                'postal_code': self.postal_code,
-                'country': self.country
+                'line_1': source.address_line_1,
+                'line_2': source.address_line_2,
+                'city': source.city,
+                'state': source.state,
+                'postal_code': source.postal_code,
+                'country': source.country
             },
             'contact': {
-                'phone': self.phone,
-                'website': self.website,
-                'email': self.email
+                'phone': source.phone,
+                'website': source.website,
+                'email': source.email
             },
             'financial': {
-                'currency': self.currency,
-                'fiscal_year_start': self.fiscal_year_start.isoformat() if self.fiscal_year_start else None,
-                'tax_year': self.tax_year
+                'currency': source.currency,
+                'fiscal_year_start': source.fiscal_year_start,
+                'tax_year': source.tax_year
             },
-            'settings': self.settings,
-            'is_active': self.is_active,
-            'subscription_plan': self.subscription_plan,
-            'subscription_status': self.subscription_status,
-            'owner_id': str(self.owner_id),
-            'created_at': self.created_at.isoformat() if self.created_at else None,
-            'updated_at': self.updated_at.isoformat() if self.updated_at else None
+            'settings': source.settings,
+            'is_active': source.is_active,
+            'subscription_plan': source.subscription_plan,
+            'subscription_status': source.subscription_status,
+            'owner_id': source.owner_id,
+            'created_at': source.created_at,
+            'updated_at': source.updated_at
         }
     
+    def to_dict(self):
+        """Convert business to dictionary"""
+        return self.serialize(self)
+    
     def __repr__(self):
         return f'<Business {self.name}>' 
\ No newline at end of file
@@ -110,34 +110,39 @@ class CreditProfile(db.Model):
         self.lending_readiness_score = min(100, max(0, int(readiness)))
         return self.lending_readiness_score
     
-    def to_dict(self):
-        """Convert credit profile to dictionary"""
+    @staticmethod
+    def serialize(source):
+        """Build the credit profile dictionary from an instance or a result row"""
         return {
-            'id': str(self.id),
-            'credit_score': self.credit_score,
-            'credit_rating': self.credit_rating,
-            'risk_level': self.risk_level,
-            'lending_readiness_score': self.lending_readiness_score,
+            'id': source.id,
+            'credit_score': source.credit_score,
+            'credit_rating': source.credit_rating,
+            'risk_level': source.risk_level,
+            'lending_readiness_score': source.lending_readiness_score,
             'financial_metrics': {
-                'annual_revenue': float(self.annual_revenue) if self.annual_revenue else None,
-                'monthly_cash_flow': float(self.monthly_cash_flow) if self.monthly_cash_flow else None,
-                'debt_to_income_ratio': float(self.debt_to_income_ratio) if self.debt_to_income_ratio else None,
-                'payment_history_score': self.payment_history_score
+                'annual_revenue': source.annual_revenue,
+                'monthly_cash_flow': source.monthly_cash_flow,
+                'debt_to_income_ratio': source.debt_to_income_ratio,
+                'payment_history_score': source.payment_history_score
             },
             'business_metrics': {
-                'business_age_months': self.business_age_months,
-                'industry_risk_score': self.industry_risk_score,
-                'market_position_score': self.market_position_score
+                'business_age_months': source.business_age_months,
+                'industry_risk_score': source.industry_risk_score,
+                'market_position_score': source.market_position_score
             },
-            'assessment_date': self.assessment_date.isoformat() if self.assessment_date else None,
-            'next_assessment_date': self.next_assessment_date.isoformat() if self.next_assessment_date else None,
-            'assessment_factors': self.assessment_factors,
-            'is_active': self.is_active,
-            'business_id': str(self.business_id),
-            'created_at': self.created_at.isoformat() if self.created_at else None,
-            'updated_at': self.updated_at.isoformat() if self.updated_at else None
+            'assessment_date': source.assessment_date,
+            'next_assessment_date': source.next_assessment_date,
+            'assessment_factors': source.assessment_factors,
+            'is_active': source.is_active,
+            'business_id': source.business_id,
+            'created_at': source.created_at,
+            'updated_at': source.updated_at
         }
     
+    def to_dict(self):
+        """Convert credit profile to dictionary"""
+        return self.serialize(self)
+    
     def __repr__(self):
         return f'<CreditProfile {self.credit_rating} {self.credit_score}>'
 
@@ -155,16 +160,21 @@ class CreditScore(db.Model):
     # Foreign Keys
     credit_profile_id = db.Column(UUID(as_uuid=True), db.ForeignKey('credit_profiles.id'), nullable=False)
     
-    def to_dict(self):
-        """Convert credit score to dictionary"""
+    @staticmethod
+    def serialize(source):
+        """Build the credit score dictionary from an instance or a result row"""
         return {
-            'id': str(self.id),
-            'score': self.score,
-            'rating': self.rating,
-            'assessment_date': self.assessment_date.isoformat() if self.assessment_date else None,
-            'factors': self.factors,
-            'credit_profile_id': str(self.credit_profile_id)
+            'id': source.id,
+            'score': source.score,
+            'rating': source.rating,
+            'assessment_date': source.assessment_date,
+            'factors': source.factors,
+            'credit_profile_id': source.credit_profile_id
         }
     
+    def to_dict(self):
+        """Convert credit score to dictionary"""
+        return self.serialize(self)
+    
     def __repr__(self):
         return f'<CreditScore {self.score} {self.rating}>' 
\ No newline at end of file
@@ -0,0 +1,296 @@
+from app import db
+from datetime import datetime
+from decimal import Decimal
+from sqlalchemy import event, insert, select, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import Session, object_session
+from sqlalchemy.orm.attributes import get_history
+from types import SimpleNamespace
+import uuid
+
+from .invoice import Invoice
+from .expense import Expense
+from .payment import Payment
+from .wallet import Wallet, Transaction
+
+# Invoice statuses still owed by the client
+OPEN_INVOICE_STATUSES = ('sent', 'overdue')
+
+# Columns each aggregated model's contributions are computed from
+TRACKED_COLUMNS = {
+    Invoice: ('business_id', 'status', 'total_amount', 'paid_amount', 'paid_date'),
+    Expense: ('business_id', 'status', 'amount', 'date', 'category_id'),
+    Payment: ('business_id', 'status', 'payment_type', 'amount', 'processed_at'),
+    Wallet: ('business_id', 'is_active', 'currency', 'balance')
+}
+
+# Dialect insert constructs supporting ON CONFLICT DO UPDATE
+UPSERT_INSERTS = {
+    'postgresql': postgresql.insert,
+    'sqlite': sqlite.insert
+}
+
+def month_key(value):
+    """Return the ``YYYY-MM`` period for a date or datetime"""
+    return f'{value.year:04d}-{value.month:02d}'
+
+def _amount(value):
+    """Coerce a stored or submitted amount to Decimal, treating None as zero"""
+    return Decimal(str(value)) if value is not None else Decimal('0')
+
+def invoice_contributions(source):
+    """Aggregate (metric, period, dimension, value, count) entries for an invoice"""
+    status = getattr(source, 'status', None)
+    entries = []
+    if status in OPEN_INVOICE_STATUSES:
+        outstanding = _amount(source.total_amount) - _amount(getattr(source, 'paid_amount', None))
+        entries.append(('receivables_outstanding', '', '', outstanding, 1))
+    if status == 'paid' and getattr(source, 'paid_date', None):
+        entries.append(('invoices_paid', month_key(source.paid_date), '', _amount(source.paid_amount), 1))
+    return entries
+
+def expense_contributions(source):
+    """Aggregate entries for an expense, by month and category"""
+    if getattr(source, 'status', None) == 'rejected':
+        return []
+    category_id = getattr(source, 'category_id', None)
+    return [('expenses', month_key(source.date), str(category_id or ''), _amount(source.amount), 1)]
+
+def payment_contributions(source):
+    """Aggregate entries for a payment, counted once completed"""
+    if getattr(source, 'status', None) != 'completed' or not getattr(source, 'processed_at', None):
+        return []
+    return [('payments_completed', month_key(source.processed_at), source.payment_type, _amount(source.amount), 1)]
+
+def wallet_contributions(source):
+    """Aggregate entries for an active wallet's balance, by currency"""
+    if getattr(source, 'is_active', True) is False:
+        return []
+    return [('wallet_balance', '', source.currency or '', _amount(source.balance), 1)]
+
+CONTRIBUTIONS = {
+    Invoice: invoice_contributions,
+    Expense: expense_contributions,
+    Payment: payment_contributions,
+    Wallet: wallet_contributions
+}
+
+class DashboardAggregate(db.Model):
+    """Running per-business total backing the dashboard
+    
+    Each row holds a sum and count for one metric, period (``YYYY-MM``, or
+    empty for running totals) and dimension (category, currency, ...). Rows
+    are adjusted by deltas as the underlying records change, so reading the
+    dashboard never scans invoices, expenses, payments or wallets.
+    
+    Deltas are collected on the session and applied once, just before it
+    commits, so the rows are only locked after every other write in the
+    transaction (wallet rows included) and always in key order.
+    """
+    
+    __tablename__ = 'dashboard_aggregates'
+    __table_args__ = (
+        db.UniqueConstraint(
+            'business_id', 'metric', 'period', 'dimension',
+            name='uq_dashboard_aggregates_key'
+        ),
+    )
+    
+    id = db.Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    metric = db.Column(db.String(50), nullable=False)
+    period = db.Column(db.String(7), nullable=False, default='')
+    dimension = db.Column(db.String(64), nullable=False, default='')
+    value = db.Column(db.Numeric(15, 2), nullable=False, default=0)
+    count = db.Column(db.Integer, nullable=False, default=0)
+    
+    # Timestamps
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    
+    # Foreign Keys
+    business_id = db.Column(UUID(as_uuid=True), db.ForeignKey('businesses.id'), nullable=False)
+    
+    @staticmethod
+    def _collect(deltas, business_id, entries, sign):
+        """Add signed contribution entries for a business into a delta map"""
+        for metric, period, dimension, value, count in entries:
+            key = (business_id, metric, period, dimension)
+            total_value, total_count = deltas.get(key, (Decimal('0'), 0))
+            deltas[key] = (total_value + sign * value, total_count + sign * count)
+    
+    @staticmethod
+    def _defer(session, business_id, entries, sign):
+        """Add signed contribution entries to the deltas applied when the session commits"""
+        DashboardAggregate._collect(_pending_deltas(session), business_id, entries, sign)
+    
+    @staticmethod
+    def _apply(connection, deltas):
+        """Add deltas to their aggregate rows with one atomic upsert, in key order"""
+        now = datetime.utcnow()
+        rows = [
+            {
+                'id': uuid.uuid4(),
+                'business_id': business_id,
+                'metric': metric,
+                'period': period,
+                'dimension': dimension,
+                'value': value,
+                'count': count,
+                'updated_at': now
+            }
+            for (business_id, metric, period, dimension), (value, count) in sorted(deltas.items(), key=lambda item: tuple(map(str, item[0])))
+            if value or count
+        ]
+        if not rows:
+            return
+        
+        table = DashboardAggregate.__table__
+        upsert_insert = UPSERT_INSERTS.get(connection.dialect.name)
+        if upsert_insert is None:
+            # No upsert support: update existing rows, insert the rest
+            for row in rows:
+                updated = connection.execute(update(table).where(
+                    table.c.business_id == row['business_id'],
+                    table.c.metric == row['metric'],
+                    table.c.period == row['period'],
+                    table.c.dimension == row['dimension']
+                ).values(
+                    value=table.c.value + row['value'],
+                    count=table.c.count + row['count'],
+                    updated_at=now
+                ))
+                if updated.rowcount == 0:
+                    connection.execute(insert(table).values(**row))
+            return
+        
+        statement = upsert_insert(table).values(rows)
+        connection.execute(statement.on_conflict_do_update(
+            index_elements=['business_id', 'metric', 'period', 'dimension'],
+            set_={
+                'value': table.c.value + statement.excluded.value,
+                'count': table.c.count + statement.excluded.count,
+                'updated_at': now
+            }
+        ))
+    
+    @staticmethod
+    def record(model, rows):
+        """Record rows written outside the ORM unit of work (bulk inserts, Core updates)
+        
+        ``rows`` may be dictionaries or result rows holding the model's
+        tracked columns. The deltas are applied when the session commits.
+        """
+        contributions = CONTRIBUTIONS[model]
+        for row in rows:
+            source = SimpleNamespace(**row) if isinstance(row, dict) else row
+            DashboardAggregate._defer(db.session(), source.business_id, contributions(source), 1)
+    
+    @staticmethod
+    def rebuild(business_id=None, batch_size=1000):
+        """Recompute aggregates from the source tables, returning how many rows were written
+        
+        Used to backfill existing data and to repair drift; day-to-day the
+        rows are maintained incrementally.
+        """
+        # Pending writes are counted from the tables, so drop their deltas
+        session = db.session()
+        session.flush()
+        pending = _pending_deltas(session)
+        for key in [key for key in pending if business_id is None or key[0] == business_id]:
+            del pending[key]
+        
+        deltas = {}
+        for model, contributions in CONTRIBUTIONS.items():
+            query = model.query.with_entities(*[getattr(model, key) for key in TRACKED_COLUMNS[model]])
+            if business_id is not None:
+                query = query.filter(model.business_id == business_id)
+            for row in query.yield_per(batch_size):
+                DashboardAggregate._collect(deltas, row.business_id, contributions(row), 1)
+        
+        aggregates = DashboardAggregate.query
+        if business_id is not None:
+            aggregates = aggregates.filter_by(business_id=business_id)
+        aggregates.delete(synchronize_session=False)
+        
+        DashboardAggregate._apply(db.session.connection(), deltas)
+        return sum(1 for value, count in deltas.values() if value or count)
+    
+    def __repr__(self):
+        return f'<DashboardAggregate {self.metric} {self.period} {self.dimension}>'
+
+def _pending_deltas(session):
+    return session.info.setdefault('dashboard_deltas', {})
+
+def _previous_state(target, columns):
+    """Rebuild an object's tracked values as they were before the pending flush"""
+    values = {}
+    for key in columns:
+        history = get_history(target, key)
+        if history.deleted:
+            values[key] = history.deleted[0]
+        elif history.unchanged:
+            values[key] = history.unchanged[0]
+        else:
+            values[key] = history.added[0] if history.added else None
+    return SimpleNamespace(**values)
+
+def _track(model):
+    """Keep the dashboard aggregates in step with a model's ORM writes"""
+    columns = TRACKED_COLUMNS[model]
+    contributions = CONTRIBUTIONS[model]
+    
+    @event.listens_for(model, 'after_insert')
+    def after_insert(mapper, connection, target):
+        DashboardAggregate._defer(object_session(target), target.business_id, contributions(target), 1)
+    
+    @event.listens_for(model, 'after_update')
+    def after_update(mapper, connection, target):
+        session = object_session(target)
+        previous = _previous_state(target, columns)
+        DashboardAggregate._defer(session, previous.business_id, contributions(previous), -1)
+        DashboardAggregate._defer(session, target.business_id, contributions(target), 1)
+    
+    @event.listens_for(model, 'after_delete')
+    def after_delete(mapper, connection, target):
+        previous = _previous_state(target, columns)
+        DashboardAggregate._defer(object_session(target), previous.business_id, contributions(previous), -1)
+    
+    # Load the old value when a tracked column is assigned, so the update
+    # handler can always subtract what the row contributed before
+    for key in columns:
+        event.listen(getattr(model, key), 'set', lambda target, value, oldvalue, initiator: value,
+                     active_history=True, retval=True)
+
+for _model in TRACKED_COLUMNS:
+    _track(_model)
+
+@event.listens_for(Transaction, 'after_insert')
+def _transaction_after_insert(mapper, connection, target):
+    """Move the wallet totals by a new transaction's amount
+    
+    ``Wallet.add_funds`` changes the balance with a Core UPDATE that wallet
+    events never see, so the transaction carries the delta instead.
+    """
+    wallet = connection.execute(
+        select(Wallet.business_id, Wallet.currency, Wallet.is_active).where(Wallet.id == target.wallet_id)
+    ).first()
+    if wallet is None or wallet.is_active is False:
+        return
+    
+    amount = _amount(target.amount)
+    delta = amount if target.transaction_type == 'credit' else -amount
+    DashboardAggregate._defer(
+        object_session(target), wallet.business_id, [('wallet_balance', '', wallet.currency or '', delta, 0)], 1
+    )
+
+@event.listens_for(Session, 'before_commit')
+def _apply_pending_deltas(session):
+    """Apply the transaction's aggregate deltas once its other writes are flushed"""
+    session.flush()
+    deltas = session.info.pop('dashboard_deltas', None)
+    if deltas:
+        DashboardAggregate._apply(session.connection(), deltas)
+
+@event.listens_for(Session, 'after_rollback')
+def _discard_pending_deltas(session):
+    session.info.pop('dashboard_deltas', None)
\ No newline at end of file
@@ -15,24 +15,33 @@ class ExpenseCategory(db.Model):
     icon = db.Column(db.String(50))
     is_active = db.Column(db.Boolean, default=True)
     
+    # Timestamps
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    
     # Foreign Keys
     business_id = db.Column(UUID(as_uuid=True), db.ForeignKey('businesses.id'), nullable=False)
     
     # Relationships
     expenses = db.relationship('Expense', backref='category', lazy='dynamic')
     
-    def to_dict(self):
-        """Convert expense category to dictionary"""
+    @staticmethod
+    def serialize(source):
+        """Build the expense category dictionary from an instance or a result row"""
         return {
-            'id': str(self.id),
-            'name': self.name,
-            'description': self.description,
-            'color': self.color,
-            'icon': self.icon,
-            'is_active': self.is_active,
-            'business_id': str(self.business_id)
+            'id': source.id,
+            'name': source.name,
+            'description': source.description,
+            'color': source.color,
+            'icon': source.icon,
+            'is_active': source.is_active,
+            'business_id': source.business_id
         }
     
+    def to_dict(self):
+        """Convert expense category to dictionary"""
+        return self.serialize(self)
+    
     def __repr__(self):
         return f'<ExpenseCategory {self.name}>'
 
@@ -40,6 +49,10 @@ class Expense(db.Model):
     """Expense model for tracking business expenses"""
     
     __tablename__ = 'expenses'
+    __table_args__ = (
+        # Composite index backing keyset pagination
+        db.Index('ix_expenses_business_date', 'business_id', 'date', 'id'),
+    )
     
     id = db.Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     description = db.Column(db.String(500), nullable=False)
@@ -74,6 +87,9 @@ class Expense(db.Model):
     approver = db.relationship('User', foreign_keys=[approved_by])
     creator = db.relationship('User', foreign_keys=[created_by])
     
+    # Serialized keys not read directly from a column (see app.utils.fields)
+    FIELD_COLUMNS = {'category': ('category_id',)}
+    
     def approve(self, approved_by_user):
         """Approve expense"""
         self.status = 'approved'
@@ -86,29 +102,47 @@ class Expense(db.Model):
         self.approved_by = approved_by_user.id
         self.approved_at = datetime.utcnow()
     
-    def to_dict(self):
-        """Convert expense to dictionary"""
+    @staticmethod
+    def load_categories(expenses):
+        """Load categories for many expenses in a single query, keyed by category id"""
+        category_ids = {expense.category_id for expense in expenses if expense.category_id}
+        if not category_ids:
+            return {}
+        
+        categories = ExpenseCategory.query.filter(
+            ExpenseCategory.id.in_(list(category_ids))
+        ).with_entities(*ExpenseCategory.__table__.columns).all()
+        
+        return {category.id: ExpenseCategory.serialize(category) for category in categories}
+    
+    @staticmethod
+    def serialize(source, category=None):
+        """Build the expense dictionary from an instance or a result row"""
         return {
-            'id': str(self.id),
-            'description': self.description,
-            'amount': float(self.amount),
-            'currency': self.currency,
-            'date': self.date.isoformat() if self.date else None,
-            'payment_method': self.payment_method,
-            'receipt_url': self.receipt_url,
-            'vendor': self.vendor,
-            'status': self.status,
-            'approved_by': str(self.approved_by) if self.approved_by else None,
-            'approved_at': self.approved_at.isoformat() if self.approved_at else None,
-            'tags': self.tags,
-            'notes': self.notes,
-            'business_id': str(self.business_id),
-            'category_id': str(self.category_id) if self.category_id else None,
-            'created_by': str(self.created_by),
-            'created_at': self.created_at.isoformat() if self.created_at else None,
-            'updated_at': self.updated_at.isoformat() if self.updated_at else None,
-            'category': self.category.to_dict() if self.category else None
+            'id': source.id,
+            'description': source.description,
+            'amount': source.amount,
+            'currency': source.currency,
+            'date': source.date,
+            'payment_method': source.payment_method,
+            'receipt_url': source.receipt_url,
+            'vendor': source.vendor,
+            'status': source.status,
+            'approved_by': source.approved_by,
+            'approved_at': source.approved_at,
+            'tags': source.tags,
+            'notes': source.notes,
+            'business_id': source.business_id,
+            'category_id': source.category_id,
+            'created_by': source.created_by,
+            'created_at': source.created_at,
+            'updated_at': source.updated_at,
+            'category': category
         }
     
+    def to_dict(self):
+        """Convert expense to dictionary"""
+        return self.serialize(self, self.category.to_dict() if self.category else None)
+    
     def __repr__(self):
         return f'<Expense {self.description}>' 
\ No newline at end of file
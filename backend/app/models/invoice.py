@@ -2,12 +2,15 @@ from app import db
 from datetime import datetime
 from sqlalchemy.dialects.postgresql import UUID, JSON
 import uuid
-from decimal import Decimal
 
 class Invoice(db.Model):
     """Invoice model for billing and invoicing"""
     
     __tablename__ = 'invoices'
+    __table_args__ = (
+        # Composite index backing keyset pagination
+        db.Index('ix_invoices_business_created', 'business_id', 'created_at', 'id'),
+    )
     
     id = db.Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     invoice_number = db.Column(db.String(50), unique=True, nullable=False, index=True)
@@ -47,9 +50,14 @@ class Invoice(db.Model):
     # Relationships
     items = db.relationship('InvoiceItem', backref='invoice', lazy='dynamic', cascade='all, delete-orphan')
     
-    def calculate_totals(self):
-        """Calculate invoice totals"""
-        self.subtotal = sum(item.total for item in self.items)
+    def calculate_totals(self, items=None):
+        """Calculate invoice totals
+        
+        Pass the invoice's items when they are already in hand to avoid
+        querying the dynamic relationship.
+        """
+        items = self.items if items is None else items
+        self.subtotal = sum(item.total for item in items)
         self.total_amount = self.subtotal + self.tax_amount - self.discount_amount
     
     def mark_as_paid(self, amount, payment_method=None):
@@ -60,39 +68,70 @@ class Invoice(db.Model):
         if payment_method:
             self.payment_method = payment_method
     
-    def to_dict(self):
-        """Convert invoice to dictionary"""
-        return {
-            'id': str(self.id),
-            'invoice_number': self.invoice_number,
-            'status': self.status,
+    @staticmethod
+    def load_items(invoices):
+        """Load line items for many invoices in a single query, keyed by invoice id"""
+        items_by_invoice = {invoice.id: [] for invoice in invoices}
+        if not items_by_invoice:
+            return items_by_invoice
+        
+        items = InvoiceItem.query.filter(
+            InvoiceItem.invoice_id.in_(list(items_by_invoice))
+        ).with_entities(*InvoiceItem.__table__.columns).all()
+        for item in items:
+            items_by_invoice[item.invoice_id].append(item)
+        
+        return items_by_invoice
+    
+    @staticmethod
+    def serialize(source, items=None):
+        """Build the invoice dictionary from an instance or a result row"""
+        data = {
+            'id': source.id,
+            'invoice_number': source.invoice_number,
+            'status': source.status,
             'client': {
-                'name': self.client_name,
-                'email': self.client_email,
-                'phone': self.client_phone,
-                'address': self.client_address
+                'name': source.client_name,
+                'email': source.client_email,
+                'phone': source.client_phone,
+                'address': source.client_address
             },
             'dates': {
-                'issue_date': self.issue_date.isoformat() if self.issue_date else None,
-                'due_date': self.due_date.isoformat() if self.due_date else None,
-                'paid_date': self.paid_date.isoformat() if self.paid_date else None
+                'issue_date': source.issue_date,
+                'due_date': source.due_date,
+                'paid_date': source.paid_date
             },
-            'payment_terms': self.payment_terms,
-            'notes': self.notes,
+            'payment_terms': source.payment_terms,
+            'notes': source.notes,
             'financial': {
-                'subtotal': float(self.subtotal),
-                'tax_amount': float(self.tax_amount),
-                'discount_amount': float(self.discount_amount),
-                'total_amount': float(self.total_amount),
-                'paid_amount': float(self.paid_amount),
-                'currency': self.currency
+                'subtotal': source.subtotal,
+                'tax_amount': source.tax_amount,
+                'discount_amount': source.discount_amount,
+                'total_amount': source.total_amount,
+                'paid_amount': source.paid_amount,
+                'currency': source.currency
             },
-            'payment_method': self.payment_method,
-            'business_id': str(self.business_id),
-            'created_at': self.created_at.isoformat() if self.created_at else None,
-            'updated_at': self.updated_at.isoformat() if self.updated_at else None,
-            'items': [item.to_dict() for item in self.items]
+            'payment_method': source.payment_method,
+            'business_id': source.business_id,
+            'created_at': source.created_at,
+            'updated_at': source.updated_at
         }
+        
+        if items is not None:
+            data['items'] = [InvoiceItem.serialize(item) for item in items]
+        
+        return data
+    
+    def to_dict(self, include_items=True, items=None):
+        """Convert invoice to dictionary
+        
+        Pass preloaded ``items`` (see ``load_items``) to avoid querying the
+        dynamic relationship, or ``include_items=False`` to omit them.
+        """
+        if not include_items:
+            return self.serialize(self)
+        
+        return self.serialize(self, self.items if items is None else items)
     
     def __repr__(self):
         return f'<Invoice {self.invoice_number}>'
@@ -108,6 +147,10 @@ class InvoiceItem(db.Model):
     unit_price = db.Column(db.Numeric(10, 2), nullable=False)
     total = db.Column(db.Numeric(10, 2), nullable=False)
     
+    # Timestamps
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    
     # Foreign Keys
     invoice_id = db.Column(UUID(as_uuid=True), db.ForeignKey('invoices.id'), nullable=False)
     
@@ -115,15 +158,20 @@ class InvoiceItem(db.Model):
         """Calculate item total"""
         self.total = self.quantity * self.unit_price
     
-    def to_dict(self):
-        """Convert invoice item to dictionary"""
+    @staticmethod
+    def serialize(source):
+        """Build the invoice item dictionary from an instance or a result row"""
         return {
-            'id': str(self.id),
-            'description': self.description,
-            'quantity': float(self.quantity),
-            'unit_price': float(self.unit_price),
-            'total': float(self.total)
+            'id': source.id,
+            'description': source.description,
+            'quantity': source.quantity,
+            'unit_price': source.unit_price,
+            'total': source.total
         }
     
+    def to_dict(self):
+        """Convert invoice item to dictionary"""
+        return self.serialize(self)
+    
     def __repr__(self):
         return f'<InvoiceItem {self.description}>' 
\ No newline at end of file
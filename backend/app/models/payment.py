@@ -1,5 +1,6 @@
 from app import db
 from datetime import datetime
+from sqlalchemy import update
 from sqlalchemy.dialects.postgresql import UUID, JSON
 import uuid
 
@@ -7,6 +8,10 @@ class Payment(db.Model):
     """Payment model for processing payments"""
     
     __tablename__ = 'payments'
+    __table_args__ = (
+        # Composite index backing keyset pagination
+        db.Index('ix_payments_business_created', 'business_id', 'created_at', 'id'),
+    )
     
     id = db.Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     payment_type = db.Column(db.String(50), nullable=False)  # incoming, outgoing
@@ -47,6 +52,13 @@ class Payment(db.Model):
     # Relationships
     wallet = db.relationship('Wallet', backref='payments')
     
+    # Bulk transitions: action -> (target status, statuses it may start from)
+    STATUS_TRANSITIONS = {
+        'process': ('processing', ('pending',)),
+        'complete': ('completed', ('pending', 'processing')),
+        'fail': ('failed', ('pending', 'processing'))
+    }
+    
     def process_payment(self):
         """Process the payment"""
         self.status = 'processing'
@@ -63,35 +75,66 @@ class Payment(db.Model):
         self.failure_reason = reason
         self.processed_at = datetime.utcnow()
     
-    def to_dict(self):
-        """Convert payment to dictionary"""
+    @classmethod
+    def bulk_transition(cls, business_id, payment_ids, action, reason=None):
+        """Move many payments to the action's status with one guarded UPDATE
+        
+        Only payments belonging to the business and currently in one of the
+        action's source statuses are updated. Returns the moved rows with
+        their id and new aggregated values.
+        """
+        status, source_statuses = cls.STATUS_TRANSITIONS[action]
+        values = {'status': status, 'processed_at': datetime.utcnow()}
+        if action == 'fail':
+            values['failure_reason'] = reason
+        
+        statement = update(cls).where(
+            cls.business_id == business_id,
+            cls.id.in_(payment_ids),
+            cls.status.in_(source_statuses)
+        ).values(**values).returning(
+            cls.id, cls.business_id, cls.status, cls.payment_type, cls.amount, cls.processed_at
+        )
+        
+        result = db.session.execute(
+            statement, execution_options={'synchronize_session': False}
+        )
+        return result.all()
+    
+    @staticmethod
+    def serialize(source):
+        """Build the payment dictionary from an instance or a result row"""
         return {
-            'id': str(self.id),
-            'payment_type': self.payment_type,
-            'amount': float(self.amount),
-            'currency': self.currency,
-            'status': self.status,
-            'payment_method': self.payment_method,
-            'payment_gateway': self.payment_gateway,
-            'gateway_transaction_id': self.gateway_transaction_id,
+            'id': source.id,
+            'payment_type': source.payment_type,
+            'amount': source.amount,
+            'currency': source.currency,
+            'status': source.status,
+            'payment_method': source.payment_method,
+            'payment_gateway': source.payment_gateway,
+            'gateway_transaction_id': source.gateway_transaction_id,
             'payer': {
-                'name': self.payer_name,
-                'email': self.payer_email
+                'name': source.payer_name,
+                'email': source.payer_email
             },
             'payee': {
-                'name': self.payee_name,
-                'email': self.payee_email
+                'name': source.payee_name,
+                'email': source.payee_email
             },
-            'description': self.description,
-            'reference': self.reference,
-            'processed_at': self.processed_at.isoformat() if self.processed_at else None,
-            'failure_reason': self.failure_reason,
-            'metadata': self.payment_metadata,
-            'business_id': str(self.business_id),
-            'wallet_id': str(self.wallet_id) if self.wallet_id else None,
-            'created_at': self.created_at.isoformat() if self.created_at else None,
-            'updated_at': self.updated_at.isoformat() if self.updated_at else None
+            'description': source.description,
+            'reference': source.reference,
+            'processed_at': source.processed_at,
+            'failure_reason': source.failure_reason,
+            'metadata': source.payment_metadata,
+            'business_id': source.business_id,
+            'wallet_id': source.wallet_id,
+            'created_at': source.created_at,
+            'updated_at': source.updated_at
         }
     
+    def to_dict(self):
+        """Convert payment to dictionary"""
+        return self.serialize(self)
+    
     def __repr__(self):
         return f'<Payment {self.payment_type} {self.amount}>' 
\ No newline at end of file
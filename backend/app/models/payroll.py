@@ -1,5 +1,6 @@
 from app import db
 from datetime import datetime
+from decimal import Decimal, ROUND_HALF_UP
 from sqlalchemy.dialects.postgresql import UUID, JSON
 import uuid
 
@@ -52,6 +53,9 @@ class Employee(db.Model):
     # Relationships
     payrolls = db.relationship('Payroll', backref='employee', lazy='dynamic')
     
+    # Serialized keys not read directly from a column (see app.utils.fields)
+    FIELD_COLUMNS = {'name': ('first_name', 'last_name')}
+    
     def get_full_name(self):
         """Get employee full name"""
         return f"{self.first_name} {self.last_name}"
@@ -60,50 +64,60 @@ class Employee(db.Model):
         """Check if employee is currently active"""
         return self.employment_status == 'active' and not self.termination_date
     
-    def to_dict(self):
-        """Convert employee to dictionary"""
+    @classmethod
+    def active_filter(cls):
+        """SQL criteria matching is_active_employee()"""
+        return db.and_(cls.employment_status == 'active', cls.termination_date.is_(None))
+    
+    @staticmethod
+    def serialize(source):
+        """Build the employee dictionary from an instance or a result row"""
         return {
-            'id': str(self.id),
-            'employee_id': self.employee_id,
+            'id': source.id,
+            'employee_id': source.employee_id,
             'name': {
-                'first_name': self.first_name,
-                'last_name': self.last_name,
-                'full_name': self.get_full_name()
+                'first_name': source.first_name,
+                'last_name': source.last_name,
+                'full_name': f"{source.first_name} {source.last_name}"
             },
             'contact': {
-                'email': self.email,
-                'phone': self.phone
+                'email': source.email,
+                'phone': source.phone
             },
             'employment': {
-                'position': self.position,
-                'department': self.department,
-                'hire_date': self.hire_date.isoformat() if self.hire_date else None,
-                'termination_date': self.termination_date.isoformat() if self.termination_date else None,
-                'status': self.employment_status
+                'position': source.position,
+                'department': source.department,
+                'hire_date': source.hire_date,
+                'termination_date': source.termination_date,
+                'status': source.employment_status
             },
             'compensation': {
-                'salary': float(self.salary) if self.salary else None,
-                'hourly_rate': float(self.hourly_rate) if self.hourly_rate else None,
-                'pay_frequency': self.pay_frequency,
-                'currency': self.currency
+                'salary': source.salary,
+                'hourly_rate': source.hourly_rate,
+                'pay_frequency': source.pay_frequency,
+                'currency': source.currency
             },
             'tax': {
-                'tax_id': self.tax_id,
-                'tax_withholding': float(self.tax_withholding) if self.tax_withholding else None
+                'tax_id': source.tax_id,
+                'tax_withholding': source.tax_withholding
             },
             'bank': {
-                'bank_name': self.bank_name,
-                'bank_account_number': self.bank_account_number,
-                'routing_number': self.routing_number
+                'bank_name': source.bank_name,
+                'bank_account_number': source.bank_account_number,
+                'routing_number': source.routing_number
             },
-            'address': self.address,
-            'emergency_contact': self.emergency_contact,
-            'notes': self.notes,
-            'business_id': str(self.business_id),
-            'created_at': self.created_at.isoformat() if self.created_at else None,
-            'updated_at': self.updated_at.isoformat() if self.updated_at else None
+            'address': source.address,
+            'emergency_contact': source.emergency_contact,
+            'notes': source.notes,
+            'business_id': source.business_id,
+            'created_at': source.created_at,
+            'updated_at': source.updated_at
         }
     
+    def to_dict(self):
+        """Convert employee to dictionary"""
+        return self.serialize(self)
+    
     def __repr__(self):
         return f'<Employee {self.get_full_name()}>'
 
@@ -111,6 +125,10 @@ class Payroll(db.Model):
     """Payroll model for salary processing"""
     
     __tablename__ = 'payrolls'
+    __table_args__ = (
+        # Composite index backing keyset pagination
+        db.Index('ix_payrolls_business_created', 'business_id', 'created_at', 'id'),
+    )
     
     id = db.Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     payroll_period = db.Column(db.String(50), nullable=False)  # weekly, biweekly, monthly
@@ -153,6 +171,75 @@ class Payroll(db.Model):
     business_id = db.Column(UUID(as_uuid=True), db.ForeignKey('businesses.id'), nullable=False)
     employee_id = db.Column(UUID(as_uuid=True), db.ForeignKey('employees.id'), nullable=False)
     
+    # Pay periods per year and standard hours per period, by pay frequency
+    PERIODS_PER_YEAR = {'weekly': 52, 'biweekly': 26, 'semimonthly': 24, 'monthly': 12}
+    STANDARD_HOURS = {
+        'weekly': Decimal('40'),
+        'biweekly': Decimal('80'),
+        'semimonthly': Decimal('86.67'),
+        'monthly': Decimal('173.33')
+    }
+    OVERTIME_MULTIPLIER = Decimal('1.5')
+    
+    @classmethod
+    def calculate_run(cls, employees, payroll_period, hours=None, social_security_rate=0, medicare_rate=0):
+        """Compute pay for many employees in one pass
+        
+        Salaried employees receive their annual salary split over the period's
+        pay periods; hourly employees are paid for the hours given in ``hours``
+        (keyed by employee id) or the period's standard hours, with overtime at
+        time and a half. Returns one dict of payroll amounts per employee.
+        """
+        cent = Decimal('0.01')
+        periods = cls.PERIODS_PER_YEAR[payroll_period]
+        standard_hours = cls.STANDARD_HOURS[payroll_period]
+        social_security_rate = Decimal(str(social_security_rate))
+        medicare_rate = Decimal(str(medicare_rate))
+        hours = hours or {}
+        
+        amounts = []
+        for employee in employees:
+            employee_hours = hours.get(str(employee.id), {})
+            regular_hours = Decimal('0')
+            overtime_hours = Decimal('0')
+            
+            if employee.salary:
+                regular_pay = employee.salary / periods
+                overtime_pay = Decimal('0')
+            else:
+                hourly_rate = employee.hourly_rate or Decimal('0')
+                regular_hours = Decimal(str(employee_hours.get('regular_hours', standard_hours)))
+                overtime_hours = Decimal(str(employee_hours.get('overtime_hours', 0)))
+                regular_pay = hourly_rate * regular_hours
+                overtime_pay = hourly_rate * cls.OVERTIME_MULTIPLIER * overtime_hours
+            
+            regular_pay = regular_pay.quantize(cent, ROUND_HALF_UP)
+            overtime_pay = overtime_pay.quantize(cent, ROUND_HALF_UP)
+            gross_pay = regular_pay + overtime_pay
+            
+            tax_withholding = (gross_pay * (employee.tax_withholding or 0)).quantize(cent, ROUND_HALF_UP)
+            social_security = (gross_pay * social_security_rate).quantize(cent, ROUND_HALF_UP)
+            medicare = (gross_pay * medicare_rate).quantize(cent, ROUND_HALF_UP)
+            total_deductions = tax_withholding + social_security + medicare
+            
+            amounts.append({
+                'employee_id': employee.id,
+                'regular_hours': regular_hours,
+                'overtime_hours': overtime_hours,
+                'regular_pay': regular_pay,
+                'overtime_pay': overtime_pay,
+                'bonus': Decimal('0'),
+                'gross_pay': gross_pay,
+                'tax_withholding': tax_withholding,
+                'social_security': social_security,
+                'medicare': medicare,
+                'other_deductions': Decimal('0'),
+                'total_deductions': total_deductions,
+                'net_pay': gross_pay - total_deductions
+            })
+        
+        return amounts
+    
     def calculate_gross_pay(self):
         """Calculate gross pay"""
         self.gross_pay = self.regular_pay + self.overtime_pay + self.bonus
@@ -179,42 +266,47 @@ class Payroll(db.Model):
         if payment_method:
             self.payment_method = payment_method
     
-    def to_dict(self):
-        """Convert payroll to dictionary"""
+    @staticmethod
+    def serialize(source):
+        """Build the payroll dictionary from an instance or a result row"""
         return {
-            'id': str(self.id),
-            'payroll_period': self.payroll_period,
+            'id': source.id,
+            'payroll_period': source.payroll_period,
             'period': {
-                'start_date': self.start_date.isoformat() if self.start_date else None,
-                'end_date': self.end_date.isoformat() if self.end_date else None
+                'start_date': source.start_date,
+                'end_date': source.end_date
             },
             'earnings': {
-                'regular_hours': float(self.regular_hours),
-                'overtime_hours': float(self.overtime_hours),
-                'regular_pay': float(self.regular_pay),
-                'overtime_pay': float(self.overtime_pay),
-                'bonus': float(self.bonus),
-                'gross_pay': float(self.gross_pay)
+                'regular_hours': source.regular_hours,
+                'overtime_hours': source.overtime_hours,
+                'regular_pay': source.regular_pay,
+                'overtime_pay': source.overtime_pay,
+                'bonus': source.bonus,
+                'gross_pay': source.gross_pay
             },
             'deductions': {
-                'tax_withholding': float(self.tax_withholding),
-                'social_security': float(self.social_security),
-                'medicare': float(self.medicare),
-                'other_deductions': float(self.other_deductions),
-                'total_deductions': float(self.total_deductions)
+                'tax_withholding': source.tax_withholding,
+                'social_security': source.social_security,
+                'medicare': source.medicare,
+                'other_deductions': source.other_deductions,
+                'total_deductions': source.total_deductions
             },
-            'net_pay': float(self.net_pay),
-            'currency': self.currency,
-            'status': self.status,
-            'payment_method': self.payment_method,
-            'payment_date': self.payment_date.isoformat() if self.payment_date else None,
-            'notes': self.notes,
-            'metadata': self.payroll_metadata,
-            'business_id': str(self.business_id),
-            'employee_id': str(self.employee_id),
-            'created_at': self.created_at.isoformat() if self.created_at else None,
-            'updated_at': self.updated_at.isoformat() if self.updated_at else None
+            'net_pay': source.net_pay,
+            'currency': source.currency,
+            'status': source.status,
+            'payment_method': source.payment_method,
+            'payment_date': source.payment_date,
+            'notes': source.notes,
+            'metadata': source.payroll_metadata,
+            'business_id': source.business_id,
+            'employee_id': source.employee_id,
+            'created_at': source.created_at,
+            'updated_at': source.updated_at
         }
     
+    def to_dict(self):
+        """Convert payroll to dictionary"""
+        return self.serialize(self)
+    
     def __repr__(self):
         return f'<Payroll {self.payroll_period} {self.net_pay}>' 
\ No newline at end of file
@@ -21,18 +21,23 @@ class TaxPeriod(db.Model):
     # Relationships
     tax_records = db.relationship('TaxRecord', backref='tax_period', lazy='dynamic')
     
-    def to_dict(self):
-        """Convert tax period to dictionary"""
+    @staticmethod
+    def serialize(source):
+        """Build the tax period dictionary from an instance or a result row"""
         return {
-            'id': str(self.id),
-            'name': self.name,
-            'period_type': self.period_type,
-            'start_date': self.start_date.isoformat() if self.start_date else None,
-            'end_date': self.end_date.isoformat() if self.end_date else None,
-            'is_active': self.is_active,
-            'business_id': str(self.business_id)
+            'id': source.id,
+            'name': source.name,
+            'period_type': source.period_type,
+            'start_date': source.start_date,
+            'end_date': source.end_date,
+            'is_active': source.is_active,
+            'business_id': source.business_id
         }
     
+    def to_dict(self):
+        """Convert tax period to dictionary"""
+        return self.serialize(self)
+    
     def __repr__(self):
         return f'<TaxPeriod {self.name}>'
 
@@ -40,6 +45,10 @@ class TaxRecord(db.Model):
     """Tax record model for tax calculations and reporting"""
     
     __tablename__ = 'tax_records'
+    __table_args__ = (
+        # Composite index backing keyset pagination
+        db.Index('ix_tax_records_business_created', 'business_id', 'created_at', 'id'),
+    )
     
     id = db.Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     tax_type = db.Column(db.String(50), nullable=False)  # income_tax, sales_tax, vat, etc.
@@ -79,25 +88,30 @@ class TaxRecord(db.Model):
         self.status = 'paid'
         self.paid_date = paid_date or datetime.utcnow().date()
     
-    def to_dict(self):
-        """Convert tax record to dictionary"""
+    @staticmethod
+    def serialize(source):
+        """Build the tax record dictionary from an instance or a result row"""
         return {
-            'id': str(self.id),
-            'tax_type': self.tax_type,
-            'tax_rate': float(self.tax_rate),
-            'taxable_amount': float(self.taxable_amount),
-            'tax_amount': float(self.tax_amount),
-            'currency': self.currency,
-            'status': self.status,
-            'filed_date': self.filed_date.isoformat() if self.filed_date else None,
-            'paid_date': self.paid_date.isoformat() if self.paid_date else None,
-            'notes': self.notes,
-            'metadata': self.tax_metadata,
-            'business_id': str(self.business_id),
-            'tax_period_id': str(self.tax_period_id) if self.tax_period_id else None,
-            'created_at': self.created_at.isoformat() if self.created_at else None,
-            'updated_at': self.updated_at.isoformat() if self.updated_at else None
+            'id': source.id,
+            'tax_type': source.tax_type,
+            'tax_rate': source.tax_rate,
+            'taxable_amount': source.taxable_amount,
+            'tax_amount': source.tax_amount,
+            'currency': source.currency,
+            'status': source.status,
+            'filed_date': source.filed_date,
+            'paid_date': source.paid_date,
+            'notes': source.notes,
+            'metadata': source.tax_metadata,
+            'business_id': source.business_id,
+            'tax_period_id': source.tax_period_id,
+            'created_at': source.created_at,
+            'updated_at': source.updated_at
         }
     
+    def to_dict(self):
+        """Convert tax record to dictionary"""
+        return self.serialize(self)
+    
     def __repr__(self):
         return f'<TaxRecord {self.tax_type} {self.tax_amount}>' 
\ No newline at end of file
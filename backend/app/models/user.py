@@ -1,6 +1,6 @@
 from app import db
+from app.utils.passwords import password_hasher
 from datetime import datetime
-import bcrypt
 from sqlalchemy.dialects.postgresql import UUID
 import uuid
 
@@ -8,6 +8,10 @@ class User(db.Model):
     """User model for authentication and profile management"""
     
     __tablename__ = 'users'
+    __table_args__ = (
+        # Composite index backing keyset pagination
+        db.Index('ix_users_created', 'created_at', 'id'),
+    )
     
     id = db.Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     email = db.Column(db.String(255), unique=True, nullable=False, index=True)
@@ -34,28 +38,40 @@ class User(db.Model):
             setattr(self, key, value)
     
     def _hash_password(self, password):
-        """Hash password using bcrypt"""
-        return bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt()).decode('utf-8')
+        """Hash password using bcrypt at the configured cost"""
+        return password_hasher.hash(password)
     
     def check_password(self, password):
         """Verify password against hash"""
-        return bcrypt.checkpw(password.encode('utf-8'), self.password_hash.encode('utf-8'))
+        return password_hasher.verify(password, self.password_hash)
     
-    def to_dict(self):
-        """Convert user to dictionary"""
+    def rehash_password(self, password):
+        """Re-hash a verified password when the configured cost has changed, returning whether it did"""
+        if not password_hasher.needs_rehash(self.password_hash):
+            return False
+        self.password_hash = self._hash_password(password)
+        return True
+    
+    @staticmethod
+    def serialize(source):
+        """Build the user dictionary from an instance or a result row"""
         return {
-            'id': str(self.id),
-            'email': self.email,
-            'first_name': self.first_name,
-            'last_name': self.last_name,
-            'phone': self.phone,
-            'is_active': self.is_active,
-            'is_verified': self.is_verified,
-            'role': self.role,
-            'created_at': self.created_at.isoformat() if self.created_at else None,
-            'updated_at': self.updated_at.isoformat() if self.updated_at else None,
-            'last_login': self.last_login.isoformat() if self.last_login else None
+            'id': source.id,
+            'email': source.email,
+            'first_name': source.first_name,
+            'last_name': source.last_name,
+            'phone': source.phone,
+            'is_active': source.is_active,
+            'is_verified': source.is_verified,
+            'role': source.role,
+            'created_at': source.created_at,
+            'updated_at': source.updated_at,
+            'last_login': source.last_login
         }
     
+    def to_dict(self):
+        """Convert user to dictionary"""
+        return self.serialize(self)
+    
     def __repr__(self):
         return f'<User {self.email}>' 
\ No newline at end of file
@@ -1,7 +1,17 @@
 from app import db
-from datetime import datetime
+from datetime import datetime, timedelta
+from decimal import Decimal
+from sqlalchemy import func, insert, or_, update
 from sqlalchemy.dialects.postgresql import UUID, JSON
+from sqlalchemy.orm import aliased
+from sqlalchemy.orm.attributes import set_committed_value
+from types import SimpleNamespace
+import json
 import uuid
+import zlib
+
+class InsufficientFundsError(Exception):
+    """Raised when a guarded debit would overdraw a wallet"""
 
 class Wallet(db.Model):
     """Digital wallet model for storing funds"""
@@ -28,39 +38,158 @@ class Wallet(db.Model):
     # Relationships
     transactions = db.relationship('Transaction', backref='wallet', lazy='dynamic')
     
-    def add_funds(self, amount, description, transaction_type='credit'):
-        """Add funds to wallet"""
-        if transaction_type == 'credit':
-            self.balance += amount
-        else:
-            self.balance -= amount
+    def add_funds(self, amount, description, transaction_type='credit', allow_overdraft=True):
+        """Add funds to wallet
+        
+        The balance is changed in the database with a single atomic
+        ``UPDATE ... RETURNING``, so concurrent requests never lose updates.
+        With ``allow_overdraft=False`` a debit only applies while the balance
+        covers it, otherwise InsufficientFundsError is raised.
+        """
+        amount = Decimal(str(amount))
+        delta = amount if transaction_type == 'credit' else -amount
+        
+        statement = update(Wallet).where(Wallet.id == self.id)
+        if delta < 0 and not allow_overdraft:
+            statement = statement.where(Wallet.balance >= amount)
+        statement = statement.values(balance=Wallet.balance + delta).returning(Wallet.balance)
+        
+        balance = db.session.execute(
+            statement, execution_options={'synchronize_session': False}
+        ).scalar()
+        if balance is None:
+            raise InsufficientFundsError(f"Insufficient funds in wallet {self.id}")
+        
+        # Reflect the new balance without marking the wallet dirty
+        set_committed_value(self, 'balance', balance)
         
         # Create transaction record
+        now = datetime.utcnow()
         transaction = Transaction(
+            id=uuid.uuid4(),
             wallet_id=self.id,
             amount=amount,
             description=description,
             transaction_type=transaction_type,
-            balance_after=self.balance
+            balance_after=balance,
+            created_at=now
         )
         db.session.add(transaction)
+        
+        # Move today's closing balance along with the wallet
+        BalanceCheckpoint.record(self.id, now.date(), balance)
         return transaction
     
-    def to_dict(self):
-        """Convert wallet to dictionary"""
+    def balance_at(self, at):
+        """Return the wallet balance as of a point in time
+        
+        Starts from the closing balance of the nearest daily checkpoint
+        before ``at`` and only scans the transactions written after it, so
+        the cost stays bounded however long the wallet's history is.
+        Archived months are consulted when the live table has no rows.
+        """
+        if self.created_at and at < self.created_at:
+            return Decimal('0')
+        
+        checkpoint = BalanceCheckpoint.query.with_entities(
+            BalanceCheckpoint.day, BalanceCheckpoint.balance
+        ).filter(
+            BalanceCheckpoint.wallet_id == self.id,
+            BalanceCheckpoint.day < at.date()
+        ).order_by(BalanceCheckpoint.day.desc()).first()
+        
+        # Latest transaction between the checkpoint and ``at``
+        since = None
+        if checkpoint:
+            since = datetime.combine(checkpoint.day + timedelta(days=1), datetime.min.time())
+        
+        query = Transaction.query.filter(
+            Transaction.wallet_id == self.id,
+            Transaction.created_at <= at
+        )
+        if since:
+            query = query.filter(Transaction.created_at >= since)
+        latest = query.with_entities(Transaction.balance_after).order_by(
+            Transaction.created_at.desc(), Transaction.id.desc()
+        ).first()
+        
+        if not latest:
+            latest = next(TransactionArchive.iter_rows(
+                self.id, start=since, end=at + timedelta(microseconds=1), newest_first=True
+            ), None)
+        
+        if latest:
+            return latest.balance_after
+        if checkpoint:
+            return checkpoint.balance
+        
+        # No history before ``at``: work back from the first later transaction
+        following = next(TransactionArchive.iter_rows(
+            self.id, start=at + timedelta(microseconds=1)
+        ), None) or Transaction.query.with_entities(
+            Transaction.transaction_type, Transaction.amount, Transaction.balance_after
+        ).filter(
+            Transaction.wallet_id == self.id,
+            Transaction.created_at > at
+        ).order_by(Transaction.created_at, Transaction.id).first()
+        
+        if not following:
+            return self.balance
+        if following.transaction_type == 'credit':
+            return following.balance_after - following.amount
+        return following.balance_after + following.amount
+    
+    @staticmethod
+    def transfer(from_wallet, to_wallet, amount, description):
+        """Move funds between wallets, returning the (debit, credit) transactions
+        
+        Wallet rows are updated in id order so concurrent transfers in
+        opposite directions always take their row locks in the same order
+        and cannot deadlock. The debit is guarded against overdraft.
+        """
+        transactions = {}
+        for wallet in sorted((from_wallet, to_wallet), key=lambda wallet: wallet.id):
+            if wallet is from_wallet:
+                transactions['debit'] = from_wallet.add_funds(
+                    amount=amount,
+                    description=f"Transfer to {to_wallet.name}: {description}",
+                    transaction_type='debit',
+                    allow_overdraft=False
+                )
+            else:
+                transactions['credit'] = to_wallet.add_funds(
+                    amount=amount,
+                    description=f"Transfer from {from_wallet.name}: {description}",
+                    transaction_type='credit'
+                )
+        
+        # Link transactions
+        debit_transaction, credit_transaction = transactions['debit'], transactions['credit']
+        debit_transaction.related_transaction_id = credit_transaction.id
+        credit_transaction.related_transaction_id = debit_transaction.id
+        
+        return debit_transaction, credit_transaction
+    
+    @staticmethod
+    def serialize(source):
+        """Build the wallet dictionary from an instance or a result row"""
         return {
-            'id': str(self.id),
-            'name': self.name,
-            'wallet_type': self.wallet_type,
-            'currency': self.currency,
-            'balance': float(self.balance),
-            'is_active': self.is_active,
-            'settings': self.settings,
-            'business_id': str(self.business_id),
-            'created_at': self.created_at.isoformat() if self.created_at else None,
-            'updated_at': self.updated_at.isoformat() if self.updated_at else None
+            'id': source.id,
+            'name': source.name,
+            'wallet_type': source.wallet_type,
+            'currency': source.currency,
+            'balance': source.balance,
+            'is_active': source.is_active,
+            'settings': source.settings,
+            'business_id': source.business_id,
+            'created_at': source.created_at,
+            'updated_at': source.updated_at
         }
     
+    def to_dict(self):
+        """Convert wallet to dictionary"""
+        return self.serialize(self)
+    
     def __repr__(self):
         return f'<Wallet {self.name}>'
 
@@ -68,6 +197,10 @@ class Transaction(db.Model):
     """Transaction model for wallet transactions"""
     
     __tablename__ = 'transactions'
+    __table_args__ = (
+        # Composite index backing keyset pagination
+        db.Index('ix_transactions_wallet_created', 'wallet_id', 'created_at', 'id'),
+    )
     
     id = db.Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     transaction_type = db.Column(db.String(50), nullable=False)  # credit, debit, transfer
@@ -90,21 +223,318 @@ class Transaction(db.Model):
     # Relationships
     related_transaction = db.relationship('Transaction', remote_side=[id])
     
+    @staticmethod
+    def serialize(source):
+        """Build the transaction dictionary from an instance or a result row"""
+        return {
+            'id': source.id,
+            'transaction_type': source.transaction_type,
+            'amount': source.amount,
+            'description': source.description,
+            'reference': source.reference,
+            'balance_after': source.balance_after,
+            'metadata': source.transaction_metadata,
+            'tags': source.tags,
+            'wallet_id': source.wallet_id,
+            'related_transaction_id': source.related_transaction_id,
+            'created_at': source.created_at
+        }
+    
     def to_dict(self):
         """Convert transaction to dictionary"""
+        return self.serialize(self)
+    
+    def __repr__(self):
+        return f'<Transaction {self.transaction_type} {self.amount}>' 
+
+class BalanceCheckpoint(db.Model):
+    """Closing balance of a wallet at the end of a day"""
+    
+    __tablename__ = 'wallet_balance_checkpoints'
+    __table_args__ = (
+        db.UniqueConstraint('wallet_id', 'day', name='uq_wallet_balance_checkpoints_wallet_day'),
+    )
+    
+    id = db.Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    day = db.Column(db.Date, nullable=False)
+    balance = db.Column(db.Numeric(15, 2), nullable=False)
+    
+    # Timestamps
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    
+    # Foreign Keys
+    wallet_id = db.Column(UUID(as_uuid=True), db.ForeignKey('wallets.id'), nullable=False)
+    
+    @staticmethod
+    def record(wallet_id, day, balance):
+        """Set a wallet's closing balance for a day, creating the checkpoint if needed
+        
+        Called while the wallet row is locked by the balance update, so
+        writers to the same wallet are serialized and the update-then-insert
+        cannot race.
+        """
+        now = datetime.utcnow()
+        updated = db.session.execute(
+            update(BalanceCheckpoint).where(
+                BalanceCheckpoint.wallet_id == wallet_id,
+                BalanceCheckpoint.day == day
+            ).values(balance=balance, updated_at=now),
+            execution_options={'synchronize_session': False}
+        )
+        if updated.rowcount == 0:
+            db.session.execute(insert(BalanceCheckpoint).values(
+                id=uuid.uuid4(),
+                wallet_id=wallet_id,
+                day=day,
+                balance=balance,
+                created_at=now,
+                updated_at=now
+            ))
+    
+    @staticmethod
+    def rebuild(wallet_id=None, batch_size=1000):
+        """Recompute checkpoints from transaction history, returning how many were written
+        
+        Backfills wallets whose transactions predate checkpointing. The
+        history is streamed oldest first, keeping only the last balance seen
+        for each wallet and day.
+        """
+        query = Transaction.query.with_entities(
+            Transaction.wallet_id, Transaction.created_at, Transaction.balance_after
+        )
+        checkpoints = BalanceCheckpoint.query
+        if wallet_id is not None:
+            query = query.filter(Transaction.wallet_id == wallet_id)
+            checkpoints = checkpoints.filter(BalanceCheckpoint.wallet_id == wallet_id)
+        
+        closing = {}
+        for row in query.order_by(Transaction.created_at, Transaction.id).yield_per(batch_size):
+            closing[(row.wallet_id, row.created_at.date())] = row.balance_after
+        
+        checkpoints.delete(synchronize_session=False)
+        
+        now = datetime.utcnow()
+        rows = [
+            {
+                'id': uuid.uuid4(),
+                'wallet_id': checkpoint_wallet_id,
+                'day': day,
+                'balance': balance,
+                'created_at': now,
+                'updated_at': now
+            }
+            for (checkpoint_wallet_id, day), balance in closing.items()
+        ]
+        for start in range(0, len(rows), batch_size):
+            db.session.execute(insert(BalanceCheckpoint), rows[start:start + batch_size])
+        
+        return len(rows)
+    
+    @staticmethod
+    def serialize(source):
+        """Build the checkpoint dictionary from an instance or a result row"""
         return {
-            'id': str(self.id),
-            'transaction_type': self.transaction_type,
-            'amount': float(self.amount),
-            'description': self.description,
-            'reference': self.reference,
-            'balance_after': float(self.balance_after),
-            'metadata': self.transaction_metadata,
-            'tags': self.tags,
-            'wallet_id': str(self.wallet_id),
-            'related_transaction_id': str(self.related_transaction_id) if self.related_transaction_id else None,
-            'created_at': self.created_at.isoformat() if self.created_at else None
+            'id': source.id,
+            'wallet_id': source.wallet_id,
+            'day': source.day,
+            'balance': source.balance,
+            'created_at': source.created_at,
+            'updated_at': source.updated_at
         }
     
+    def to_dict(self):
+        """Convert checkpoint to dictionary"""
+        return self.serialize(self)
+    
+    def __repr__(self):
+        return f'<BalanceCheckpoint {self.wallet_id} {self.day}>'
+
+# Decoders restoring archived transaction values from their JSON form
+ARCHIVE_DECODERS = {
+    'id': uuid.UUID,
+    'wallet_id': uuid.UUID,
+    'related_transaction_id': uuid.UUID,
+    'amount': Decimal,
+    'balance_after': Decimal,
+    'created_at': datetime.fromisoformat
+}
+
+class TransactionArchive(db.Model):
+    """Compressed cold-storage segment of one wallet's transactions for one month"""
+    
+    __tablename__ = 'transaction_archives'
+    __table_args__ = (
+        db.Index('ix_transaction_archives_wallet_first', 'wallet_id', 'first_created_at'),
+    )
+    
+    id = db.Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    month = db.Column(db.Date, nullable=False)  # first day of the archived month
+    first_created_at = db.Column(db.DateTime, nullable=False)
+    last_created_at = db.Column(db.DateTime, nullable=False)
+    transaction_count = db.Column(db.Integer, nullable=False)
+    type_counts = db.Column(JSON, default={})  # transactions per transaction_type
+    payload = db.Column(db.LargeBinary, nullable=False)  # zlib-compressed JSON rows
+    
+    # Timestamps
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    
+    # Foreign Keys
+    wallet_id = db.Column(UUID(as_uuid=True), db.ForeignKey('wallets.id'), nullable=False)
+    
+    @staticmethod
+    def closed_month_cutoff(hot_months, today=None):
+        """Return the start of the oldest month kept live when ``hot_months`` closed months stay hot"""
+        today = today or datetime.utcnow().date()
+        month_index = today.year * 12 + today.month - 1 - hot_months
+        return datetime(month_index // 12, month_index % 12 + 1, 1)
+    
+    @staticmethod
+    def _safe_cutoff(cutoff):
+        """Move a cutoff back until no linked transaction pair straddles it
+        
+        Archived rows are removed from the live table, so a transfer whose
+        two legs fall either side of the cutoff stays live as a whole.
+        """
+        partner = aliased(Transaction)
+        while True:
+            earliest = db.session.query(func.min(Transaction.created_at)).join(
+                partner, or_(
+                    partner.id == Transaction.related_transaction_id,
+                    partner.related_transaction_id == Transaction.id
+                )
+            ).filter(
+                Transaction.created_at < cutoff,
+                partner.created_at >= cutoff
+            ).scalar()
+            
+            if earliest is None:
+                return cutoff
+            cutoff = earliest
+    
+    @staticmethod
+    def archive_before(cutoff, batch_size=1000):
+        """Move live transactions older than ``cutoff`` into archive segments
+        
+        Rows are streamed in (wallet, time) order and written as one
+        compressed segment per wallet and month, then deleted from the live
+        table. Every archived row is older than every live row, so readers
+        can page through live rows first and continue into the archive.
+        Returns how many transactions were archived.
+        """
+        cutoff = TransactionArchive._safe_cutoff(cutoff)
+        query = Transaction.query.with_entities(*Transaction.__table__.columns).filter(
+            Transaction.created_at < cutoff
+        ).order_by(Transaction.wallet_id, Transaction.created_at, Transaction.id)
+        
+        archived = 0
+        segment, segment_key = [], None
+        for row in query.yield_per(batch_size):
+            key = (row.wallet_id, row.created_at.year, row.created_at.month)
+            if segment and key != segment_key:
+                TransactionArchive._write_segment(segment)
+                segment = []
+            
+            segment.append(row)
+            segment_key = key
+            archived += 1
+        
+        if segment:
+            TransactionArchive._write_segment(segment)
+        
+        Transaction.query.filter(Transaction.created_at < cutoff).delete(synchronize_session=False)
+        return archived
+    
+    @staticmethod
+    def _write_segment(rows):
+        """Compress one wallet-month of transaction rows into an archive segment"""
+        type_counts = {}
+        for row in rows:
+            type_counts[row.transaction_type] = type_counts.get(row.transaction_type, 0) + 1
+        
+        records = [dict(row._mapping) for row in rows]
+        payload = json.dumps(
+            records,
+            default=lambda value: value.isoformat() if isinstance(value, datetime) else str(value),
+            separators=(',', ':')
+        )
+        
+        first = rows[0].created_at
+        db.session.execute(insert(TransactionArchive).values(
+            id=uuid.uuid4(),
+            wallet_id=rows[0].wallet_id,
+            month=first.date().replace(day=1),
+            first_created_at=first,
+            last_created_at=rows[-1].created_at,
+            transaction_count=len(rows),
+            type_counts=type_counts,
+            payload=zlib.compress(payload.encode('utf-8')),
+            created_at=datetime.utcnow()
+        ))
+    
+    def rows(self):
+        """Decompress the segment into transaction rows, oldest first"""
+        rows = []
+        for record in json.loads(zlib.decompress(self.payload)):
+            for key, decode in ARCHIVE_DECODERS.items():
+                if record.get(key) is not None:
+                    record[key] = decode(record[key])
+            rows.append(SimpleNamespace(**record))
+        return rows
+    
+    @staticmethod
+    def count(wallet_id, transaction_type=None):
+        """Count a wallet's archived transactions without decompressing them"""
+        segments = TransactionArchive.query.with_entities(
+            TransactionArchive.transaction_count, TransactionArchive.type_counts
+        ).filter_by(wallet_id=wallet_id)
+        
+        if transaction_type:
+            return sum((segment.type_counts or {}).get(transaction_type, 0) for segment in segments)
+        return sum(segment.transaction_count for segment in segments)
+    
+    @staticmethod
+    def iter_rows(wallet_id, transaction_type=None, start=None, end=None, before=None,
+                  newest_first=False, skip=0):
+        """Yield a wallet's archived transactions in time order
+        
+        ``start`` (inclusive) and ``end`` (exclusive) bound ``created_at``,
+        and ``before`` is a (created_at, id) keyset position to continue
+        below. Only segments overlapping the range are decompressed, and
+        ``skip`` passes over whole segments using their stored counts.
+        """
+        segments = TransactionArchive.query.filter_by(wallet_id=wallet_id)
+        if start:
+            segments = segments.filter(TransactionArchive.last_created_at >= start)
+        if end:
+            segments = segments.filter(TransactionArchive.first_created_at < end)
+        if before:
+            segments = segments.filter(TransactionArchive.first_created_at <= before[0])
+        
+        order = TransactionArchive.first_created_at
+        segments = segments.order_by(order.desc() if newest_first else order)
+        
+        for segment in segments:
+            if skip:
+                size = (segment.type_counts or {}).get(transaction_type, 0) if transaction_type else segment.transaction_count
+                if skip >= size:
+                    skip -= size
+                    continue
+            
+            rows = segment.rows()
+            for row in reversed(rows) if newest_first else rows:
+                if transaction_type and row.transaction_type != transaction_type:
+                    continue
+                if start and row.created_at < start:
+                    continue
+                if end and row.created_at >= end:
+                    continue
+                if before and (row.created_at, row.id) >= before:
+                    continue
+                if skip:
+                    skip -= 1
+                    continue
+                yield row
+    
     def __repr__(self):
-        return f'<Transaction {self.transaction_type} {self.amount}>' 
\ No newline at end of file
+        return f'<TransactionArchive {self.wallet_id} {self.month}>'
\ No newline at end of file
@@ -1,10 +1,12 @@
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, request
 from flask_jwt_extended import create_access_token, create_refresh_token, jwt_required, get_jwt_identity
-from werkzeug.security import generate_password_hash, check_password_hash
 from app import db
 from app.models.user import User
 from app.utils.validators import validate_email, validate_password
 from app.utils.response import success_response, error_response
+from app.utils.fields import parse_fields, select_fields
+from app.utils.current_user import get_current_user_id
+from app.utils.passwords import PasswordHashingBusy
 from datetime import datetime
 
 auth_bp = Blueprint('auth', __name__)
@@ -56,6 +58,9 @@ def register():
             'refresh_token': refresh_token
         }, "User registered successfully")
         
+    except PasswordHashingBusy:
+        db.session.rollback()
+        return error_response("Server busy, please retry shortly", 503)
     except Exception as e:
         db.session.rollback()
         return error_response("Registration failed", 500)
@@ -83,7 +88,8 @@ def login():
         if not user.is_active:
             return error_response("Account is deactivated", 401)
         
-        # Update last login
+        # Upgrade the stored hash if the configured cost changed, then update last login
+        user.rehash_password(data['password'])
         user.last_login = datetime.utcnow()
         db.session.commit()
         
@@ -97,6 +103,9 @@ def login():
             'refresh_token': refresh_token
         }, "Login successful")
         
+    except PasswordHashingBusy:
+        db.session.rollback()
+        return error_response("Server busy, please retry shortly", 503)
     except Exception as e:
         db.session.rollback()
         return error_response("Login failed", 500)
@@ -121,14 +130,14 @@ def refresh():
 def get_profile():
     """Get current user profile"""
     try:
-        current_user_id = get_jwt_identity()
+        current_user_id = get_current_user_id()
         user = User.query.get(current_user_id)
         
         if not user:
             return error_response("User not found", 404)
         
         return success_response({
-            'user': user.to_dict()
+            'user': select_fields(user.to_dict(), parse_fields())
         }, "Profile retrieved successfully")
         
     except Exception as e:
@@ -139,7 +148,7 @@ def get_profile():
 def update_profile():
     """Update current user profile"""
     try:
-        current_user_id = get_jwt_identity()
+        current_user_id = get_current_user_id()
         user = User.query.get(current_user_id)
         
         if not user:
@@ -170,7 +179,7 @@ def update_profile():
 def change_password():
     """Change user password"""
     try:
-        current_user_id = get_jwt_identity()
+        current_user_id = get_current_user_id()
         user = User.query.get(current_user_id)
         
         if not user:
@@ -196,6 +205,9 @@ def change_password():
         
         return success_response({}, "Password changed successfully")
         
+    except PasswordHashingBusy:
+        db.session.rollback()
+        return error_response("Server busy, please retry shortly", 503)
     except Exception as e:
         db.session.rollback()
         return error_response("Failed to change password", 500)
@@ -1,11 +1,14 @@
 from flask import Blueprint, request
-from flask_jwt_extended import jwt_required, get_jwt_identity
+from flask_jwt_extended import jwt_required
 from app import db
 from app.models.business import Business
-from app.models.user import User
-from app.utils.response import success_response, error_response, paginated_response, not_found_response
+from app.utils.response import success_response, error_response, paginated_response, cursor_paginated_response, not_found_response
+from app.utils.pagination import keyset_paginate, InvalidCursorError
+from app.utils.fields import parse_fields, field_columns, select_fields
+from app.utils.rows import as_rows
+from app.utils.current_user import get_current_user, get_current_user_id
+from app.utils.tenant import get_current_business
 from app.utils.validators import validate_required_fields, validate_business_type, validate_currency
-from datetime import datetime
 
 businesses_bp = Blueprint('businesses', __name__)
 
@@ -14,8 +17,7 @@ businesses_bp = Blueprint('businesses', __name__)
 def get_businesses():
     """Get all businesses (admin only)"""
     try:
-        current_user_id = get_jwt_identity()
-        current_user = User.query.get(current_user_id)
+        current_user = get_current_user()
         
         if not current_user or current_user.role != 'admin':
             return error_response("Unauthorized", 403)
@@ -23,9 +25,14 @@ def get_businesses():
         # Get query parameters
         page = request.args.get('page', 1, type=int)
         per_page = min(request.args.get('per_page', 10, type=int), 100)
+        if per_page < 1:
+            return error_response("per_page must be at least 1", 400)
+        cursor = request.args.get('cursor')
+        include_total = request.args.get('include_total', 'false').lower() == 'true'
         subscription_plan = request.args.get('subscription_plan')
         subscription_status = request.args.get('subscription_status')
         is_active = request.args.get('is_active')
+        fields = parse_fields()
         
         # Build query
         query = Business.query
@@ -38,21 +45,35 @@ def get_businesses():
         if is_active is not None:
             query = query.filter_by(is_active=is_active.lower() == 'true')
         
-        # Order by created date
-        query = query.order_by(Business.created_at.desc())
+        # Serialize from plain rows, loading only the requested fields' columns
+        query = as_rows(query, Business, field_columns(Business, fields, ('created_at',)))
         
-        # Paginate
-        pagination = query.paginate(
-            page=page, per_page=per_page, error_out=False
-        )
+        # Paginate by keyset when a cursor is supplied, by page otherwise
+        if cursor is not None:
+            pagination = keyset_paginate(
+                query, Business.created_at, Business.id, cursor, per_page, include_total
+            )
+        else:
+            query = query.order_by(Business.created_at.desc())
+            pagination = query.paginate(
+                page=page, per_page=per_page, error_out=False
+            )
+        
+        businesses = [select_fields(Business.serialize(row), fields) for row in pagination.items]
         
-        businesses = [business.to_dict() for business in pagination.items]
+        if cursor is not None:
+            return cursor_paginated_response(
+                businesses, per_page, pagination.next_cursor, pagination.total,
+                "Businesses retrieved successfully"
+            )
         
         return paginated_response(
             businesses, page, per_page, pagination.total,
             "Businesses retrieved successfully"
         )
         
+    except InvalidCursorError:
+        return error_response("Invalid pagination cursor", 400)
     except Exception as e:
         return error_response("Failed to retrieve businesses", 500)
 
@@ -61,41 +82,45 @@ def get_businesses():
 def get_my_business():
     """Get current user's business"""
     try:
-        current_user_id = get_jwt_identity()
-        
         # Get user's business
-        business = Business.query.filter_by(owner_id=current_user_id).first()
+        business = get_current_business()
         
         if not business:
             return error_response("Business not found", 404)
         
         return success_response(
-            business.to_dict(), "Business retrieved successfully"
+            select_fields(business.to_dict(), parse_fields()),
+            "Business retrieved successfully"
         )
         
     except Exception as e:
         return error_response("Failed to retrieve business", 500)
 
-@businesses_bp.route('/<business_id>', methods=['GET'])
+@businesses_bp.route('/<uuid:business_id>', methods=['GET'])
 @jwt_required()
 def get_business(business_id):
     """Get a specific business"""
     try:
-        current_user_id = get_jwt_identity()
-        current_user = User.query.get(current_user_id)
+        current_user_id = get_current_user_id()
+        current_user = get_current_user()
         
-        # Get business
-        business = Business.query.get(business_id)
+        # Get business, loading only the requested fields' columns
+        fields = parse_fields()
+        business = as_rows(
+            Business.query.filter_by(id=business_id),
+            Business, field_columns(Business, fields, ('owner_id',))
+        ).first()
         
         if not business:
             return not_found_response("Business")
         
         # Check if user can access this business
-        if str(business.owner_id) != str(current_user_id) and current_user.role != 'admin':
+        if business.owner_id != current_user_id and current_user.role != 'admin':
             return error_response("Unauthorized", 403)
         
         return success_response(
-            business.to_dict(), "Business retrieved successfully"
+            select_fields(Business.serialize(business), fields),
+            "Business retrieved successfully"
         )
         
     except Exception as e:
@@ -106,11 +131,11 @@ def get_business(business_id):
 def create_business():
     """Create a new business"""
     try:
-        current_user_id = get_jwt_identity()
+        current_user_id = get_current_user_id()
         data = request.get_json()
         
         # Check if user already has a business
-        existing_business = Business.query.filter_by(owner_id=current_user_id).first()
+        existing_business = get_current_business()
         if existing_business:
             return error_response("User already has a business", 409)
         
@@ -163,13 +188,13 @@ def create_business():
         db.session.rollback()
         return error_response("Failed to create business", 500)
 
-@businesses_bp.route('/<business_id>', methods=['PUT'])
+@businesses_bp.route('/<uuid:business_id>', methods=['PUT'])
 @jwt_required()
 def update_business(business_id):
     """Update a business"""
     try:
-        current_user_id = get_jwt_identity()
-        current_user = User.query.get(current_user_id)
+        current_user_id = get_current_user_id()
+        current_user = get_current_user()
         data = request.get_json()
         
         # Get business
@@ -179,7 +204,7 @@ def update_business(business_id):
             return not_found_response("Business")
         
         # Check if user can update this business
-        if str(business.owner_id) != str(current_user_id) and current_user.role != 'admin':
+        if business.owner_id != current_user_id and current_user.role != 'admin':
             return error_response("Unauthorized", 403)
         
         # Update fields
@@ -244,13 +269,12 @@ def update_business(business_id):
         db.session.rollback()
         return error_response("Failed to update business", 500)
 
-@businesses_bp.route('/<business_id>', methods=['DELETE'])
+@businesses_bp.route('/<uuid:business_id>', methods=['DELETE'])
 @jwt_required()
 def delete_business(business_id):
     """Delete a business (admin only)"""
     try:
-        current_user_id = get_jwt_identity()
-        current_user = User.query.get(current_user_id)
+        current_user = get_current_user()
         
         if current_user.role != 'admin':
             return error_response("Unauthorized", 403)
@@ -270,13 +294,12 @@ def delete_business(business_id):
         db.session.rollback()
         return error_response("Failed to delete business", 500)
 
-@businesses_bp.route('/<business_id>/activate', methods=['POST'])
+@businesses_bp.route('/<uuid:business_id>/activate', methods=['POST'])
 @jwt_required()
 def activate_business(business_id):
     """Activate a business (admin only)"""
     try:
-        current_user_id = get_jwt_identity()
-        current_user = User.query.get(current_user_id)
+        current_user = get_current_user()
         
         if current_user.role != 'admin':
             return error_response("Unauthorized", 403)
@@ -298,13 +321,12 @@ def activate_business(business_id):
         db.session.rollback()
         return error_response("Failed to activate business", 500)
 
-@businesses_bp.route('/<business_id>/deactivate', methods=['POST'])
+@businesses_bp.route('/<uuid:business_id>/deactivate', methods=['POST'])
 @jwt_required()
 def deactivate_business(business_id):
     """Deactivate a business (admin only)"""
     try:
-        current_user_id = get_jwt_identity()
-        current_user = User.query.get(current_user_id)
+        current_user = get_current_user()
         
         if current_user.role != 'admin':
             return error_response("Unauthorized", 403)
@@ -331,8 +353,7 @@ def deactivate_business(business_id):
 def get_business_stats():
     """Get business statistics (admin only)"""
     try:
-        current_user_id = get_jwt_identity()
-        current_user = User.query.get(current_user_id)
+        current_user = get_current_user()
         
         if current_user.role != 'admin':
             return error_response("Unauthorized", 403)
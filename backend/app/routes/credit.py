@@ -1,10 +1,12 @@
 from flask import Blueprint, request
-from flask_jwt_extended import jwt_required, get_jwt_identity
+from flask_jwt_extended import jwt_required
 from app import db
 from app.models.credit import CreditProfile, CreditScore
-from app.models.business import Business
-from app.utils.response import success_response, error_response, paginated_response, not_found_response
-from app.utils.validators import validate_required_fields, validate_amount
+from app.utils.response import success_response, error_response, paginated_response, etag_response, not_modified_response
+from app.utils.etag import query_etag, is_not_modified
+from app.utils.fields import parse_fields, field_columns, select_fields
+from app.utils.rows import as_rows
+from app.utils.tenant import get_current_business
 from datetime import datetime
 
 credit_bp = Blueprint('credit', __name__)
@@ -14,24 +16,32 @@ credit_bp = Blueprint('credit', __name__)
 def get_credit_profile():
     """Get credit profile for the current user's business"""
     try:
-        current_user_id = get_jwt_identity()
-        
         # Get user's business
-        business = Business.query.filter_by(owner_id=current_user_id).first()
+        business = get_current_business()
         if not business:
             return error_response("Business not found", 404)
         
-        # Get credit profile
-        credit_profile = CreditProfile.query.filter_by(
-            business_id=business.id, is_active=True
+        # Build query
+        query = CreditProfile.query.filter_by(business_id=business.id, is_active=True)
+        
+        # Answer revalidation before loading or serializing anything
+        etag = query_etag(query, CreditProfile.updated_at, business.id)
+        if is_not_modified(etag):
+            return not_modified_response(etag)
+        
+        # Get credit profile, loading only the requested fields' columns
+        fields = parse_fields()
+        credit_profile = as_rows(
+            query, CreditProfile, field_columns(CreditProfile, fields)
         ).first()
         
         if not credit_profile:
             return error_response("Credit profile not found", 404)
         
-        return success_response(
-            credit_profile.to_dict(), "Credit profile retrieved successfully"
-        )
+        return etag_response(success_response(
+            select_fields(CreditProfile.serialize(credit_profile), fields),
+            "Credit profile retrieved successfully"
+        ), etag)
         
     except Exception as e:
         return error_response("Failed to retrieve credit profile", 500)
@@ -41,11 +51,10 @@ def get_credit_profile():
 def create_credit_profile():
     """Create a new credit profile"""
     try:
-        current_user_id = get_jwt_identity()
         data = request.get_json()
         
         # Get user's business
-        business = Business.query.filter_by(owner_id=current_user_id).first()
+        business = get_current_business()
         if not business:
             return error_response("Business not found", 404)
         
@@ -91,11 +100,10 @@ def create_credit_profile():
 def update_credit_profile():
     """Update credit profile"""
     try:
-        current_user_id = get_jwt_identity()
         data = request.get_json()
         
         # Get user's business
-        business = Business.query.filter_by(owner_id=current_user_id).first()
+        business = get_current_business()
         if not business:
             return error_response("Business not found", 404)
         
@@ -145,11 +153,10 @@ def update_credit_profile():
 def assess_credit_profile():
     """Trigger a new credit assessment"""
     try:
-        current_user_id = get_jwt_identity()
         data = request.get_json()
         
         # Get user's business
-        business = Business.query.filter_by(owner_id=current_user_id).first()
+        business = get_current_business()
         if not business:
             return error_response("Business not found", 404)
         
@@ -208,14 +215,13 @@ def assess_credit_profile():
 def get_credit_scores():
     """Get credit score history"""
     try:
-        current_user_id = get_jwt_identity()
-        
         # Get query parameters
         page = request.args.get('page', 1, type=int)
         per_page = min(request.args.get('per_page', 10, type=int), 100)
+        fields = parse_fields()
         
         # Get user's business
-        business = Business.query.filter_by(owner_id=current_user_id).first()
+        business = get_current_business()
         if not business:
             return error_response("Business not found", 404)
         
@@ -231,12 +237,15 @@ def get_credit_scores():
         query = CreditScore.query.filter_by(credit_profile_id=credit_profile.id)
         query = query.order_by(CreditScore.assessment_date.desc())
         
+        # Serialize from plain rows, loading only the requested fields' columns
+        query = as_rows(query, CreditScore, field_columns(CreditScore, fields))
+        
         # Paginate
         pagination = query.paginate(
             page=page, per_page=per_page, error_out=False
         )
         
-        credit_scores = [score.to_dict() for score in pagination.items]
+        credit_scores = [select_fields(CreditScore.serialize(row), fields) for row in pagination.items]
         
         return paginated_response(
             credit_scores, page, per_page, pagination.total,
@@ -251,10 +260,8 @@ def get_credit_scores():
 def get_lending_readiness():
     """Get lending readiness assessment"""
     try:
-        current_user_id = get_jwt_identity()
-        
         # Get user's business
-        business = Business.query.filter_by(owner_id=current_user_id).first()
+        business = get_current_business()
         if not business:
             return error_response("Business not found", 404)
         
@@ -274,7 +281,7 @@ def get_lending_readiness():
             'credit_score': credit_profile.credit_score,
             'credit_rating': credit_profile.credit_rating,
             'risk_level': credit_profile.risk_level,
-            'assessment_date': credit_profile.assessment_date.isoformat() if credit_profile.assessment_date else None
+            'assessment_date': credit_profile.assessment_date
         }, "Lending readiness assessment retrieved successfully")
         
     except Exception as e:
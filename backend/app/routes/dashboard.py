@@ -0,0 +1,122 @@
+from flask import Blueprint, request
+from flask_jwt_extended import jwt_required
+from app.models.dashboard import DashboardAggregate, month_key
+from app.models.expense import ExpenseCategory
+from app.utils.response import success_response, error_response, etag_response, not_modified_response
+from app.utils.etag import query_etag, is_not_modified
+from app.utils.tenant import get_current_business
+from decimal import Decimal
+from datetime import datetime
+import uuid
+
+dashboard_bp = Blueprint('dashboard', __name__)
+
+def _previous_month(period):
+    """Return the ``YYYY-MM`` period before the given one"""
+    year, month = map(int, period.split('-'))
+    return f'{year - 1:04d}-12' if month == 1 else f'{year:04d}-{month - 1:02d}'
+
+@dashboard_bp.route('/', methods=['GET'], strict_slashes=False)
+@jwt_required()
+def get_dashboard():
+    """Get dashboard totals for the current user's business"""
+    try:
+        # Get query parameters
+        period = request.args.get('month') or month_key(datetime.utcnow())
+        
+        # Validate month, normalizing to the zero-padded aggregate key (2024-1 -> 2024-01)
+        try:
+            period = month_key(datetime.strptime(period, '%Y-%m'))
+        except ValueError:
+            return error_response("Invalid month format, expected YYYY-MM", 400)
+        previous_period = _previous_month(period)
+        
+        # Get user's business
+        business = get_current_business()
+        if not business:
+            return error_response("Business not found", 404)
+        
+        # Running totals plus the requested and previous months
+        query = DashboardAggregate.query.filter(
+            DashboardAggregate.business_id == business.id,
+            DashboardAggregate.period.in_(('', period, previous_period))
+        )
+        
+        # Answer revalidation before loading anything
+        etag = query_etag(query, DashboardAggregate.updated_at, business.id)
+        if is_not_modified(etag):
+            return not_modified_response(etag)
+        
+        totals = {}
+        for aggregate in query.with_entities(
+            DashboardAggregate.metric, DashboardAggregate.period, DashboardAggregate.dimension,
+            DashboardAggregate.value, DashboardAggregate.count
+        ):
+            totals[(aggregate.metric, aggregate.period, aggregate.dimension)] = (aggregate.value, aggregate.count)
+        
+        def total(metric, in_period='', dimension=None):
+            value, count = Decimal('0'), 0
+            for (key_metric, key_period, key_dimension), (row_value, row_count) in totals.items():
+                if key_metric == metric and key_period == in_period and dimension in (None, key_dimension):
+                    value, count = value + row_value, count + row_count
+            return value, count
+        
+        # Expenses by category, named from the business's categories
+        by_category = sorted(
+            ((dimension, value, count) for (metric, key_period, dimension), (value, count) in totals.items()
+             if metric == 'expenses' and key_period == period and count),
+            key=lambda entry: entry[1], reverse=True
+        )
+        category_ids = [uuid.UUID(dimension) for dimension, value, count in by_category if dimension]
+        categories = {
+            str(category.id): category
+            for category in ExpenseCategory.query.filter(
+                ExpenseCategory.business_id == business.id,
+                ExpenseCategory.id.in_(category_ids)
+            )
+        } if category_ids else {}
+        
+        outstanding, open_invoices = total('receivables_outstanding')
+        paid_invoices, paid_count = total('invoices_paid', period)
+        expenses, expense_count = total('expenses', period)
+        
+        return etag_response(success_response({
+            'period': period,
+            'receivables': {
+                'outstanding': outstanding,
+                'open_invoices': open_invoices
+            },
+            'paid': {
+                'invoices': paid_invoices,
+                'invoice_count': paid_count,
+                'payments_received': total('payments_completed', period, 'incoming')[0],
+                'payments_sent': total('payments_completed', period, 'outgoing')[0]
+            },
+            'expenses': {
+                'total': expenses,
+                'count': expense_count,
+                'by_category': [
+                    {
+                        'category_id': dimension or None,
+                        'name': categories[dimension].name if dimension in categories else 'Uncategorized',
+                        'color': categories[dimension].color if dimension in categories else None,
+                        'amount': value,
+                        'count': count
+                    }
+                    for dimension, value, count in by_category
+                ]
+            },
+            'previous_period': {
+                'period': previous_period,
+                'paid_invoices': total('invoices_paid', previous_period)[0],
+                'expenses': total('expenses', previous_period)[0]
+            },
+            'wallets': [
+                {'currency': dimension, 'balance': value, 'wallet_count': count}
+                for (metric, key_period, dimension), (value, count) in sorted(totals.items())
+                if metric == 'wallet_balance' and count
+            ]
+        }, "Dashboard retrieved successfully"), etag)
+        
+    except Exception as e:
+        return error_response("Failed to retrieve dashboard", 500)
\ No newline at end of file
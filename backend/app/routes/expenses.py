@@ -1,31 +1,123 @@
-from flask import Blueprint, request
-from flask_jwt_extended import jwt_required, get_jwt_identity
+from flask import Blueprint, request, current_app
+from flask_jwt_extended import jwt_required
 from app import db
 from app.models.expense import Expense, ExpenseCategory
-from app.models.business import Business
-from app.utils.response import success_response, error_response, paginated_response, not_found_response
-from app.utils.validators import validate_required_fields, validate_amount, validate_date
+from app.models.user import User
+from app.models.dashboard import DashboardAggregate
+from app.utils.response import success_response, error_response, paginated_response, cursor_paginated_response, not_found_response, etag_response, not_modified_response, validation_error_response
+from app.utils.etag import query_etag, is_not_modified
+from app.utils.pagination import keyset_paginate, InvalidCursorError
+from app.utils.fields import parse_fields, field_columns, select_fields, wants_field
+from app.utils.export import stream_rows, csv_response
+from app.utils.rows import as_rows
+from app.utils.tenant import get_current_business
+from app.utils.current_user import get_current_user_id
+from app.utils.validators import validate_required_fields, validate_amount, validate_date, parse_amount, validate_length, parse_uuid
 from datetime import datetime
+from sqlalchemy import insert
+from sqlalchemy.orm import aliased
+import codecs
+import csv
 
 expenses_bp = Blueprint('expenses', __name__)
 
+EXPENSE_CSV_COLUMNS = [
+    'id', 'date', 'description', 'vendor', 'category', 'amount', 'currency',
+    'payment_method', 'status', 'approved_by', 'approved_at', 'notes', 'created_at'
+]
+
+def _filter_expenses(query, args):
+    """Apply the status, category and date range filters shared by listing and export"""
+    if args.get('status'):
+        query = query.filter_by(status=args['status'])
+    if args.get('category_id'):
+        query = query.filter_by(category_id=parse_uuid(args['category_id']))
+    if args.get('date_from'):
+        query = query.filter(Expense.date >= args['date_from'])
+    if args.get('date_to'):
+        query = query.filter(Expense.date <= args['date_to'])
+    return query
+
+IMPORT_REQUIRED_COLUMNS = ['description', 'amount', 'date']
+
+# Imported text columns checked against their column lengths
+IMPORT_STRING_COLUMNS = ['description', 'currency', 'payment_method', 'receipt_url', 'vendor']
+
+# Cap on row errors echoed back from an import
+IMPORT_MAX_REPORTED_ERRORS = 100
+
+def _build_import_expense(row, categories, business, current_user_id):
+    """Validate one imported CSV row and build its insert row, or return its errors"""
+    missing_fields = validate_required_fields(row, IMPORT_REQUIRED_COLUMNS)
+    if missing_fields:
+        return None, [f"Missing required fields: {', '.join(missing_fields)}"]
+    
+    errors = []
+    amount = parse_amount(row['amount'])
+    if amount is None:
+        errors.append("Invalid amount")
+    if not validate_date(row['date']):
+        errors.append("Invalid date format")
+    for key in IMPORT_STRING_COLUMNS:
+        max_length = getattr(Expense, key).type.length
+        if not validate_length(row.get(key), max_length):
+            errors.append(f"{key.replace('_', ' ').capitalize()} must be at most {max_length} characters")
+    
+    category_id = None
+    category_name = (row.get('category') or '').strip()
+    if category_name:
+        category_id = categories.get(category_name.lower())
+        if category_id is None:
+            errors.append(f"Unknown category: {category_name}")
+    
+    if errors:
+        return None, errors
+    
+    tags = [tag.strip() for tag in (row.get('tags') or '').split(';') if tag.strip()]
+    
+    return {
+        'description': row['description'],
+        'amount': amount,
+        'currency': row.get('currency') or business.currency,
+        'date': datetime.strptime(row['date'], '%Y-%m-%d').date(),
+        'payment_method': row.get('payment_method') or None,
+        'receipt_url': row.get('receipt_url') or None,
+        'vendor': row.get('vendor') or None,
+        'tags': tags,
+        'notes': row.get('notes') or None,
+        'business_id': business.id,
+        'created_by': current_user_id,
+        'category_id': category_id
+    }, []
+
+def _expense_csv_row(row):
+    """Map an export row to the cells of EXPENSE_CSV_COLUMNS"""
+    approver = ' '.join(filter(None, (row.approver_first_name, row.approver_last_name))) or None
+    
+    return [
+        row.id, row.date, row.description, row.vendor, row.category, row.amount,
+        row.currency, row.payment_method, row.status, approver, row.approved_at,
+        row.notes, row.created_at
+    ]
+
 @expenses_bp.route('/', methods=['GET'])
 @jwt_required()
 def get_expenses():
     """Get all expenses for the current user's business"""
     try:
-        current_user_id = get_jwt_identity()
-        
         # Get query parameters
         page = request.args.get('page', 1, type=int)
         per_page = min(request.args.get('per_page', 10, type=int), 100)
-        status = request.args.get('status')
-        category_id = request.args.get('category_id')
-        date_from = request.args.get('date_from')
-        date_to = request.args.get('date_to')
+        if per_page < 1:
+            return error_response("per_page must be at least 1", 400)
+        cursor = request.args.get('cursor')
+        include_total = request.args.get('include_total', 'false').lower() == 'true'
+        fields = parse_fields()
+        if request.args.get('category_id') and not parse_uuid(request.args['category_id']):
+            return error_response("Invalid category_id format", 400)
         
         # Get user's business
-        business = Business.query.filter_by(owner_id=current_user_id).first()
+        business = get_current_business()
         if not business:
             return error_response("Business not found", 404)
         
@@ -33,55 +125,125 @@ def get_expenses():
         query = Expense.query.filter_by(business_id=business.id)
         
         # Apply filters
-        if status:
-            query = query.filter_by(status=status)
-        if category_id:
-            query = query.filter_by(category_id=category_id)
-        if date_from:
-            query = query.filter(Expense.date >= date_from)
-        if date_to:
-            query = query.filter(Expense.date <= date_to)
-        
-        # Order by date
-        query = query.order_by(Expense.date.desc())
-        
-        # Paginate
-        pagination = query.paginate(
-            page=page, per_page=per_page, error_out=False
+        query = _filter_expenses(query, request.args)
+        
+        # Answer revalidation before loading or serializing anything
+        # (embedded category names change with the business's categories)
+        category_query = ExpenseCategory.query.filter_by(business_id=business.id)
+        etag = query_etag(
+            query, Expense.updated_at, business.id,
+            related=[(category_query, ExpenseCategory.updated_at)]
         )
-        
-        expenses = [expense.to_dict() for expense in pagination.items]
-        
-        return paginated_response(
+        if is_not_modified(etag):
+            return not_modified_response(etag)
+        
+        # Serialize from plain rows, loading only the requested fields' columns
+        query = as_rows(query, Expense, field_columns(Expense, fields, ('date',)))
+        
+        # Paginate by keyset when a cursor is supplied, by page otherwise
+        if cursor is not None:
+            pagination = keyset_paginate(
+                query, Expense.date, Expense.id, cursor, per_page, include_total
+            )
+        else:
+            query = query.order_by(Expense.date.desc())
+            pagination = query.paginate(
+                page=page, per_page=per_page, error_out=False
+            )
+        
+        # Load categories for the whole page in one query
+        categories = Expense.load_categories(pagination.items) if wants_field(fields, 'category') else {}
+        expenses = [
+            select_fields(Expense.serialize(row, categories.get(row.category_id)), fields)
+            for row in pagination.items
+        ]
+        
+        if cursor is not None:
+            return etag_response(cursor_paginated_response(
+                expenses, per_page, pagination.next_cursor, pagination.total,
+                "Expenses retrieved successfully"
+            ), etag)
+        
+        return etag_response(paginated_response(
             expenses, page, per_page, pagination.total,
             "Expenses retrieved successfully"
-        )
+        ), etag)
         
+    except InvalidCursorError:
+        return error_response("Invalid pagination cursor", 400)
     except Exception as e:
         return error_response("Failed to retrieve expenses", 500)
 
-@expenses_bp.route('/<expense_id>', methods=['GET'])
+@expenses_bp.route('/export.csv', methods=['GET'])
+@jwt_required()
+def export_expenses_csv():
+    """Stream expenses for the current user's business as CSV"""
+    try:
+        # Validate date range
+        for param in ('date_from', 'date_to'):
+            if request.args.get(param) and not validate_date(request.args[param]):
+                return error_response(f"Invalid {param} format", 400)
+        if request.args.get('category_id') and not parse_uuid(request.args['category_id']):
+            return error_response("Invalid category_id format", 400)
+        
+        # Get user's business
+        business = get_current_business()
+        if not business:
+            return error_response("Business not found", 404)
+        
+        # Build query
+        query = Expense.query.filter_by(business_id=business.id)
+        
+        # Apply filters
+        query = _filter_expenses(query, request.args)
+        
+        # Join category names and approvers in the same query
+        approver = aliased(User)
+        query = query.outerjoin(
+            ExpenseCategory, Expense.category_id == ExpenseCategory.id
+        ).outerjoin(
+            approver, Expense.approved_by == approver.id
+        ).with_entities(
+            Expense.id, Expense.date, Expense.description, Expense.vendor,
+            ExpenseCategory.name.label('category'), Expense.amount, Expense.currency,
+            Expense.payment_method, Expense.status,
+            approver.first_name.label('approver_first_name'),
+            approver.last_name.label('approver_last_name'),
+            Expense.approved_at, Expense.notes, Expense.created_at
+        ).order_by(Expense.date.desc(), Expense.id.desc())
+        
+        return csv_response(
+            stream_rows(query), EXPENSE_CSV_COLUMNS, _expense_csv_row, "expenses.csv"
+        )
+        
+    except Exception as e:
+        return error_response("Failed to export expenses", 500)
+
+@expenses_bp.route('/<uuid:expense_id>', methods=['GET'])
 @jwt_required()
 def get_expense(expense_id):
     """Get a specific expense"""
     try:
-        current_user_id = get_jwt_identity()
-        
         # Get user's business
-        business = Business.query.filter_by(owner_id=current_user_id).first()
+        business = get_current_business()
         if not business:
             return error_response("Business not found", 404)
         
-        # Get expense
-        expense = Expense.query.filter_by(
-            id=expense_id, business_id=business.id
+        # Get expense, loading only the requested fields' columns
+        fields = parse_fields()
+        expense = as_rows(
+            Expense.query.filter_by(id=expense_id, business_id=business.id),
+            Expense, field_columns(Expense, fields)
         ).first()
         
         if not expense:
             return not_found_response("Expense")
         
+        categories = Expense.load_categories([expense]) if wants_field(fields, 'category') else {}
+        
         return success_response(
-            expense.to_dict(), "Expense retrieved successfully"
+            select_fields(Expense.serialize(expense, categories.get(expense.category_id)), fields),
+            "Expense retrieved successfully"
         )
         
     except Exception as e:
@@ -92,11 +254,11 @@ def get_expense(expense_id):
 def create_expense():
     """Create a new expense"""
     try:
-        current_user_id = get_jwt_identity()
+        current_user_id = get_current_user_id()
         data = request.get_json()
         
         # Get user's business
-        business = Business.query.filter_by(owner_id=current_user_id).first()
+        business = get_current_business()
         if not business:
             return error_response("Business not found", 404)
         
@@ -114,6 +276,9 @@ def create_expense():
         if not validate_date(data['date']):
             return error_response("Invalid date format", 400)
         
+        if data.get('category_id') is not None and not parse_uuid(data['category_id']):
+            return error_response("Invalid category_id format", 400)
+        
         # Create expense
         expense = Expense(
             description=data['description'],
@@ -127,7 +292,7 @@ def create_expense():
             notes=data.get('notes'),
             business_id=business.id,
             created_by=current_user_id,
-            category_id=data.get('category_id')
+            category_id=parse_uuid(data.get('category_id'))
         )
         
         db.session.add(expense)
@@ -141,16 +306,95 @@ def create_expense():
         db.session.rollback()
         return error_response("Failed to create expense", 500)
 
-@expenses_bp.route('/<expense_id>', methods=['PUT'])
+@expenses_bp.route('/import', methods=['POST'])
+@jwt_required()
+def import_expenses():
+    """Import expenses from a CSV upload, inserting valid rows in batches"""
+    try:
+        current_user_id = get_current_user_id()
+        
+        # Get user's business
+        business = get_current_business()
+        if not business:
+            return error_response("Business not found", 404)
+        
+        # Decode the upload line by line rather than loading it whole. Werkzeug
+        # spools uploads to a SpooledTemporaryFile, which io.TextIOWrapper
+        # cannot wrap before Python 3.11
+        upload = request.files.get('file')
+        stream = upload.stream if upload else request.stream
+        reader = csv.DictReader(codecs.iterdecode(stream, 'utf-8-sig'))
+        
+        if not reader.fieldnames:
+            return error_response("CSV file is empty", 400)
+        
+        reader.fieldnames = [name.strip().lower() for name in reader.fieldnames]
+        missing_columns = [name for name in IMPORT_REQUIRED_COLUMNS if name not in reader.fieldnames]
+        if missing_columns:
+            return error_response(f"Missing required columns: {', '.join(missing_columns)}", 400)
+        
+        # Resolve category names with a single preloaded map
+        categories = {
+            name.lower(): category_id
+            for category_id, name in ExpenseCategory.query.filter_by(
+                business_id=business.id, is_active=True
+            ).with_entities(ExpenseCategory.id, ExpenseCategory.name)
+        }
+        
+        # Validate rows as they stream in and insert them in executemany batches
+        batch_size = current_app.config.get('IMPORT_BATCH_SIZE', 1000)
+        batch = []
+        imported = 0
+        failed = 0
+        errors = []
+        for row in reader:
+            expense, row_errors = _build_import_expense(row, categories, business, current_user_id)
+            if row_errors:
+                failed += 1
+                if len(errors) < IMPORT_MAX_REPORTED_ERRORS:
+                    errors.append({'line': reader.line_num, 'errors': row_errors})
+                continue
+            
+            batch.append(expense)
+            if len(batch) >= batch_size:
+                db.session.execute(insert(Expense), batch)
+                DashboardAggregate.record(Expense, batch)
+                imported += len(batch)
+                batch = []
+        
+        if batch:
+            db.session.execute(insert(Expense), batch)
+            DashboardAggregate.record(Expense, batch)
+            imported += len(batch)
+        
+        if not imported:
+            db.session.rollback()
+            return validation_error_response(errors, "No valid expenses to import")
+        
+        db.session.commit()
+        
+        return success_response({
+            'imported': imported,
+            'failed': failed,
+            'errors': errors
+        }, "Expenses imported successfully", 201)
+        
+    except (csv.Error, UnicodeDecodeError):
+        db.session.rollback()
+        return error_response("Invalid CSV file", 400)
+    except Exception as e:
+        db.session.rollback()
+        return error_response("Failed to import expenses", 500)
+
+@expenses_bp.route('/<uuid:expense_id>', methods=['PUT'])
 @jwt_required()
 def update_expense(expense_id):
     """Update an expense"""
     try:
-        current_user_id = get_jwt_identity()
         data = request.get_json()
         
         # Get user's business
-        business = Business.query.filter_by(owner_id=current_user_id).first()
+        business = get_current_business()
         if not business:
             return error_response("Business not found", 404)
         
@@ -182,7 +426,9 @@ def update_expense(expense_id):
         if 'notes' in data:
             expense.notes = data['notes']
         if 'category_id' in data:
-            expense.category_id = data['category_id']
+            if data['category_id'] is not None and not parse_uuid(data['category_id']):
+                return error_response("Invalid category_id format", 400)
+            expense.category_id = parse_uuid(data['category_id'])
         
         db.session.commit()
         
@@ -194,15 +440,13 @@ def update_expense(expense_id):
         db.session.rollback()
         return error_response("Failed to update expense", 500)
 
-@expenses_bp.route('/<expense_id>', methods=['DELETE'])
+@expenses_bp.route('/<uuid:expense_id>', methods=['DELETE'])
 @jwt_required()
 def delete_expense(expense_id):
     """Delete an expense"""
     try:
-        current_user_id = get_jwt_identity()
-        
         # Get user's business
-        business = Business.query.filter_by(owner_id=current_user_id).first()
+        business = get_current_business()
         if not business:
             return error_response("Business not found", 404)
         
@@ -228,20 +472,20 @@ def delete_expense(expense_id):
 def get_expense_categories():
     """Get expense categories for the current user's business"""
     try:
-        current_user_id = get_jwt_identity()
-        
         # Get user's business
-        business = Business.query.filter_by(owner_id=current_user_id).first()
+        business = get_current_business()
         if not business:
             return error_response("Business not found", 404)
         
-        # Get categories
-        categories = ExpenseCategory.query.filter_by(
-            business_id=business.id, is_active=True
+        # Get categories, loading only the requested fields' columns
+        fields = parse_fields()
+        categories = as_rows(
+            ExpenseCategory.query.filter_by(business_id=business.id, is_active=True),
+            ExpenseCategory, field_columns(ExpenseCategory, fields)
         ).all()
         
         return success_response(
-            [category.to_dict() for category in categories],
+            [select_fields(ExpenseCategory.serialize(category), fields) for category in categories],
             "Expense categories retrieved successfully"
         )
         
@@ -253,11 +497,10 @@ def get_expense_categories():
 def create_expense_category():
     """Create a new expense category"""
     try:
-        current_user_id = get_jwt_identity()
         data = request.get_json()
         
         # Get user's business
-        business = Business.query.filter_by(owner_id=current_user_id).first()
+        business = get_current_business()
         if not business:
             return error_response("Business not found", 404)
         
@@ -0,0 +1,106 @@
+from flask import Blueprint, current_app
+from alembic.runtime.migration import MigrationContext
+from alembic.script import ScriptDirectory
+from sqlalchemy.pool import QueuePool
+from app import db
+import os
+import threading
+import time
+
+health_bp = Blueprint('health', __name__)
+
+SERVICE_NAME = 'Trident Financial OS API'
+
+# Migration heads of the code (read once per directory) and of the database
+# (re-read at most every HEALTH_MIGRATION_CACHE_SECONDS)
+_script_heads = {}
+_database_heads = {}
+_migration_lock = threading.Lock()
+
+def _pool_stats(pool):
+    """Report connection pool usage, flagging a pool with no connection left to hand out"""
+    if not isinstance(pool, QueuePool):
+        return {'ok': True, 'class': type(pool).__name__}
+    
+    max_overflow = pool._max_overflow
+    checked_out = pool.checkedout()
+    exhausted = max_overflow >= 0 and checked_out >= pool.size() + max_overflow
+    return {
+        'ok': not exhausted,
+        'class': type(pool).__name__,
+        'size': pool.size(),
+        'checked_in': pool.checkedin(),
+        'checked_out': checked_out,
+        'overflow': pool.overflow(),
+        'max_overflow': max_overflow
+    }
+
+def _script_heads_for(directory):
+    """Return the migration heads defined in the code"""
+    heads = _script_heads.get(directory)
+    if heads is None:
+        heads = _script_heads[directory] = tuple(sorted(ScriptDirectory(directory).get_heads()))
+    return heads
+
+def _check_migrations(connection):
+    """Compare the database's migration heads with the code's, caching the database side"""
+    # Flask-Migrate's directory is relative to the backend directory, not the worker's cwd
+    directory = os.path.join(os.path.dirname(current_app.root_path), current_app.extensions['migrate'].directory)
+    ttl = current_app.config.get('HEALTH_MIGRATION_CACHE_SECONDS', 5)
+    expected = _script_heads_for(directory)
+    
+    key = (str(connection.engine.url), directory)
+    cached = _database_heads.get(key)
+    now = time.monotonic()
+    if cached is None or now - cached[0] >= ttl:
+        with _migration_lock:
+            cached = _database_heads.get(key)
+            if cached is None or now - cached[0] >= ttl:
+                heads = tuple(sorted(MigrationContext.configure(connection).get_current_heads()))
+                cached = _database_heads[key] = (now, heads)
+    
+    current = cached[1]
+    return {'ok': current == expected, 'expected': list(expected), 'current': list(current)}
+
+def _ping(connection, timeout_ms):
+    """Run a trivial query, bounded by a statement timeout where the database supports one"""
+    started = time.perf_counter()
+    if connection.dialect.name == 'postgresql':
+        connection.exec_driver_sql(f'SET LOCAL statement_timeout = {int(timeout_ms)}')
+    connection.exec_driver_sql('SELECT 1').scalar()
+    return {'ok': True, 'latency_ms': round((time.perf_counter() - started) * 1000, 2)}
+
+@health_bp.route('/live', methods=['GET'])
+def liveness():
+    """Report that the worker process is up, without touching the database"""
+    return {'status': 'alive', 'service': SERVICE_NAME, 'pid': os.getpid()}
+
+@health_bp.route('/ready', methods=['GET'])
+def readiness():
+    """Report whether this worker can serve traffic: database reachable, pool not exhausted, schema migrated"""
+    engine = db.engine
+    pool = _pool_stats(engine.pool)
+    checks = {'pool': pool}
+    
+    # An exhausted pool would block the ping until pool_timeout; fail fast instead
+    if not pool['ok']:
+        checks['database'] = {'ok': False, 'error': 'Connection pool exhausted'}
+    else:
+        try:
+            with engine.connect() as connection:
+                checks['database'] = _ping(connection, current_app.config.get('HEALTH_DB_TIMEOUT_MS', 1000))
+                if current_app.config.get('HEALTH_CHECK_MIGRATIONS', True):
+                    try:
+                        checks['migrations'] = _check_migrations(connection)
+                    except Exception as e:
+                        checks['migrations'] = {'ok': False, 'error': type(e).__name__}
+                connection.rollback()
+        except Exception as e:
+            checks['database'] = {'ok': False, 'error': type(e).__name__}
+    
+    ready = all(check['ok'] for check in checks.values())
+    return {
+        'status': 'ready' if ready else 'unavailable',
+        'service': SERVICE_NAME,
+        'checks': checks
+    }, 200 if ready else 503
\ No newline at end of file
@@ -1,30 +1,142 @@
-from flask import Blueprint, request
-from flask_jwt_extended import jwt_required, get_jwt_identity
+from flask import Blueprint, request, current_app
+from flask_jwt_extended import jwt_required
 from app import db
 from app.models.invoice import Invoice, InvoiceItem
-from app.models.business import Business
-from app.utils.response import success_response, error_response, paginated_response, not_found_response
-from app.utils.validators import validate_required_fields, validate_amount, validate_date
+from app.models.dashboard import DashboardAggregate
+from app.utils.response import success_response, error_response, paginated_response, cursor_paginated_response, not_found_response, etag_response, not_modified_response, validation_error_response
+from app.utils.etag import query_etag, is_not_modified
+from app.utils.pagination import keyset_paginate, InvalidCursorError
+from app.utils.fields import parse_fields, field_columns, select_fields, wants_field
+from app.utils.rows import as_rows
+from app.utils.tenant import get_current_business
+from app.utils.validators import validate_required_fields, validate_date, parse_amount, validate_length
 from datetime import datetime
+from decimal import Decimal
+from sqlalchemy import insert
 import uuid
 
 invoices_bp = Blueprint('invoices', __name__)
 
+def _generate_invoice_number():
+    """Generate a unique, date-prefixed invoice number"""
+    return f"INV-{datetime.now().strftime('%Y%m%d')}-{uuid.uuid4().hex[:8].upper()}"
+
+# Text fields of a bulk invoice checked against their column lengths
+BULK_INVOICE_STRING_FIELDS = ['client_name', 'client_email', 'client_phone', 'payment_terms', 'currency']
+
+def _validate_bulk_invoice(data):
+    """Return the validation errors for one invoice of a bulk request
+    
+    Every value is checked against the type, length and Numeric(10, 2) range
+    of its column, so one bad invoice cannot abort the batched insert.
+    """
+    if not isinstance(data, dict):
+        return ["Invoice must be an object"]
+    
+    missing_fields = validate_required_fields(data, ['client_name', 'issue_date', 'due_date'])
+    if missing_fields:
+        return [f"Missing required fields: {', '.join(missing_fields)}"]
+    
+    errors = []
+    for key in BULK_INVOICE_STRING_FIELDS:
+        max_length = getattr(Invoice, key).type.length
+        if not validate_length(data.get(key), max_length):
+            errors.append(f"{key.replace('_', ' ').capitalize()} must be a string of at most {max_length} characters")
+    if not isinstance(data['issue_date'], str) or not validate_date(data['issue_date']):
+        errors.append("Invalid issue date format")
+    if not isinstance(data['due_date'], str) or not validate_date(data['due_date']):
+        errors.append("Invalid due date format")
+    
+    items = data.get('items', [])
+    if not isinstance(items, list):
+        return errors + ["Items must be a list"]
+    
+    subtotal = Decimal('0')
+    description_length = InvoiceItem.description.type.length
+    for position, item_data in enumerate(items):
+        if not isinstance(item_data, dict) or not item_data.get('description'):
+            errors.append(f"Item {position}: description is required")
+            continue
+        if not validate_length(item_data['description'], description_length):
+            errors.append(f"Item {position}: description must be a string of at most {description_length} characters")
+            continue
+        
+        unit_price = parse_amount(item_data.get('unit_price'))
+        quantity = parse_amount(item_data.get('quantity', 1))
+        if unit_price is None:
+            errors.append(f"Item {position}: invalid unit price")
+        elif quantity is None:
+            errors.append(f"Item {position}: invalid quantity")
+        elif parse_amount(quantity * unit_price) is None:
+            errors.append(f"Item {position}: total is too large")
+        else:
+            subtotal += quantity * unit_price
+    
+    if not errors and parse_amount(subtotal) is None:
+        errors.append("Invoice total is too large")
+    
+    return errors
+
+def _build_bulk_invoice(data, business):
+    """Build the insert rows for one validated invoice and its items"""
+    invoice_id = uuid.uuid4()
+    
+    items = []
+    for item_data in data.get('items', []):
+        quantity = Decimal(str(item_data.get('quantity', 1)))
+        unit_price = Decimal(str(item_data['unit_price']))
+        items.append({
+            'id': uuid.uuid4(),
+            'description': item_data['description'],
+            'quantity': quantity,
+            'unit_price': unit_price,
+            'total': quantity * unit_price,
+            'invoice_id': invoice_id
+        })
+    
+    subtotal = sum((item['total'] for item in items), Decimal('0'))
+    invoice = {
+        'id': invoice_id,
+        'invoice_number': _generate_invoice_number(),
+        'status': 'draft',
+        'client_name': data['client_name'],
+        'client_email': data.get('client_email'),
+        'client_phone': data.get('client_phone'),
+        'client_address': data.get('client_address'),
+        'issue_date': datetime.strptime(data['issue_date'], '%Y-%m-%d').date(),
+        'due_date': datetime.strptime(data['due_date'], '%Y-%m-%d').date(),
+        'payment_terms': data.get('payment_terms'),
+        'notes': data.get('notes'),
+        'subtotal': subtotal,
+        'tax_amount': Decimal('0'),
+        'discount_amount': Decimal('0'),
+        'total_amount': subtotal,
+        'paid_amount': Decimal('0'),
+        'currency': data.get('currency', business.currency),
+        'business_id': business.id
+    }
+    
+    return invoice, items
+
 @invoices_bp.route('/', methods=['GET'])
 @jwt_required()
 def get_invoices():
     """Get all invoices for the current user's business"""
     try:
-        current_user_id = get_jwt_identity()
-        
         # Get query parameters
         page = request.args.get('page', 1, type=int)
         per_page = min(request.args.get('per_page', 10, type=int), 100)
+        if per_page < 1:
+            return error_response("per_page must be at least 1", 400)
+        cursor = request.args.get('cursor')
+        include_total = request.args.get('include_total', 'false').lower() == 'true'
         status = request.args.get('status')
         client_name = request.args.get('client_name')
+        include_items = request.args.get('include_items', 'true').lower() != 'false'
+        fields = parse_fields()
         
         # Get user's business
-        business = Business.query.filter_by(owner_id=current_user_id).first()
+        business = get_current_business()
         if not business:
             return error_response("Business not found", 404)
         
@@ -37,46 +149,81 @@ def get_invoices():
         if client_name:
             query = query.filter(Invoice.client_name.ilike(f'%{client_name}%'))
         
-        # Order by created date
-        query = query.order_by(Invoice.created_at.desc())
-        
-        # Paginate
-        pagination = query.paginate(
-            page=page, per_page=per_page, error_out=False
+        # Answer revalidation before loading or serializing anything
+        # (embedded line items are covered through the filtered invoices)
+        item_query = InvoiceItem.query.filter(InvoiceItem.invoice_id.in_(query.with_entities(Invoice.id)))
+        etag = query_etag(
+            query, Invoice.updated_at, business.id,
+            related=[(item_query, InvoiceItem.updated_at)]
         )
-        
-        invoices = [invoice.to_dict() for invoice in pagination.items]
-        
-        return paginated_response(
+        if is_not_modified(etag):
+            return not_modified_response(etag)
+        
+        # Serialize from plain rows, loading only the requested fields' columns
+        query = as_rows(query, Invoice, field_columns(Invoice, fields, ('created_at',)))
+        
+        # Paginate by keyset when a cursor is supplied, by page otherwise
+        if cursor is not None:
+            pagination = keyset_paginate(
+                query, Invoice.created_at, Invoice.id, cursor, per_page, include_total
+            )
+        else:
+            query = query.order_by(Invoice.created_at.desc())
+            pagination = query.paginate(
+                page=page, per_page=per_page, error_out=False
+            )
+        
+        # Load line items for the whole page in one query
+        if include_items and wants_field(fields, 'items'):
+            items_by_invoice = Invoice.load_items(pagination.items)
+        else:
+            items_by_invoice = {}
+        invoices = [
+            select_fields(Invoice.serialize(row, items_by_invoice.get(row.id)), fields)
+            for row in pagination.items
+        ]
+        
+        if cursor is not None:
+            return etag_response(cursor_paginated_response(
+                invoices, per_page, pagination.next_cursor, pagination.total,
+                "Invoices retrieved successfully"
+            ), etag)
+        
+        return etag_response(paginated_response(
             invoices, page, per_page, pagination.total,
             "Invoices retrieved successfully"
-        )
+        ), etag)
         
+    except InvalidCursorError:
+        return error_response("Invalid pagination cursor", 400)
     except Exception as e:
         return error_response("Failed to retrieve invoices", 500)
 
-@invoices_bp.route('/<invoice_id>', methods=['GET'])
+@invoices_bp.route('/<uuid:invoice_id>', methods=['GET'])
 @jwt_required()
 def get_invoice(invoice_id):
     """Get a specific invoice"""
     try:
-        current_user_id = get_jwt_identity()
-        
         # Get user's business
-        business = Business.query.filter_by(owner_id=current_user_id).first()
+        business = get_current_business()
         if not business:
             return error_response("Business not found", 404)
         
-        # Get invoice
-        invoice = Invoice.query.filter_by(
-            id=invoice_id, business_id=business.id
+        # Get invoice, loading only the requested fields' columns
+        fields = parse_fields()
+        invoice = as_rows(
+            Invoice.query.filter_by(id=invoice_id, business_id=business.id),
+            Invoice, field_columns(Invoice, fields)
         ).first()
         
         if not invoice:
             return not_found_response("Invoice")
         
+        items = Invoice.load_items([invoice])[invoice.id] if wants_field(fields, 'items') else None
+        
         return success_response(
-            invoice.to_dict(), "Invoice retrieved successfully"
+            select_fields(Invoice.serialize(invoice, items), fields),
+            "Invoice retrieved successfully"
         )
         
     except Exception as e:
@@ -87,11 +234,10 @@ def get_invoice(invoice_id):
 def create_invoice():
     """Create a new invoice"""
     try:
-        current_user_id = get_jwt_identity()
         data = request.get_json()
         
         # Get user's business
-        business = Business.query.filter_by(owner_id=current_user_id).first()
+        business = get_current_business()
         if not business:
             return error_response("Business not found", 404)
         
@@ -108,7 +254,7 @@ def create_invoice():
             return error_response("Invalid due date format", 400)
         
         # Generate invoice number
-        invoice_number = f"INV-{datetime.now().strftime('%Y%m%d')}-{uuid.uuid4().hex[:8].upper()}"
+        invoice_number = _generate_invoice_number()
         
         # Create invoice
         invoice = Invoice(
@@ -129,6 +275,7 @@ def create_invoice():
         db.session.flush()  # Get the invoice ID
         
         # Add invoice items if provided
+        items = []
         if 'items' in data and isinstance(data['items'], list):
             for item_data in data['items']:
                 if not all(key in item_data for key in ['description', 'unit_price']):
@@ -142,9 +289,10 @@ def create_invoice():
                 )
                 item.calculate_total()
                 db.session.add(item)
+                items.append(item)
         
-        # Calculate totals
-        invoice.calculate_totals()
+        # Calculate totals from the items just added
+        invoice.calculate_totals(items)
         
         db.session.commit()
         
@@ -156,16 +304,78 @@ def create_invoice():
         db.session.rollback()
         return error_response("Failed to create invoice", 500)
 
-@invoices_bp.route('/<invoice_id>', methods=['PUT'])
+@invoices_bp.route('/bulk', methods=['POST'])
+@jwt_required()
+def bulk_create_invoices():
+    """Create many invoices with their items in a single transaction"""
+    try:
+        data = request.get_json()
+        invoices_data = data.get('invoices') if isinstance(data, dict) else None
+        
+        if not isinstance(invoices_data, list) or not invoices_data:
+            return error_response("A non-empty invoices list is required", 400)
+        
+        max_rows = current_app.config.get('BULK_MAX_ROWS', 1000)
+        if len(invoices_data) > max_rows:
+            return error_response(f"At most {max_rows} invoices can be created per request", 400)
+        
+        # Get user's business
+        business = get_current_business()
+        if not business:
+            return error_response("Business not found", 404)
+        
+        # Validate every invoice and build its rows in one pass
+        invoice_rows = []
+        item_rows = []
+        results = []
+        for index, invoice_data in enumerate(invoices_data):
+            errors = _validate_bulk_invoice(invoice_data)
+            if errors:
+                results.append({'index': index, 'status': 'error', 'errors': errors})
+                continue
+            
+            invoice, items = _build_bulk_invoice(invoice_data, business)
+            invoice_rows.append(invoice)
+            item_rows.extend(items)
+            results.append({
+                'index': index,
+                'status': 'created',
+                'id': invoice['id'],
+                'invoice_number': invoice['invoice_number']
+            })
+        
+        if not invoice_rows:
+            return validation_error_response(results, "No valid invoices to create")
+        
+        # Insert invoices, then items, as executemany batches in one transaction
+        db.session.execute(insert(Invoice), invoice_rows)
+        if item_rows:
+            db.session.execute(insert(InvoiceItem), item_rows)
+        
+        # Bulk inserts skip ORM events, so update the dashboard directly
+        DashboardAggregate.record(Invoice, invoice_rows)
+        
+        db.session.commit()
+        
+        return success_response({
+            'created': len(invoice_rows),
+            'failed': len(results) - len(invoice_rows),
+            'results': results
+        }, "Invoices created successfully", 201)
+        
+    except Exception as e:
+        db.session.rollback()
+        return error_response("Failed to create invoices", 500)
+
+@invoices_bp.route('/<uuid:invoice_id>', methods=['PUT'])
 @jwt_required()
 def update_invoice(invoice_id):
     """Update an invoice"""
     try:
-        current_user_id = get_jwt_identity()
         data = request.get_json()
         
         # Get user's business
-        business = Business.query.filter_by(owner_id=current_user_id).first()
+        business = get_current_business()
         if not business:
             return error_response("Business not found", 404)
         
@@ -209,15 +419,13 @@ def update_invoice(invoice_id):
         db.session.rollback()
         return error_response("Failed to update invoice", 500)
 
-@invoices_bp.route('/<invoice_id>', methods=['DELETE'])
+@invoices_bp.route('/<uuid:invoice_id>', methods=['DELETE'])
 @jwt_required()
 def delete_invoice(invoice_id):
     """Delete an invoice"""
     try:
-        current_user_id = get_jwt_identity()
-        
         # Get user's business
-        business = Business.query.filter_by(owner_id=current_user_id).first()
+        business = get_current_business()
         if not business:
             return error_response("Business not found", 404)
         
@@ -238,16 +446,15 @@ def delete_invoice(invoice_id):
         db.session.rollback()
         return error_response("Failed to delete invoice", 500)
 
-@invoices_bp.route('/<invoice_id>/mark-paid', methods=['POST'])
+@invoices_bp.route('/<uuid:invoice_id>/mark-paid', methods=['POST'])
 @jwt_required()
 def mark_invoice_paid(invoice_id):
     """Mark an invoice as paid"""
     try:
-        current_user_id = get_jwt_identity()
         data = request.get_json()
         
         # Get user's business
-        business = Business.query.filter_by(owner_id=current_user_id).first()
+        business = get_current_business()
         if not business:
             return error_response("Business not found", 404)
         
@@ -1,22 +1,16 @@
-from flask import Blueprint, jsonify
-import json
-import os
-from pathlib import Path
+from flask import Blueprint, current_app, jsonify
+from app.utils.mockdata import mock_store, MockDataNotFoundError, STRUCTURE_FILE
 
 mockdata_bp = Blueprint('mockdata', __name__)
 
-def load_json_file(file_path: Path):
-    """Helper function to load JSON files"""
-    if not file_path.exists():
-        return None
+def mock_response(filename, label):
+    """Serve a mock data file's pre-encoded body, or a 404 when it is missing"""
+    try:
+        body = mock_store.body(filename)
+    except MockDataNotFoundError:
+        return jsonify({'error': f'{label} mock data file not found'}), 404
     
-    with open(file_path, 'r') as f:
-        return json.load(f)
-
-def get_mockdata_dir():
-    """Get the mockData directory path"""
-    current_dir = Path(__file__).parent.parent.parent
-    return current_dir / 'mockData'
+    return current_app.response_class(body, mimetype='application/json')
 
 @mockdata_bp.route('/api/mockdata', methods=['GET'])
 def get_mock_data():
@@ -24,27 +18,13 @@ def get_mock_data():
     Serve all mock data by combining individual JSON files
     """
     try:
-        mockdata_dir = get_mockdata_dir()
-        
-        # Load the main api.json file to get the structure
-        api_json_path = mockdata_dir / 'api.json'
-        if not api_json_path.exists():
+        body = mock_store.combined()
+        return current_app.response_class(body, mimetype='application/json')
+    
+    except MockDataNotFoundError as e:
+        if e.filename == STRUCTURE_FILE:
             return jsonify({'error': 'Mock data structure file not found'}), 404
-        
-        with open(api_json_path, 'r') as f:
-            structure = json.load(f)
-        
-        # Load all the individual JSON files
-        combined_data = {}
-        for key, filename in structure.items():
-            file_path = mockdata_dir / filename
-            data = load_json_file(file_path)
-            if data is not None:
-                combined_data[key] = data
-            else:
-                return jsonify({'error': f'Mock data file {filename} not found'}), 404
-        
-        return jsonify(combined_data)
+        return jsonify({'error': f'Mock data file {e.filename} not found'}), 404
     
     except Exception as e:
         return jsonify({'error': f'Failed to load mock data: {str(e)}'}), 500
@@ -55,14 +35,7 @@ def get_dashboard_data():
     Serve dashboard mock data
     """
     try:
-        mockdata_dir = get_mockdata_dir()
-        dashboard_path = mockdata_dir / 'dashboard.json'
-        
-        data = load_json_file(dashboard_path)
-        if data is None:
-            return jsonify({'error': 'Dashboard mock data file not found'}), 404
-        
-        return jsonify(data)
+        return mock_response('dashboard.json', 'Dashboard')
     
     except Exception as e:
         return jsonify({'error': f'Failed to load dashboard data: {str(e)}'}), 500
@@ -73,14 +46,7 @@ def get_invoices_data():
     Serve invoices mock data
     """
     try:
-        mockdata_dir = get_mockdata_dir()
-        invoices_path = mockdata_dir / 'invoices.json'
-        
-        data = load_json_file(invoices_path)
-        if data is None:
-            return jsonify({'error': 'Invoices mock data file not found'}), 404
-        
-        return jsonify(data)
+        return mock_response('invoices.json', 'Invoices')
     
     except Exception as e:
         return jsonify({'error': f'Failed to load invoices data: {str(e)}'}), 500
@@ -91,14 +57,7 @@ def get_expenses_data():
     Serve expenses mock data
     """
     try:
-        mockdata_dir = get_mockdata_dir()
-        expenses_path = mockdata_dir / 'expenses.json'
-        
-        data = load_json_file(expenses_path)
-        if data is None:
-            return jsonify({'error': 'Expenses mock data file not found'}), 404
-        
-        return jsonify(data)
+        return mock_response('expenses.json', 'Expenses')
     
     except Exception as e:
         return jsonify({'error': f'Failed to load expenses data: {str(e)}'}), 500
@@ -109,14 +68,7 @@ def get_wallet_data():
     Serve wallet mock data
     """
     try:
-        mockdata_dir = get_mockdata_dir()
-        wallet_path = mockdata_dir / 'wallet.json'
-        
-        data = load_json_file(wallet_path)
-        if data is None:
-            return jsonify({'error': 'Wallet mock data file not found'}), 404
-        
-        return jsonify(data)
+        return mock_response('wallet.json', 'Wallet')
     
     except Exception as e:
         return jsonify({'error': f'Failed to load wallet data: {str(e)}'}), 500
@@ -127,14 +79,7 @@ def get_profile_data():
     Serve profile mock data
     """
     try:
-        mockdata_dir = get_mockdata_dir()
-        profile_path = mockdata_dir / 'profile.json'
-        
-        data = load_json_file(profile_path)
-        if data is None:
-            return jsonify({'error': 'Profile mock data file not found'}), 404
-        
-        return jsonify(data)
+        return mock_response('profile.json', 'Profile')
     
     except Exception as e:
         return jsonify({'error': f'Failed to load profile data: {str(e)}'}), 500
@@ -145,14 +90,7 @@ def get_user_data():
     Serve user mock data
     """
     try:
-        mockdata_dir = get_mockdata_dir()
-        user_path = mockdata_dir / 'user.json'
-        
-        data = load_json_file(user_path)
-        if data is None:
-            return jsonify({'error': 'User mock data file not found'}), 404
-        
-        return jsonify(data)
+        return mock_response('user.json', 'User')
     
     except Exception as e:
         return jsonify({'error': f'Failed to load user data: {str(e)}'}), 500 
\ No newline at end of file
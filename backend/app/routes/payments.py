@@ -1,11 +1,15 @@
-from flask import Blueprint, request
-from flask_jwt_extended import jwt_required, get_jwt_identity
+from flask import Blueprint, request, current_app
+from flask_jwt_extended import jwt_required
 from app import db
 from app.models.payment import Payment
-from app.models.business import Business
-from app.utils.response import success_response, error_response, paginated_response, not_found_response
-from app.utils.validators import validate_required_fields, validate_amount, validate_payment_method
-from datetime import datetime
+from app.models.dashboard import DashboardAggregate
+from app.utils.response import success_response, error_response, paginated_response, cursor_paginated_response, not_found_response
+from app.utils.pagination import keyset_paginate, InvalidCursorError
+from app.utils.fields import parse_fields, field_columns, select_fields
+from app.utils.rows import as_rows
+from app.utils.tenant import get_current_business
+from app.utils.validators import validate_required_fields, validate_amount, validate_payment_method, validate_uuid, parse_uuid
+import uuid
 
 payments_bp = Blueprint('payments', __name__)
 
@@ -14,17 +18,20 @@ payments_bp = Blueprint('payments', __name__)
 def get_payments():
     """Get all payments for the current user's business"""
     try:
-        current_user_id = get_jwt_identity()
-        
         # Get query parameters
         page = request.args.get('page', 1, type=int)
         per_page = min(request.args.get('per_page', 10, type=int), 100)
+        if per_page < 1:
+            return error_response("per_page must be at least 1", 400)
+        cursor = request.args.get('cursor')
+        include_total = request.args.get('include_total', 'false').lower() == 'true'
         payment_type = request.args.get('payment_type')
         status = request.args.get('status')
         payment_method = request.args.get('payment_method')
+        fields = parse_fields()
         
         # Get user's business
-        business = Business.query.filter_by(owner_id=current_user_id).first()
+        business = get_current_business()
         if not business:
             return error_response("Business not found", 404)
         
@@ -39,46 +46,61 @@ def get_payments():
         if payment_method:
             query = query.filter_by(payment_method=payment_method)
         
-        # Order by created date
-        query = query.order_by(Payment.created_at.desc())
+        # Serialize from plain rows, loading only the requested fields' columns
+        query = as_rows(query, Payment, field_columns(Payment, fields, ('created_at',)))
         
-        # Paginate
-        pagination = query.paginate(
-            page=page, per_page=per_page, error_out=False
-        )
+        # Paginate by keyset when a cursor is supplied, by page otherwise
+        if cursor is not None:
+            pagination = keyset_paginate(
+                query, Payment.created_at, Payment.id, cursor, per_page, include_total
+            )
+        else:
+            query = query.order_by(Payment.created_at.desc())
+            pagination = query.paginate(
+                page=page, per_page=per_page, error_out=False
+            )
+        
+        payments = [select_fields(Payment.serialize(row), fields) for row in pagination.items]
         
-        payments = [payment.to_dict() for payment in pagination.items]
+        if cursor is not None:
+            return cursor_paginated_response(
+                payments, per_page, pagination.next_cursor, pagination.total,
+                "Payments retrieved successfully"
+            )
         
         return paginated_response(
             payments, page, per_page, pagination.total,
             "Payments retrieved successfully"
         )
         
+    except InvalidCursorError:
+        return error_response("Invalid pagination cursor", 400)
     except Exception as e:
         return error_response("Failed to retrieve payments", 500)
 
-@payments_bp.route('/<payment_id>', methods=['GET'])
+@payments_bp.route('/<uuid:payment_id>', methods=['GET'])
 @jwt_required()
 def get_payment(payment_id):
     """Get a specific payment"""
     try:
-        current_user_id = get_jwt_identity()
-        
         # Get user's business
-        business = Business.query.filter_by(owner_id=current_user_id).first()
+        business = get_current_business()
         if not business:
             return error_response("Business not found", 404)
         
-        # Get payment
-        payment = Payment.query.filter_by(
-            id=payment_id, business_id=business.id
+        # Get payment, loading only the requested fields' columns
+        fields = parse_fields()
+        payment = as_rows(
+            Payment.query.filter_by(id=payment_id, business_id=business.id),
+            Payment, field_columns(Payment, fields)
         ).first()
         
         if not payment:
             return not_found_response("Payment")
         
         return success_response(
-            payment.to_dict(), "Payment retrieved successfully"
+            select_fields(Payment.serialize(payment), fields),
+            "Payment retrieved successfully"
         )
         
     except Exception as e:
@@ -89,11 +111,10 @@ def get_payment(payment_id):
 def create_payment():
     """Create a new payment"""
     try:
-        current_user_id = get_jwt_identity()
         data = request.get_json()
         
         # Get user's business
-        business = Business.query.filter_by(owner_id=current_user_id).first()
+        business = get_current_business()
         if not business:
             return error_response("Business not found", 404)
         
@@ -110,6 +131,8 @@ def create_payment():
         # Validate payment method if provided
         if data.get('payment_method') and not validate_payment_method(data['payment_method']):
             return error_response("Invalid payment method", 400)
+        if data.get('wallet_id') is not None and not parse_uuid(data['wallet_id']):
+            return error_response("Invalid wallet_id format", 400)
         
         # Create payment
         payment = Payment(
@@ -127,7 +150,7 @@ def create_payment():
             reference=data.get('reference'),
             metadata=data.get('metadata', {}),
             business_id=business.id,
-            wallet_id=data.get('wallet_id')
+            wallet_id=parse_uuid(data.get('wallet_id'))
         )
         
         db.session.add(payment)
@@ -141,15 +164,70 @@ def create_payment():
         db.session.rollback()
         return error_response("Failed to create payment", 500)
 
-@payments_bp.route('/<payment_id>/process', methods=['POST'])
+@payments_bp.route('/bulk/status', methods=['POST'])
+@jwt_required()
+def bulk_transition_payments():
+    """Move many payments to a new status in a single UPDATE"""
+    try:
+        data = request.get_json() or {}
+        action = data.get('action')
+        payment_ids = data.get('payment_ids')
+        
+        # Validate action and ids
+        if action not in Payment.STATUS_TRANSITIONS:
+            return error_response(
+                f"Action must be one of: {', '.join(Payment.STATUS_TRANSITIONS)}", 400
+            )
+        if not isinstance(payment_ids, list) or not payment_ids:
+            return error_response("A non-empty payment_ids list is required", 400)
+        
+        max_rows = current_app.config.get('BULK_MAX_ROWS', 1000)
+        if len(payment_ids) > max_rows:
+            return error_response(f"At most {max_rows} payments can be transitioned per request", 400)
+        
+        invalid_ids = [
+            payment_id for payment_id in payment_ids
+            if not isinstance(payment_id, str) or not validate_uuid(payment_id)
+        ]
+        if invalid_ids:
+            return error_response("Invalid payment ids", 400, {'invalid_ids': invalid_ids})
+        
+        # Get user's business
+        business = get_current_business()
+        if not business:
+            return error_response("Business not found", 404)
+        
+        # Transition every eligible payment at once
+        requested_ids = {uuid.UUID(payment_id) for payment_id in payment_ids}
+        moved = Payment.bulk_transition(
+            business.id, list(requested_ids), action,
+            reason=data.get('reason', 'Payment failed')
+        )
+        transitioned = [row.id for row in moved]
+        
+        # Source statuses never count towards the dashboard, so only the new state is added
+        DashboardAggregate.record(Payment, moved)
+        
+        db.session.commit()
+        
+        skipped = requested_ids.difference(transitioned)
+        return success_response({
+            'status': Payment.STATUS_TRANSITIONS[action][0],
+            'transitioned': transitioned,
+            'skipped': sorted(skipped, key=str)
+        }, f"{len(transitioned)} payments transitioned")
+        
+    except Exception as e:
+        db.session.rollback()
+        return error_response("Failed to transition payments", 500)
+
+@payments_bp.route('/<uuid:payment_id>/process', methods=['POST'])
 @jwt_required()
 def process_payment(payment_id):
     """Process a payment"""
     try:
-        current_user_id = get_jwt_identity()
-        
         # Get user's business
-        business = Business.query.filter_by(owner_id=current_user_id).first()
+        business = get_current_business()
         if not business:
             return error_response("Business not found", 404)
         
@@ -173,16 +251,15 @@ def process_payment(payment_id):
         db.session.rollback()
         return error_response("Failed to process payment", 500)
 
-@payments_bp.route('/<payment_id>/complete', methods=['POST'])
+@payments_bp.route('/<uuid:payment_id>/complete', methods=['POST'])
 @jwt_required()
 def complete_payment(payment_id):
     """Complete a payment"""
     try:
-        current_user_id = get_jwt_identity()
         data = request.get_json()
         
         # Get user's business
-        business = Business.query.filter_by(owner_id=current_user_id).first()
+        business = get_current_business()
         if not business:
             return error_response("Business not found", 404)
         
@@ -207,16 +284,15 @@ def complete_payment(payment_id):
         db.session.rollback()
         return error_response("Failed to complete payment", 500)
 
-@payments_bp.route('/<payment_id>/fail', methods=['POST'])
+@payments_bp.route('/<uuid:payment_id>/fail', methods=['POST'])
 @jwt_required()
 def fail_payment(payment_id):
     """Mark a payment as failed"""
     try:
-        current_user_id = get_jwt_identity()
         data = request.get_json()
         
         # Get user's business
-        business = Business.query.filter_by(owner_id=current_user_id).first()
+        business = get_current_business()
         if not business:
             return error_response("Business not found", 404)
         
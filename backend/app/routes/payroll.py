@@ -1,30 +1,59 @@
 from flask import Blueprint, request
-from flask_jwt_extended import jwt_required, get_jwt_identity
+from flask_jwt_extended import jwt_required
 from app import db
 from app.models.payroll import Payroll, Employee
-from app.models.business import Business
-from app.utils.response import success_response, error_response, paginated_response, not_found_response
-from app.utils.validators import validate_required_fields, validate_amount, validate_date
+from app.utils.response import success_response, error_response, paginated_response, cursor_paginated_response, not_found_response
+from app.utils.pagination import keyset_paginate, InvalidCursorError
+from app.utils.fields import parse_fields, field_columns, select_fields
+from app.utils.rows import as_rows
+from app.utils.tenant import get_current_business
+from app.utils.validators import validate_required_fields, validate_date, parse_uuid
 from datetime import datetime
+from decimal import Decimal, InvalidOperation
+from sqlalchemy import insert
+import math
+import uuid
 
 payroll_bp = Blueprint('payroll', __name__)
 
+def _invalid_hours_entry(hours):
+    """Return the first employee id whose hours are not an object of finite, non-negative numbers"""
+    for employee_id, entry in hours.items():
+        if not isinstance(entry, dict):
+            return employee_id
+        for value in entry.values():
+            if isinstance(value, bool) or not isinstance(value, (int, float)):
+                return employee_id
+            if not math.isfinite(value) or value < 0:
+                return employee_id
+    return None
+
+def _parse_rate(value):
+    """Parse a deduction rate given as a fraction of gross pay, or return None if it is not in [0, 1]"""
+    if isinstance(value, bool) or not isinstance(value, (int, float, str)):
+        return None
+    
+    try:
+        rate = Decimal(str(value))
+    except InvalidOperation:
+        return None
+    return rate if rate.is_finite() and 0 <= rate <= 1 else None
+
 # Employee Routes
 @payroll_bp.route('/employees', methods=['GET'])
 @jwt_required()
 def get_employees():
     """Get all employees for the current user's business"""
     try:
-        current_user_id = get_jwt_identity()
-        
         # Get query parameters
         page = request.args.get('page', 1, type=int)
         per_page = min(request.args.get('per_page', 10, type=int), 100)
         status = request.args.get('status')
         department = request.args.get('department')
+        fields = parse_fields()
         
         # Get user's business
-        business = Business.query.filter_by(owner_id=current_user_id).first()
+        business = get_current_business()
         if not business:
             return error_response("Business not found", 404)
         
@@ -40,12 +69,15 @@ def get_employees():
         # Order by name
         query = query.order_by(Employee.first_name, Employee.last_name)
         
+        # Serialize from plain rows, loading only the requested fields' columns
+        query = as_rows(query, Employee, field_columns(Employee, fields))
+        
         # Paginate
         pagination = query.paginate(
             page=page, per_page=per_page, error_out=False
         )
         
-        employees = [employee.to_dict() for employee in pagination.items]
+        employees = [select_fields(Employee.serialize(row), fields) for row in pagination.items]
         
         return paginated_response(
             employees, page, per_page, pagination.total,
@@ -55,28 +87,29 @@ def get_employees():
     except Exception as e:
         return error_response("Failed to retrieve employees", 500)
 
-@payroll_bp.route('/employees/<employee_id>', methods=['GET'])
+@payroll_bp.route('/employees/<uuid:employee_id>', methods=['GET'])
 @jwt_required()
 def get_employee(employee_id):
     """Get a specific employee"""
     try:
-        current_user_id = get_jwt_identity()
-        
         # Get user's business
-        business = Business.query.filter_by(owner_id=current_user_id).first()
+        business = get_current_business()
         if not business:
             return error_response("Business not found", 404)
         
-        # Get employee
-        employee = Employee.query.filter_by(
-            id=employee_id, business_id=business.id
+        # Get employee, loading only the requested fields' columns
+        fields = parse_fields()
+        employee = as_rows(
+            Employee.query.filter_by(id=employee_id, business_id=business.id),
+            Employee, field_columns(Employee, fields)
         ).first()
         
         if not employee:
             return not_found_response("Employee")
         
         return success_response(
-            employee.to_dict(), "Employee retrieved successfully"
+            select_fields(Employee.serialize(employee), fields),
+            "Employee retrieved successfully"
         )
         
     except Exception as e:
@@ -87,11 +120,10 @@ def get_employee(employee_id):
 def create_employee():
     """Create a new employee"""
     try:
-        current_user_id = get_jwt_identity()
         data = request.get_json()
         
         # Get user's business
-        business = Business.query.filter_by(owner_id=current_user_id).first()
+        business = get_current_business()
         if not business:
             return error_response("Business not found", 404)
         
@@ -149,16 +181,15 @@ def create_employee():
         db.session.rollback()
         return error_response("Failed to create employee", 500)
 
-@payroll_bp.route('/employees/<employee_id>', methods=['PUT'])
+@payroll_bp.route('/employees/<uuid:employee_id>', methods=['PUT'])
 @jwt_required()
 def update_employee(employee_id):
     """Update an employee"""
     try:
-        current_user_id = get_jwt_identity()
         data = request.get_json()
         
         # Get user's business
-        business = Business.query.filter_by(owner_id=current_user_id).first()
+        business = get_current_business()
         if not business:
             return error_response("Business not found", 404)
         
@@ -221,15 +252,13 @@ def update_employee(employee_id):
         db.session.rollback()
         return error_response("Failed to update employee", 500)
 
-@payroll_bp.route('/employees/<employee_id>', methods=['DELETE'])
+@payroll_bp.route('/employees/<uuid:employee_id>', methods=['DELETE'])
 @jwt_required()
 def delete_employee(employee_id):
     """Delete an employee"""
     try:
-        current_user_id = get_jwt_identity()
-        
         # Get user's business
-        business = Business.query.filter_by(owner_id=current_user_id).first()
+        business = get_current_business()
         if not business:
             return error_response("Business not found", 404)
         
@@ -256,17 +285,22 @@ def delete_employee(employee_id):
 def get_payrolls():
     """Get all payrolls for the current user's business"""
     try:
-        current_user_id = get_jwt_identity()
-        
         # Get query parameters
         page = request.args.get('page', 1, type=int)
         per_page = min(request.args.get('per_page', 10, type=int), 100)
+        if per_page < 1:
+            return error_response("per_page must be at least 1", 400)
+        cursor = request.args.get('cursor')
+        include_total = request.args.get('include_total', 'false').lower() == 'true'
         employee_id = request.args.get('employee_id')
         status = request.args.get('status')
         payroll_period = request.args.get('payroll_period')
+        fields = parse_fields()
+        if employee_id and not parse_uuid(employee_id):
+            return error_response("Invalid employee_id format", 400)
         
         # Get user's business
-        business = Business.query.filter_by(owner_id=current_user_id).first()
+        business = get_current_business()
         if not business:
             return error_response("Business not found", 404)
         
@@ -275,52 +309,67 @@ def get_payrolls():
         
         # Apply filters
         if employee_id:
-            query = query.filter_by(employee_id=employee_id)
+            query = query.filter_by(employee_id=parse_uuid(employee_id))
         if status:
             query = query.filter_by(status=status)
         if payroll_period:
             query = query.filter_by(payroll_period=payroll_period)
         
-        # Order by created date
-        query = query.order_by(Payroll.created_at.desc())
+        # Serialize from plain rows, loading only the requested fields' columns
+        query = as_rows(query, Payroll, field_columns(Payroll, fields, ('created_at',)))
         
-        # Paginate
-        pagination = query.paginate(
-            page=page, per_page=per_page, error_out=False
-        )
+        # Paginate by keyset when a cursor is supplied, by page otherwise
+        if cursor is not None:
+            pagination = keyset_paginate(
+                query, Payroll.created_at, Payroll.id, cursor, per_page, include_total
+            )
+        else:
+            query = query.order_by(Payroll.created_at.desc())
+            pagination = query.paginate(
+                page=page, per_page=per_page, error_out=False
+            )
         
-        payrolls = [payroll.to_dict() for payroll in pagination.items]
+        payrolls = [select_fields(Payroll.serialize(row), fields) for row in pagination.items]
+        
+        if cursor is not None:
+            return cursor_paginated_response(
+                payrolls, per_page, pagination.next_cursor, pagination.total,
+                "Payrolls retrieved successfully"
+            )
         
         return paginated_response(
             payrolls, page, per_page, pagination.total,
             "Payrolls retrieved successfully"
         )
         
+    except InvalidCursorError:
+        return error_response("Invalid pagination cursor", 400)
     except Exception as e:
         return error_response("Failed to retrieve payrolls", 500)
 
-@payroll_bp.route('/payrolls/<payroll_id>', methods=['GET'])
+@payroll_bp.route('/payrolls/<uuid:payroll_id>', methods=['GET'])
 @jwt_required()
 def get_payroll(payroll_id):
     """Get a specific payroll"""
     try:
-        current_user_id = get_jwt_identity()
-        
         # Get user's business
-        business = Business.query.filter_by(owner_id=current_user_id).first()
+        business = get_current_business()
         if not business:
             return error_response("Business not found", 404)
         
-        # Get payroll
-        payroll = Payroll.query.filter_by(
-            id=payroll_id, business_id=business.id
+        # Get payroll, loading only the requested fields' columns
+        fields = parse_fields()
+        payroll = as_rows(
+            Payroll.query.filter_by(id=payroll_id, business_id=business.id),
+            Payroll, field_columns(Payroll, fields)
         ).first()
         
         if not payroll:
             return not_found_response("Payroll")
         
         return success_response(
-            payroll.to_dict(), "Payroll retrieved successfully"
+            select_fields(Payroll.serialize(payroll), fields),
+            "Payroll retrieved successfully"
         )
         
     except Exception as e:
@@ -331,11 +380,10 @@ def get_payroll(payroll_id):
 def create_payroll():
     """Create a new payroll"""
     try:
-        current_user_id = get_jwt_identity()
         data = request.get_json()
         
         # Get user's business
-        business = Business.query.filter_by(owner_id=current_user_id).first()
+        business = get_current_business()
         if not business:
             return error_response("Business not found", 404)
         
@@ -353,7 +401,7 @@ def create_payroll():
         
         # Verify employee exists and belongs to business
         employee = Employee.query.filter_by(
-            id=data['employee_id'], business_id=business.id
+            id=parse_uuid(data['employee_id']), business_id=business.id
         ).first()
         
         if not employee:
@@ -377,7 +425,7 @@ def create_payroll():
             notes=data.get('notes'),
             metadata=data.get('metadata', {}),
             business_id=business.id,
-            employee_id=data['employee_id']
+            employee_id=employee.id
         )
         
         # Calculate payroll
@@ -394,15 +442,137 @@ def create_payroll():
         db.session.rollback()
         return error_response("Failed to create payroll", 500)
 
-@payroll_bp.route('/payrolls/<payroll_id>/process', methods=['POST'])
+@payroll_bp.route('/payrolls/run', methods=['POST'])
+@jwt_required()
+def run_payroll():
+    """Generate processed payrolls for every active employee for a period"""
+    try:
+        data = request.get_json()
+        
+        # Get user's business
+        business = get_current_business()
+        if not business:
+            return error_response("Business not found", 404)
+        
+        # Validate required fields
+        required_fields = ['payroll_period', 'start_date', 'end_date']
+        missing_fields = validate_required_fields(data, required_fields)
+        if missing_fields:
+            return error_response(f"Missing required fields: {', '.join(missing_fields)}", 400)
+        
+        payroll_period = data['payroll_period']
+        if payroll_period not in Payroll.PERIODS_PER_YEAR:
+            return error_response(
+                f"Payroll period must be one of: {', '.join(Payroll.PERIODS_PER_YEAR)}", 400
+            )
+        
+        # Validate dates
+        if not validate_date(data['start_date']):
+            return error_response("Invalid start date format", 400)
+        if not validate_date(data['end_date']):
+            return error_response("Invalid end date format", 400)
+        
+        start_date = datetime.strptime(data['start_date'], '%Y-%m-%d').date()
+        end_date = datetime.strptime(data['end_date'], '%Y-%m-%d').date()
+        if end_date < start_date:
+            return error_response("End date must not be before start date", 400)
+        
+        hours = data.get('hours', {})
+        if not isinstance(hours, dict):
+            return error_response("Hours must be an object keyed by employee id", 400)
+        invalid_employee_id = _invalid_hours_entry(hours)
+        if invalid_employee_id is not None:
+            return error_response(
+                f"Hours for employee {invalid_employee_id} must be non-negative numbers", 400
+            )
+        
+        rates = {}
+        for key in ('social_security_rate', 'medicare_rate'):
+            rates[key] = _parse_rate(data.get(key, 0))
+            if rates[key] is None:
+                return error_response(f"{key.replace('_', ' ').capitalize()} must be a number between 0 and 1", 400)
+        
+        # Load active employees on this pay frequency not yet paid for the period
+        already_paid = db.select(Payroll.employee_id).where(
+            Payroll.business_id == business.id,
+            Payroll.start_date == start_date,
+            Payroll.end_date == end_date
+        )
+        employees = Employee.query.filter(
+            Employee.business_id == business.id,
+            Employee.active_filter(),
+            Employee.pay_frequency == payroll_period,
+            Employee.hire_date <= end_date,
+            Employee.id.not_in(already_paid)
+        ).with_entities(
+            Employee.id, Employee.salary, Employee.hourly_rate,
+            Employee.tax_withholding, Employee.currency
+        ).all()
+        
+        if not employees:
+            return error_response("No eligible employees for this payroll run", 400)
+        
+        unknown_employee_ids = set(hours) - {str(employee.id) for employee in employees}
+        if unknown_employee_ids:
+            return error_response(
+                f"Hours given for employees not in this payroll run: {', '.join(sorted(unknown_employee_ids))}", 400
+            )
+        
+        # Compute every employee's pay in one pass
+        amounts = Payroll.calculate_run(employees, payroll_period, hours, **rates)
+        
+        run_id = uuid.uuid4()
+        currencies = {employee.id: employee.currency for employee in employees}
+        payroll_rows = [
+            dict(
+                employee_amounts,
+                id=uuid.uuid4(),
+                payroll_period=payroll_period,
+                start_date=start_date,
+                end_date=end_date,
+                currency=currencies[employee_amounts['employee_id']] or business.currency,
+                status='processed',
+                notes=data.get('notes'),
+                payroll_metadata={'run_id': str(run_id)},
+                business_id=business.id
+            )
+            for employee_amounts in amounts
+        ]
+        
+        # Insert the whole run as executemany batches in one transaction
+        db.session.execute(insert(Payroll), payroll_rows)
+        db.session.commit()
+        
+        return success_response({
+            'run_id': run_id,
+            'created': len(payroll_rows),
+            'totals': {
+                'gross_pay': sum(row['gross_pay'] for row in payroll_rows),
+                'total_deductions': sum(row['total_deductions'] for row in payroll_rows),
+                'net_pay': sum(row['net_pay'] for row in payroll_rows)
+            },
+            'payrolls': [
+                {
+                    'id': row['id'],
+                    'employee_id': row['employee_id'],
+                    'gross_pay': row['gross_pay'],
+                    'net_pay': row['net_pay']
+                }
+                for row in payroll_rows
+            ]
+        }, "Payroll run completed successfully", 201)
+        
+    except Exception as e:
+        db.session.rollback()
+        return error_response("Failed to run payroll", 500)
+
+@payroll_bp.route('/payrolls/<uuid:payroll_id>/process', methods=['POST'])
 @jwt_required()
 def process_payroll(payroll_id):
     """Process a payroll"""
     try:
-        current_user_id = get_jwt_identity()
-        
         # Get user's business
-        business = Business.query.filter_by(owner_id=current_user_id).first()
+        business = get_current_business()
         if not business:
             return error_response("Business not found", 404)
         
@@ -426,16 +596,15 @@ def process_payroll(payroll_id):
         db.session.rollback()
         return error_response("Failed to process payroll", 500)
 
-@payroll_bp.route('/payrolls/<payroll_id>/pay', methods=['POST'])
+@payroll_bp.route('/payrolls/<uuid:payroll_id>/pay', methods=['POST'])
 @jwt_required()
 def pay_payroll(payroll_id):
     """Mark payroll as paid"""
     try:
-        current_user_id = get_jwt_identity()
         data = request.get_json()
         
         # Get user's business
-        business = Business.query.filter_by(owner_id=current_user_id).first()
+        business = get_current_business()
         if not business:
             return error_response("Business not found", 404)
         
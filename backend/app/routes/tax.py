@@ -1,10 +1,13 @@
 from flask import Blueprint, request
-from flask_jwt_extended import jwt_required, get_jwt_identity
+from flask_jwt_extended import jwt_required
 from app import db
 from app.models.tax import TaxRecord, TaxPeriod
-from app.models.business import Business
-from app.utils.response import success_response, error_response, paginated_response, not_found_response
-from app.utils.validators import validate_required_fields, validate_amount, validate_date
+from app.utils.response import success_response, error_response, paginated_response, cursor_paginated_response, not_found_response
+from app.utils.pagination import keyset_paginate, InvalidCursorError
+from app.utils.fields import parse_fields, field_columns, select_fields
+from app.utils.rows import as_rows
+from app.utils.tenant import get_current_business
+from app.utils.validators import validate_required_fields, validate_amount, validate_date, parse_uuid
 from datetime import datetime
 
 tax_bp = Blueprint('tax', __name__)
@@ -14,17 +17,22 @@ tax_bp = Blueprint('tax', __name__)
 def get_tax_records():
     """Get all tax records for the current user's business"""
     try:
-        current_user_id = get_jwt_identity()
-        
         # Get query parameters
         page = request.args.get('page', 1, type=int)
         per_page = min(request.args.get('per_page', 10, type=int), 100)
+        if per_page < 1:
+            return error_response("per_page must be at least 1", 400)
+        cursor = request.args.get('cursor')
+        include_total = request.args.get('include_total', 'false').lower() == 'true'
         tax_type = request.args.get('tax_type')
         status = request.args.get('status')
         period_id = request.args.get('period_id')
+        fields = parse_fields()
+        if period_id and not parse_uuid(period_id):
+            return error_response("Invalid period_id format", 400)
         
         # Get user's business
-        business = Business.query.filter_by(owner_id=current_user_id).first()
+        business = get_current_business()
         if not business:
             return error_response("Business not found", 404)
         
@@ -37,48 +45,63 @@ def get_tax_records():
         if status:
             query = query.filter_by(status=status)
         if period_id:
-            query = query.filter_by(tax_period_id=period_id)
-        
-        # Order by created date
-        query = query.order_by(TaxRecord.created_at.desc())
-        
-        # Paginate
-        pagination = query.paginate(
-            page=page, per_page=per_page, error_out=False
-        )
-        
-        tax_records = [record.to_dict() for record in pagination.items]
+            query = query.filter_by(tax_period_id=parse_uuid(period_id))
+        
+        # Serialize from plain rows, loading only the requested fields' columns
+        query = as_rows(query, TaxRecord, field_columns(TaxRecord, fields, ('created_at',)))
+        
+        # Paginate by keyset when a cursor is supplied, by page otherwise
+        if cursor is not None:
+            pagination = keyset_paginate(
+                query, TaxRecord.created_at, TaxRecord.id, cursor, per_page, include_total
+            )
+        else:
+            query = query.order_by(TaxRecord.created_at.desc())
+            pagination = query.paginate(
+                page=page, per_page=per_page, error_out=False
+            )
+        
+        tax_records = [select_fields(TaxRecord.serialize(row), fields) for row in pagination.items]
+        
+        if cursor is not None:
+            return cursor_paginated_response(
+                tax_records, per_page, pagination.next_cursor, pagination.total,
+                "Tax records retrieved successfully"
+            )
         
         return paginated_response(
             tax_records, page, per_page, pagination.total,
             "Tax records retrieved successfully"
         )
         
+    except InvalidCursorError:
+        return error_response("Invalid pagination cursor", 400)
     except Exception as e:
         return error_response("Failed to retrieve tax records", 500)
 
-@tax_bp.route('/records/<record_id>', methods=['GET'])
+@tax_bp.route('/records/<uuid:record_id>', methods=['GET'])
 @jwt_required()
 def get_tax_record(record_id):
     """Get a specific tax record"""
     try:
-        current_user_id = get_jwt_identity()
-        
         # Get user's business
-        business = Business.query.filter_by(owner_id=current_user_id).first()
+        business = get_current_business()
         if not business:
             return error_response("Business not found", 404)
         
-        # Get tax record
-        tax_record = TaxRecord.query.filter_by(
-            id=record_id, business_id=business.id
+        # Get tax record, loading only the requested fields' columns
+        fields = parse_fields()
+        tax_record = as_rows(
+            TaxRecord.query.filter_by(id=record_id, business_id=business.id),
+            TaxRecord, field_columns(TaxRecord, fields)
         ).first()
         
         if not tax_record:
             return not_found_response("Tax record")
         
         return success_response(
-            tax_record.to_dict(), "Tax record retrieved successfully"
+            select_fields(TaxRecord.serialize(tax_record), fields),
+            "Tax record retrieved successfully"
         )
         
     except Exception as e:
@@ -89,11 +112,10 @@ def get_tax_record(record_id):
 def create_tax_record():
     """Create a new tax record"""
     try:
-        current_user_id = get_jwt_identity()
         data = request.get_json()
         
         # Get user's business
-        business = Business.query.filter_by(owner_id=current_user_id).first()
+        business = get_current_business()
         if not business:
             return error_response("Business not found", 404)
         
@@ -108,6 +130,8 @@ def create_tax_record():
             return error_response("Invalid tax rate", 400)
         if not validate_amount(data['taxable_amount']):
             return error_response("Invalid taxable amount", 400)
+        if data.get('tax_period_id') is not None and not parse_uuid(data['tax_period_id']):
+            return error_response("Invalid tax_period_id format", 400)
         
         # Create tax record
         tax_record = TaxRecord(
@@ -118,7 +142,7 @@ def create_tax_record():
             notes=data.get('notes'),
             metadata=data.get('metadata', {}),
             business_id=business.id,
-            tax_period_id=data.get('tax_period_id')
+            tax_period_id=parse_uuid(data.get('tax_period_id'))
         )
         
         # Calculate tax amount
@@ -135,16 +159,15 @@ def create_tax_record():
         db.session.rollback()
         return error_response("Failed to create tax record", 500)
 
-@tax_bp.route('/records/<record_id>/file', methods=['POST'])
+@tax_bp.route('/records/<uuid:record_id>/file', methods=['POST'])
 @jwt_required()
 def file_tax_record(record_id):
     """Mark a tax record as filed"""
     try:
-        current_user_id = get_jwt_identity()
         data = request.get_json()
         
         # Get user's business
-        business = Business.query.filter_by(owner_id=current_user_id).first()
+        business = get_current_business()
         if not business:
             return error_response("Business not found", 404)
         
@@ -169,16 +192,15 @@ def file_tax_record(record_id):
         db.session.rollback()
         return error_response("Failed to mark tax record as filed", 500)
 
-@tax_bp.route('/records/<record_id>/pay', methods=['POST'])
+@tax_bp.route('/records/<uuid:record_id>/pay', methods=['POST'])
 @jwt_required()
 def pay_tax_record(record_id):
     """Mark a tax record as paid"""
     try:
-        current_user_id = get_jwt_identity()
         data = request.get_json()
         
         # Get user's business
-        business = Business.query.filter_by(owner_id=current_user_id).first()
+        business = get_current_business()
         if not business:
             return error_response("Business not found", 404)
         
@@ -208,20 +230,20 @@ def pay_tax_record(record_id):
 def get_tax_periods():
     """Get all tax periods for the current user's business"""
     try:
-        current_user_id = get_jwt_identity()
-        
         # Get user's business
-        business = Business.query.filter_by(owner_id=current_user_id).first()
+        business = get_current_business()
         if not business:
             return error_response("Business not found", 404)
         
-        # Get tax periods
-        tax_periods = TaxPeriod.query.filter_by(
+        # Get tax periods, loading only the requested fields' columns
+        fields = parse_fields()
+        query = TaxPeriod.query.filter_by(
             business_id=business.id, is_active=True
-        ).order_by(TaxPeriod.start_date.desc()).all()
+        ).order_by(TaxPeriod.start_date.desc())
+        tax_periods = as_rows(query, TaxPeriod, field_columns(TaxPeriod, fields)).all()
         
         return success_response(
-            [period.to_dict() for period in tax_periods],
+            [select_fields(TaxPeriod.serialize(period), fields) for period in tax_periods],
             "Tax periods retrieved successfully"
         )
         
@@ -233,11 +255,10 @@ def get_tax_periods():
 def create_tax_period():
     """Create a new tax period"""
     try:
-        current_user_id = get_jwt_identity()
         data = request.get_json()
         
         # Get user's business
-        business = Business.query.filter_by(owner_id=current_user_id).first()
+        business = get_current_business()
         if not business:
             return error_response("Business not found", 404)
         
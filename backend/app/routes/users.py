@@ -1,10 +1,13 @@
 from flask import Blueprint, request
-from flask_jwt_extended import jwt_required, get_jwt_identity
+from flask_jwt_extended import jwt_required
 from app import db
 from app.models.user import User
-from app.utils.response import success_response, error_response, paginated_response, not_found_response
-from app.utils.validators import validate_email, validate_phone
-from datetime import datetime
+from app.utils.response import success_response, error_response, paginated_response, cursor_paginated_response, not_found_response
+from app.utils.pagination import keyset_paginate, InvalidCursorError
+from app.utils.fields import parse_fields, field_columns, select_fields
+from app.utils.rows import as_rows
+from app.utils.current_user import get_current_user, get_current_user_id
+from app.utils.validators import validate_phone
 
 users_bp = Blueprint('users', __name__)
 
@@ -13,8 +16,7 @@ users_bp = Blueprint('users', __name__)
 def get_users():
     """Get all users (admin only)"""
     try:
-        current_user_id = get_jwt_identity()
-        current_user = User.query.get(current_user_id)
+        current_user = get_current_user()
         
         if not current_user or current_user.role != 'admin':
             return error_response("Unauthorized", 403)
@@ -22,8 +24,13 @@ def get_users():
         # Get query parameters
         page = request.args.get('page', 1, type=int)
         per_page = min(request.args.get('per_page', 10, type=int), 100)
+        if per_page < 1:
+            return error_response("per_page must be at least 1", 400)
+        cursor = request.args.get('cursor')
+        include_total = request.args.get('include_total', 'false').lower() == 'true'
         role = request.args.get('role')
         is_active = request.args.get('is_active')
+        fields = parse_fields()
         
         # Build query
         query = User.query
@@ -34,60 +41,78 @@ def get_users():
         if is_active is not None:
             query = query.filter_by(is_active=is_active.lower() == 'true')
         
-        # Order by created date
-        query = query.order_by(User.created_at.desc())
+        # Serialize from plain rows, loading only the requested fields' columns
+        query = as_rows(query, User, field_columns(User, fields, ('created_at',)))
         
-        # Paginate
-        pagination = query.paginate(
-            page=page, per_page=per_page, error_out=False
-        )
+        # Paginate by keyset when a cursor is supplied, by page otherwise
+        if cursor is not None:
+            pagination = keyset_paginate(
+                query, User.created_at, User.id, cursor, per_page, include_total
+            )
+        else:
+            query = query.order_by(User.created_at.desc())
+            pagination = query.paginate(
+                page=page, per_page=per_page, error_out=False
+            )
+        
+        users = [select_fields(User.serialize(row), fields) for row in pagination.items]
         
-        users = [user.to_dict() for user in pagination.items]
+        if cursor is not None:
+            return cursor_paginated_response(
+                users, per_page, pagination.next_cursor, pagination.total,
+                "Users retrieved successfully"
+            )
         
         return paginated_response(
             users, page, per_page, pagination.total,
             "Users retrieved successfully"
         )
         
+    except InvalidCursorError:
+        return error_response("Invalid pagination cursor", 400)
     except Exception as e:
         return error_response("Failed to retrieve users", 500)
 
-@users_bp.route('/<user_id>', methods=['GET'])
+@users_bp.route('/<uuid:user_id>', methods=['GET'])
 @jwt_required()
 def get_user(user_id):
     """Get a specific user"""
     try:
-        current_user_id = get_jwt_identity()
-        current_user = User.query.get(current_user_id)
+        current_user_id = get_current_user_id()
+        current_user = get_current_user()
         
         # Check if user can access this profile
-        if str(current_user_id) != user_id and current_user.role != 'admin':
+        if current_user_id != user_id and current_user.role != 'admin':
             return error_response("Unauthorized", 403)
         
-        # Get user
-        user = User.query.get(user_id)
+        # Get user, loading only the requested fields' columns
+        fields = parse_fields()
+        user = as_rows(
+            User.query.filter_by(id=user_id), User, field_columns(User, fields)
+        ).first()
         
         if not user:
             return not_found_response("User")
         
         return success_response(
-            user.to_dict(), "User retrieved successfully"
+            select_fields(User.serialize(user), fields),
+            "User retrieved successfully"
         )
         
     except Exception as e:
         return error_response("Failed to retrieve user", 500)
 
-@users_bp.route('/<user_id>', methods=['PUT'])
+@users_bp.route('/<uuid:user_id>', methods=['PUT'])
 @jwt_required()
 def update_user(user_id):
     """Update a user"""
     try:
-        current_user_id = get_jwt_identity()
-        current_user = User.query.get(current_user_id)
+        current_user_id = get_current_user_id()
+        current_user = get_current_user()
         data = request.get_json()
         
         # Check if user can update this profile
-        if str(current_user_id) != user_id and current_user.role != 'admin':
+        if current_user_id != user_id and current_user.role != 'admin':
             return error_response("Unauthorized", 403)
         
         # Get user
@@ -123,13 +148,13 @@ def update_user(user_id):
         db.session.rollback()
         return error_response("Failed to update user", 500)
 
-@users_bp.route('/<user_id>', methods=['DELETE'])
+@users_bp.route('/<uuid:user_id>', methods=['DELETE'])
 @jwt_required()
 def delete_user(user_id):
     """Delete a user (admin only)"""
     try:
-        current_user_id = get_jwt_identity()
-        current_user = User.query.get(current_user_id)
+        current_user_id = get_current_user_id()
+        current_user = get_current_user()
         
         if current_user.role != 'admin':
             return error_response("Unauthorized", 403)
@@ -141,7 +166,7 @@ def delete_user(user_id):
             return not_found_response("User")
         
         # Prevent self-deletion
-        if str(current_user_id) == user_id:
+        if current_user_id == user_id:
             return error_response("Cannot delete your own account", 400)
         
         db.session.delete(user)
@@ -153,13 +178,12 @@ def delete_user(user_id):
         db.session.rollback()
         return error_response("Failed to delete user", 500)
 
-@users_bp.route('/<user_id>/activate', methods=['POST'])
+@users_bp.route('/<uuid:user_id>/activate', methods=['POST'])
 @jwt_required()
 def activate_user(user_id):
     """Activate a user (admin only)"""
     try:
-        current_user_id = get_jwt_identity()
-        current_user = User.query.get(current_user_id)
+        current_user = get_current_user()
         
         if current_user.role != 'admin':
             return error_response("Unauthorized", 403)
@@ -181,13 +205,13 @@ def activate_user(user_id):
         db.session.rollback()
         return error_response("Failed to activate user", 500)
 
-@users_bp.route('/<user_id>/deactivate', methods=['POST'])
+@users_bp.route('/<uuid:user_id>/deactivate', methods=['POST'])
 @jwt_required()
 def deactivate_user(user_id):
     """Deactivate a user (admin only)"""
     try:
-        current_user_id = get_jwt_identity()
-        current_user = User.query.get(current_user_id)
+        current_user_id = get_current_user_id()
+        current_user = get_current_user()
         
         if current_user.role != 'admin':
             return error_response("Unauthorized", 403)
@@ -199,7 +223,7 @@ def deactivate_user(user_id):
             return not_found_response("User")
         
         # Prevent self-deactivation
-        if str(current_user_id) == user_id:
+        if current_user_id == user_id:
             return error_response("Cannot deactivate your own account", 400)
         
         user.is_active = False
@@ -213,13 +237,12 @@ def deactivate_user(user_id):
         db.session.rollback()
         return error_response("Failed to deactivate user", 500)
 
-@users_bp.route('/<user_id>/verify', methods=['POST'])
+@users_bp.route('/<uuid:user_id>/verify', methods=['POST'])
 @jwt_required()
 def verify_user(user_id):
     """Verify a user (admin only)"""
     try:
-        current_user_id = get_jwt_identity()
-        current_user = User.query.get(current_user_id)
+        current_user = get_current_user()
         
         if current_user.role != 'admin':
             return error_response("Unauthorized", 403)
@@ -246,8 +269,7 @@ def verify_user(user_id):
 def get_user_stats():
     """Get user statistics (admin only)"""
     try:
-        current_user_id = get_jwt_identity()
-        current_user = User.query.get(current_user_id)
+        current_user = get_current_user()
         
         if current_user.role != 'admin':
             return error_response("Unauthorized", 403)
@@ -1,11 +1,17 @@
 from flask import Blueprint, request
-from flask_jwt_extended import jwt_required, get_jwt_identity
+from flask_jwt_extended import jwt_required
 from app import db
-from app.models.wallet import Wallet, Transaction
-from app.models.business import Business
-from app.utils.response import success_response, error_response, paginated_response, not_found_response
-from app.utils.validators import validate_required_fields, validate_amount
-from datetime import datetime
+from app.models.wallet import Wallet, Transaction, TransactionArchive, InsufficientFundsError
+from app.utils.response import success_response, error_response, paginated_response, cursor_paginated_response, not_found_response, etag_response, not_modified_response
+from app.utils.etag import query_etag, is_not_modified
+from app.utils.pagination import keyset_paginate, encode_cursor, decode_cursor, InvalidCursorError
+from app.utils.fields import parse_fields, field_columns, select_fields
+from app.utils.export import stream_rows, ndjson_response
+from app.utils.rows import as_rows
+from app.utils.tenant import get_current_business
+from app.utils.validators import validate_required_fields, validate_amount, validate_date, validate_datetime, parse_uuid
+from datetime import datetime, timedelta, timezone
+from itertools import chain, islice
 
 wallet_bp = Blueprint('wallet', __name__)
 
@@ -14,49 +20,60 @@ wallet_bp = Blueprint('wallet', __name__)
 def get_wallets():
     """Get all wallets for the current user's business"""
     try:
-        current_user_id = get_jwt_identity()
-        
         # Get user's business
-        business = Business.query.filter_by(owner_id=current_user_id).first()
+        business = get_current_business()
         if not business:
             return error_response("Business not found", 404)
         
-        # Get wallets
-        wallets = Wallet.query.filter_by(
-            business_id=business.id, is_active=True
-        ).all()
+        # Build query
+        query = Wallet.query.filter_by(business_id=business.id, is_active=True)
         
-        return success_response(
-            [wallet.to_dict() for wallet in wallets],
+        # Answer revalidation before loading or serializing anything
+        etag = query_etag(query, Wallet.updated_at, business.id)
+        if is_not_modified(etag):
+            return not_modified_response(etag)
+        
+        # Get wallets, loading only the requested fields' columns
+        fields = parse_fields()
+        wallets = as_rows(query, Wallet, field_columns(Wallet, fields)).all()
+        
+        return etag_response(success_response(
+            [select_fields(Wallet.serialize(wallet), fields) for wallet in wallets],
             "Wallets retrieved successfully"
-        )
+        ), etag)
         
     except Exception as e:
         return error_response("Failed to retrieve wallets", 500)
 
-@wallet_bp.route('/<wallet_id>', methods=['GET'])
+@wallet_bp.route('/<uuid:wallet_id>', methods=['GET'])
 @jwt_required()
 def get_wallet(wallet_id):
     """Get a specific wallet"""
     try:
-        current_user_id = get_jwt_identity()
-        
         # Get user's business
-        business = Business.query.filter_by(owner_id=current_user_id).first()
+        business = get_current_business()
         if not business:
             return error_response("Business not found", 404)
         
-        # Get wallet
-        wallet = Wallet.query.filter_by(
-            id=wallet_id, business_id=business.id
-        ).first()
+        # Build query
+        query = Wallet.query.filter_by(id=wallet_id, business_id=business.id)
+        
+        # Answer revalidation before loading or serializing anything
+        etag = query_etag(query, Wallet.updated_at, business.id)
+        if is_not_modified(etag):
+            return not_modified_response(etag)
+        
+        # Get wallet, loading only the requested fields' columns
+        fields = parse_fields()
+        wallet = as_rows(query, Wallet, field_columns(Wallet, fields)).first()
         
         if not wallet:
             return not_found_response("Wallet")
         
-        return success_response(
-            wallet.to_dict(), "Wallet retrieved successfully"
-        )
+        return etag_response(success_response(
+            select_fields(Wallet.serialize(wallet), fields),
+            "Wallet retrieved successfully"
+        ), etag)
         
     except Exception as e:
         return error_response("Failed to retrieve wallet", 500)
@@ -66,11 +83,10 @@ def get_wallet(wallet_id):
 def create_wallet():
     """Create a new wallet"""
     try:
-        current_user_id = get_jwt_identity()
         data = request.get_json()
         
         # Get user's business
-        business = Business.query.filter_by(owner_id=current_user_id).first()
+        business = get_current_business()
         if not business:
             return error_response("Business not found", 404)
         
@@ -98,20 +114,23 @@ def create_wallet():
         db.session.rollback()
         return error_response("Failed to create wallet", 500)
 
-@wallet_bp.route('/<wallet_id>/transactions', methods=['GET'])
+@wallet_bp.route('/<uuid:wallet_id>/transactions', methods=['GET'])
 @jwt_required()
 def get_wallet_transactions(wallet_id):
     """Get transactions for a specific wallet"""
     try:
-        current_user_id = get_jwt_identity()
-        
         # Get query parameters
         page = request.args.get('page', 1, type=int)
         per_page = min(request.args.get('per_page', 10, type=int), 100)
+        if per_page < 1:
+            return error_response("per_page must be at least 1", 400)
+        cursor = request.args.get('cursor')
+        include_total = request.args.get('include_total', 'false').lower() == 'true'
         transaction_type = request.args.get('transaction_type')
+        fields = parse_fields()
         
         # Get user's business
-        business = Business.query.filter_by(owner_id=current_user_id).first()
+        business = get_current_business()
         if not business:
             return error_response("Business not found", 404)
         
@@ -130,34 +149,182 @@ def get_wallet_transactions(wallet_id):
         if transaction_type:
             query = query.filter_by(transaction_type=transaction_type)
         
-        # Order by created date
-        query = query.order_by(Transaction.created_at.desc())
-        
-        # Paginate
-        pagination = query.paginate(
-            page=page, per_page=per_page, error_out=False
-        )
-        
-        transactions = [transaction.to_dict() for transaction in pagination.items]
+        # Serialize from plain rows, loading only the requested fields' columns
+        query = as_rows(query, Transaction, field_columns(Transaction, fields, ('created_at',)))
+        
+        # Paginate by keyset when a cursor is supplied, by page otherwise
+        if cursor is not None:
+            pagination = keyset_paginate(
+                query, Transaction.created_at, Transaction.id, cursor, per_page, include_total
+            )
+        else:
+            query = query.order_by(Transaction.created_at.desc())
+            pagination = query.paginate(
+                page=page, per_page=per_page, error_out=False
+            )
+        
+        # Archived rows are all older than live ones, so a page the live table
+        # cannot fill continues into the archive
+        rows = list(pagination.items)
+        next_cursor = pagination.next_cursor if cursor is not None else None
+        total = pagination.total
+        
+        if cursor is not None and next_cursor is None:
+            if rows:
+                before = (rows[-1].created_at, rows[-1].id)
+            else:
+                before = decode_cursor(cursor, Transaction.created_at) if cursor else None
+            
+            rows += islice(TransactionArchive.iter_rows(
+                wallet.id, transaction_type, before=before, newest_first=True
+            ), per_page + 1 - len(rows))
+            if len(rows) > per_page:
+                rows = rows[:per_page]
+                next_cursor = encode_cursor(rows[-1].created_at, rows[-1].id)
+        elif cursor is None and len(rows) < per_page:
+            skip = max((page - 1) * per_page - pagination.total, 0)
+            rows += islice(TransactionArchive.iter_rows(
+                wallet.id, transaction_type, newest_first=True, skip=skip
+            ), per_page - len(rows))
+        
+        if total is not None:
+            total += TransactionArchive.count(wallet.id, transaction_type)
+        
+        transactions = [select_fields(Transaction.serialize(row), fields) for row in rows]
+        
+        if cursor is not None:
+            return cursor_paginated_response(
+                transactions, per_page, next_cursor, total,
+                "Transactions retrieved successfully"
+            )
         
         return paginated_response(
-            transactions, page, per_page, pagination.total,
+            transactions, page, per_page, total,
             "Transactions retrieved successfully"
         )
         
+    except InvalidCursorError:
+        return error_response("Invalid pagination cursor", 400)
     except Exception as e:
         return error_response("Failed to retrieve transactions", 500)
 
-@wallet_bp.route('/<wallet_id>/add-funds', methods=['POST'])
+@wallet_bp.route('/<uuid:wallet_id>/transactions/export', methods=['GET'])
+@jwt_required()
+def export_wallet_transactions(wallet_id):
+    """Stream a wallet's transactions as newline-delimited JSON"""
+    try:
+        # Get query parameters
+        transaction_type = request.args.get('transaction_type')
+        date_from = request.args.get('date_from')
+        date_to = request.args.get('date_to')
+        fields = parse_fields()
+        
+        # Validate date range
+        if date_from and not validate_date(date_from):
+            return error_response("Invalid date_from format", 400)
+        if date_to and not validate_date(date_to):
+            return error_response("Invalid date_to format", 400)
+        
+        # Get user's business
+        business = get_current_business()
+        if not business:
+            return error_response("Business not found", 404)
+        
+        # Verify wallet belongs to business
+        wallet = Wallet.query.filter_by(
+            id=wallet_id, business_id=business.id
+        ).first()
+        
+        if not wallet:
+            return not_found_response("Wallet")
+        
+        # Build query
+        query = Transaction.query.filter_by(wallet_id=wallet.id)
+        
+        # Apply filters
+        start = datetime.strptime(date_from, '%Y-%m-%d') if date_from else None
+        end = datetime.strptime(date_to, '%Y-%m-%d') + timedelta(days=1) if date_to else None
+        if transaction_type:
+            query = query.filter_by(transaction_type=transaction_type)
+        if start:
+            query = query.filter(Transaction.created_at >= start)
+        if end:
+            query = query.filter(Transaction.created_at < end)
+        
+        # Stream plain rows oldest first, a batch at a time
+        query = as_rows(query, Transaction, field_columns(Transaction, fields))
+        query = query.order_by(Transaction.created_at, Transaction.id)
+        
+        # Archived months come before every live row
+        archived = TransactionArchive.iter_rows(wallet.id, transaction_type, start=start, end=end)
+        
+        return ndjson_response(
+            chain(archived, stream_rows(query)),
+            lambda row: select_fields(Transaction.serialize(row), fields),
+            f"wallet-{wallet.id}-transactions.ndjson"
+        )
+        
+    except Exception as e:
+        return error_response("Failed to export transactions", 500)
+
+def _parse_balance_time(value):
+    """Parse ``at`` as a naive UTC datetime, a bare date meaning the end of that day"""
+    if validate_date(value):
+        return datetime.combine(datetime.strptime(value, '%Y-%m-%d').date(), datetime.max.time())
+    
+    at = datetime.fromisoformat(value.replace('Z', '+00:00'))
+    if at.tzinfo:
+        at = at.astimezone(timezone.utc).replace(tzinfo=None)
+    return at
+
+@wallet_bp.route('/<uuid:wallet_id>/balance', methods=['GET'])
+@jwt_required()
+def get_wallet_balance(wallet_id):
+    """Get a wallet's balance, optionally as of a past point in time"""
+    try:
+        # Get query parameters
+        at = request.args.get('at')
+        
+        # Validate point in time
+        if at and not (validate_date(at) or validate_datetime(at)):
+            return error_response("Invalid at format", 400)
+        
+        # Get user's business
+        business = get_current_business()
+        if not business:
+            return error_response("Business not found", 404)
+        
+        # Verify wallet belongs to business
+        wallet = Wallet.query.filter_by(
+            id=wallet_id, business_id=business.id
+        ).first()
+        
+        if not wallet:
+            return not_found_response("Wallet")
+        
+        # Answer from the nearest checkpoint unless the current balance was asked for
+        at = _parse_balance_time(at) if at else None
+        balance = wallet.balance_at(at) if at else wallet.balance
+        
+        return success_response({
+            'wallet_id': wallet.id,
+            'currency': wallet.currency,
+            'at': at or datetime.utcnow(),
+            'balance': balance
+        })
+        
+    except Exception as e:
+        return error_response("Failed to get wallet balance", 500)
+
+@wallet_bp.route('/<uuid:wallet_id>/add-funds', methods=['POST'])
 @jwt_required()
 def add_funds_to_wallet(wallet_id):
     """Add funds to a wallet"""
     try:
-        current_user_id = get_jwt_identity()
         data = request.get_json()
         
         # Get user's business
-        business = Business.query.filter_by(owner_id=current_user_id).first()
+        business = get_current_business()
         if not business:
             return error_response("Business not found", 404)
         
@@ -197,16 +364,15 @@ def add_funds_to_wallet(wallet_id):
         db.session.rollback()
         return error_response("Failed to add funds", 500)
 
-@wallet_bp.route('/<wallet_id>/transfer', methods=['POST'])
+@wallet_bp.route('/<uuid:wallet_id>/transfer', methods=['POST'])
 @jwt_required()
 def transfer_between_wallets(wallet_id):
     """Transfer funds between wallets"""
     try:
-        current_user_id = get_jwt_identity()
         data = request.get_json()
         
         # Get user's business
-        business = Business.query.filter_by(owner_id=current_user_id).first()
+        business = get_current_business()
         if not business:
             return error_response("Business not found", 404)
         
@@ -230,33 +396,20 @@ def transfer_between_wallets(wallet_id):
         
         # Get destination wallet
         to_wallet = Wallet.query.filter_by(
-            id=data['to_wallet_id'], business_id=business.id
+            id=parse_uuid(data['to_wallet_id']), business_id=business.id
         ).first()
         
         if not to_wallet:
             return not_found_response("Destination wallet")
         
-        # Check if source wallet has sufficient funds
-        if from_wallet.balance < data['amount']:
-            return error_response("Insufficient funds in source wallet", 400)
+        if to_wallet.id == from_wallet.id:
+            return error_response("Cannot transfer to the same wallet", 400)
         
-        # Create transactions
-        debit_transaction = from_wallet.add_funds(
-            amount=data['amount'],
-            description=f"Transfer to {to_wallet.name}: {data['description']}",
-            transaction_type='debit'
+        # Move funds atomically; the debit fails if the source cannot cover it
+        debit_transaction, credit_transaction = Wallet.transfer(
+            from_wallet, to_wallet, data['amount'], data['description']
         )
         
-        credit_transaction = to_wallet.add_funds(
-            amount=data['amount'],
-            description=f"Transfer from {from_wallet.name}: {data['description']}",
-            transaction_type='credit'
-        )
-        
-        # Link transactions
-        debit_transaction.related_transaction_id = credit_transaction.id
-        credit_transaction.related_transaction_id = debit_transaction.id
-        
         db.session.commit()
         
         return success_response({
@@ -266,6 +419,9 @@ def transfer_between_wallets(wallet_id):
             'credit_transaction': credit_transaction.to_dict()
         }, "Transfer completed successfully")
         
+    except InsufficientFundsError:
+        db.session.rollback()
+        return error_response("Insufficient funds in source wallet", 400)
     except Exception as e:
         db.session.rollback()
         return error_response("Failed to transfer funds", 500) 
\ No newline at end of file
@@ -0,0 +1,94 @@
+from flask import g
+from flask_jwt_extended import get_jwt_identity
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session, make_transient_to_detached
+
+from app import db
+from app.models.user import User
+from app.utils.tenant import TenantCache
+from app.utils.validators import parse_uuid
+
+class UserCache(TenantCache):
+    """Bounded in-process TTL cache of User snapshots keyed by user id"""
+    
+    def init_app(self, app):
+        """Read cache limits from the application config"""
+        self.max_size = app.config.get('USER_CACHE_MAX_SIZE', self.max_size)
+        self.ttl = app.config.get('USER_CACHE_TTL', self.ttl)
+        self.clear()
+
+user_cache = UserCache(ttl=30)
+
+# The only columns cached: enough for role and active checks, and nothing
+# (like password_hash) that a stale copy must never be trusted for
+SNAPSHOT_COLUMNS = ('id', 'role', 'is_active')
+
+def _snapshot(user):
+    """Build a detached copy of a user holding only the snapshot columns
+    
+    Every other column is left expired, so reading it loads it fresh.
+    """
+    snapshot = inspect(User).class_manager.new_instance()  # User.__init__ would hash a password
+    for key in SNAPSHOT_COLUMNS:
+        setattr(snapshot, key, getattr(user, key))
+    make_transient_to_detached(snapshot)
+    return snapshot
+
+def get_current_user_id():
+    """Return the authenticated user's id as a UUID, or None if the token identity is not one"""
+    return parse_uuid(get_jwt_identity())
+
+def get_current_user():
+    """
+    Resolve the authenticated user once per request.
+    
+    Role and active checks read the cached snapshot, merged into the request
+    session without emitting a SELECT. Routes that read or change anything
+    else about the user (profile, password) load it with ``User.query.get``.
+    Commits that change a user evict it here; other worker processes see the
+    change once their entry expires.
+    """
+    if 'current_user' in g:
+        return g.current_user
+    
+    current_user_id = get_current_user_id()
+    if current_user_id is None:
+        g.current_user = None
+        return None
+    
+    snapshot = user_cache.get(str(current_user_id))
+    if snapshot is not None:
+        user = db.session.merge(snapshot, load=False)
+    else:
+        user = User.query.get(current_user_id)
+        if user is not None:
+            user_cache.set(str(current_user_id), _snapshot(user))
+    
+    g.current_user = user
+    return user
+
+def _pending_user_ids(session):
+    return session.info.setdefault('user_cache_evictions', set())
+
+@event.listens_for(User, 'after_update')
+@event.listens_for(User, 'after_delete')
+def _track_user_change(mapper, connection, target):
+    """Remember which cached users a flush has changed"""
+    state = inspect(target)
+    if state.session is None:
+        return
+    _pending_user_ids(state.session).add(str(target.id))
+
+@event.listens_for(Session, 'after_commit')
+def _evict_committed_users(session):
+    """Evict cached users once their changes are committed"""
+    user_ids = session.info.pop('user_cache_evictions', None)
+    if not user_ids:
+        return
+    
+    for user_id in user_ids:
+        user_cache.invalidate(user_id)
+
+@event.listens_for(Session, 'after_rollback')
+def _discard_pending_evictions(session):
+    session.info.pop('user_cache_evictions', None)
\ No newline at end of file
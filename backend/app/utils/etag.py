@@ -0,0 +1,36 @@
+import hashlib
+
+from flask import request
+from sqlalchemy import func
+
+def make_etag(*parts):
+    """Build a validator from the request URL and the given state"""
+    payload = repr((request.full_path, *parts)).encode('utf-8')
+    return hashlib.sha1(payload).hexdigest()
+
+def query_etag(query, updated_column, *parts, related=()):
+    """
+    Build a validator for a filtered query from its row count and latest update.
+    
+    This costs a single aggregate query, so a matching ``If-None-Match`` can be
+    answered before the page is loaded or serialized. Inserts and deletes
+    change the count, and updates bump ``updated_at``.
+    
+    Responses that embed related rows pass ``related`` as ``(query,
+    updated_column)`` pairs; their count and latest update are folded into
+    the same statement as scalar subqueries.
+    """
+    columns = [func.count(), func.max(updated_column)]
+    for related_query, related_updated_column in related:
+        related_query = related_query.order_by(None)
+        columns.append(related_query.with_entities(func.count()).scalar_subquery().correlate(None))
+        columns.append(
+            related_query.with_entities(func.max(related_updated_column)).scalar_subquery().correlate(None)
+        )
+    
+    state = query.order_by(None).with_entities(*columns).one()
+    return make_etag(*state, *parts)
+
+def is_not_modified(etag):
+    """Check whether the client already holds the representation for etag"""
+    return request.if_none_match.contains_weak(etag)
@@ -0,0 +1,71 @@
+import csv
+import io
+from datetime import date, datetime
+
+from flask import Response, current_app, stream_with_context
+
+# Leading characters spreadsheet applications evaluate as formulas
+FORMULA_PREFIXES = ('=', '+', '-', '@', '\t', '\r')
+
+def stream_rows(query):
+    """
+    Iterate over a query's rows in batches through a server-side cursor.
+    
+    Only ``EXPORT_BATCH_SIZE`` rows are held in memory at a time, so exports
+    of any size run in constant memory.
+    """
+    return query.yield_per(current_app.config.get('EXPORT_BATCH_SIZE', 1000))
+
+def attachment_response(chunks, mimetype, filename):
+    """Stream generated chunks to the client as a file download"""
+    response = Response(stream_with_context(chunks), mimetype=mimetype)
+    response.headers['Content-Disposition'] = f'attachment; filename="{filename}"'
+    return response
+
+def ndjson_response(rows, serialize, filename):
+    """Stream rows as newline-delimited JSON, one serialized row per line"""
+    dumps = current_app.json.dumps
+    batch_size = current_app.config.get('EXPORT_BATCH_SIZE', 1000)
+    
+    def generate():
+        lines = []
+        for row in rows:
+            lines.append(dumps(serialize(row)))
+            if len(lines) >= batch_size:
+                yield '\n'.join(lines) + '\n'
+                lines = []
+        
+        if lines:
+            yield '\n'.join(lines) + '\n'
+    
+    return attachment_response(generate(), 'application/x-ndjson', filename)
+
+def _csv_cell(value):
+    """Format a value for CSV, neutralizing text that would run as a formula"""
+    if value is None:
+        return ''
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    if isinstance(value, str) and value.startswith(FORMULA_PREFIXES):
+        return "'" + value
+    return value
+
+def csv_response(rows, header, to_row, filename):
+    """Stream rows as CSV under a header line, ``to_row`` mapping a row to its cells"""
+    batch_size = current_app.config.get('EXPORT_BATCH_SIZE', 1000)
+    
+    def generate():
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(header)
+        
+        for count, row in enumerate(rows, 1):
+            writer.writerow([_csv_cell(value) for value in to_row(row)])
+            if count % batch_size == 0:
+                yield buffer.getvalue()
+                buffer.seek(0)
+                buffer.truncate()
+        
+        yield buffer.getvalue()
+    
+    return attachment_response(generate(), 'text/csv', filename)
\ No newline at end of file
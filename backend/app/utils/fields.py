@@ -0,0 +1,124 @@
+from functools import lru_cache
+
+from flask import request
+
+class _ColumnRef:
+    """Placeholder for a column read while building a serialized dictionary"""
+    
+    __slots__ = ('name',)
+    
+    def __init__(self, name):
+        self.name = name
+
+class _ColumnRecorder:
+    """Stand-in source for ``serialize`` that returns a placeholder for every attribute"""
+    
+    def __getattr__(self, name):
+        return _ColumnRef(name)
+
+def parse_fields(value=None):
+    """
+    Parse a sparse fieldset such as ``id,status,client.name`` into a selection.
+    
+    Returns None when no fieldset was requested, otherwise a dict mapping each
+    top-level key to None (the whole value) or to a set of nested keys.
+    """
+    if value is None:
+        value = request.args.get('fields')
+    
+    if not value:
+        return None
+    
+    fields = {}
+    for path in value.split(','):
+        key, _, nested_key = path.strip().partition('.')
+        if not key:
+            continue
+        
+        if not nested_key:
+            fields[key] = None
+        elif key not in fields:
+            fields[key] = {nested_key}
+        elif fields[key] is not None:
+            fields[key].add(nested_key)
+    
+    return fields
+
+def wants_field(fields, key):
+    """Check whether a top-level key was requested"""
+    return fields is None or key in fields
+
+@lru_cache(maxsize=None)
+def _field_map(model):
+    """
+    Map each key of ``model.serialize`` to the columns it is built from.
+    
+    Keys built from something other than plain column reads (related rows,
+    computed values) are declared on the model in ``FIELD_COLUMNS``.
+    """
+    overrides = getattr(model, 'FIELD_COLUMNS', {})
+    field_map = {}
+    
+    for key, value in model.serialize(_ColumnRecorder()).items():
+        nested = {}
+        if key in overrides:
+            columns = set(overrides[key])
+        elif isinstance(value, dict):
+            nested = {
+                nested_key: {ref.name}
+                for nested_key, ref in value.items() if isinstance(ref, _ColumnRef)
+            }
+            columns = set().union(*nested.values())
+        elif isinstance(value, _ColumnRef):
+            columns = {value.name}
+        else:
+            columns = set()
+        
+        field_map[key] = (columns, nested)
+    
+    return field_map
+
+def field_columns(model, fields, required=()):
+    """
+    Return the column names needed to serialize the requested fields.
+    
+    The primary key and any ``required`` columns (e.g. the keyset sort column)
+    are always included. Returns None, meaning every column, when no
+    fieldset was requested.
+    """
+    if fields is None:
+        return None
+    
+    field_map = _field_map(model)
+    names = {'id', *required}
+    
+    for key, nested_keys in fields.items():
+        if key not in field_map:
+            continue
+        
+        columns, nested = field_map[key]
+        if nested_keys and nested:
+            for nested_key in nested_keys:
+                names |= nested.get(nested_key, set())
+        else:
+            names |= columns
+    
+    return names
+
+def select_fields(data, fields):
+    """Drop the keys of a serialized dictionary that were not requested"""
+    if fields is None:
+        return data
+    
+    selected = {'id': data['id']} if 'id' in data else {}
+    for key, nested_keys in fields.items():
+        if key not in data:
+            continue
+        
+        value = data[key]
+        if nested_keys and isinstance(value, dict):
+            value = {nested_key: value[nested_key] for nested_key in nested_keys if nested_key in value}
+        
+        selected[key] = value
+    
+    return selected
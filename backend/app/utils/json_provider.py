@@ -0,0 +1,74 @@
+import dataclasses
+import decimal
+import uuid
+from datetime import date, datetime, time
+
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson is optional
+    orjson = None
+
+def _default(o):
+    """Serialize the types models hand to the response layer as raw values"""
+    if isinstance(o, decimal.Decimal):
+        return float(o)
+    
+    if isinstance(o, (datetime, date, time)):
+        return o.isoformat()
+    
+    if isinstance(o, uuid.UUID):
+        return str(o)
+    
+    if dataclasses.is_dataclass(o) and not isinstance(o, type):
+        return dataclasses.asdict(o)
+    
+    if hasattr(o, '__html__'):
+        return str(o.__html__())
+    
+    raise TypeError(f"Object of type {type(o).__name__} is not JSON serializable")
+
+class FastJSONProvider(DefaultJSONProvider):
+    """
+    JSON provider backed by orjson, falling back to the stdlib encoder.
+    
+    Decimals, UUIDs, datetimes and dates are encoded natively (Decimals as
+    numbers, temporal values as ISO 8601 strings), so models can return raw
+    column values from to_dict().
+    """
+    
+    default = staticmethod(_default)
+    
+    def _orjson_options(self, indent=False):
+        option = orjson.OPT_NON_STR_KEYS
+        if self.sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        return option
+    
+    def dumps(self, obj, **kwargs):
+        """Serialize data as JSON to a string"""
+        if orjson is None or kwargs:
+            return super().dumps(obj, **kwargs)
+        
+        return orjson.dumps(obj, default=_default, option=self._orjson_options()).decode('utf-8')
+    
+    def loads(self, s, **kwargs):
+        """Deserialize data as JSON from a string or bytes"""
+        if orjson is None or kwargs:
+            return super().loads(s, **kwargs)
+        
+        return orjson.loads(s)
+    
+    def response(self, *args, **kwargs):
+        """Serialize the given arguments as JSON and return a response"""
+        if orjson is None:
+            return super().response(*args, **kwargs)
+        
+        obj = self._prepare_response_obj(args, kwargs)
+        indent = (self.compact is None and self._app.debug) or self.compact is False
+        body = orjson.dumps(obj, default=_default, option=self._orjson_options(indent))
+        
+        return self._app.response_class(body + b"\n", mimetype=self.mimetype)
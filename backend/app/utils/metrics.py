@@ -0,0 +1,194 @@
+import hmac
+import ipaddress
+import os
+import time
+
+from flask import Response, g, request
+from sqlalchemy import event
+
+try:
+    import prometheus_client
+    from prometheus_client import multiprocess
+except ImportError:  # pragma: no cover - prometheus_client is optional
+    prometheus_client = None
+
+# Request latency buckets in seconds, finer below 100ms where most routes land
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.075, 0.1, 0.25, 0.5, 0.75, 1.0, 2.5, 5.0, 10.0)
+
+# Pool checkout buckets in seconds; an uncontended checkout takes well under 1ms
+POOL_WAIT_BUCKETS = (0.0005, 0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+# Password hashing buckets in seconds; bcrypt at cost 12 takes roughly 0.25s
+PASSWORD_HASH_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Endpoint label for requests that matched no route, keeping label values bounded
+UNMATCHED_ENDPOINT = 'unmatched'
+
+class _NullMetric:
+    """Stand-in recording nothing when prometheus_client is not installed"""
+    
+    def labels(self, *args, **kwargs):
+        return self
+    
+    def observe(self, amount):
+        pass
+    
+    def inc(self, amount=1):
+        pass
+    
+    def dec(self, amount=1):
+        pass
+
+def _metric(kind, name, documentation, labelnames=(), **kwargs):
+    """Create a metric on the default registry, or a null metric without prometheus_client"""
+    if prometheus_client is None:
+        return _NullMetric()
+    return getattr(prometheus_client, kind)(name, documentation, labelnames, **kwargs)
+
+REQUEST_LATENCY = _metric(
+    'Histogram', 'http_request_duration_seconds', 'Request latency, including streamed bodies',
+    ['blueprint', 'endpoint', 'method'], buckets=LATENCY_BUCKETS
+)
+REQUEST_COUNT = _metric(
+    'Counter', 'http_requests', 'Requests served by status code',
+    ['blueprint', 'endpoint', 'method', 'status']
+)
+REQUESTS_IN_PROGRESS = _metric(
+    'Gauge', 'http_requests_in_progress', 'Requests currently being served',
+    ['blueprint', 'endpoint'], multiprocess_mode='livesum'
+)
+REQUEST_DB_TIME = _metric(
+    'Histogram', 'http_request_db_duration_seconds', 'Time spent executing SQL per request',
+    ['blueprint', 'endpoint'], buckets=LATENCY_BUCKETS
+)
+DB_POOL_CHECKOUT_WAIT = _metric(
+    'Histogram', 'db_pool_checkout_wait_seconds', 'Time spent waiting to check a connection out of the pool',
+    buckets=POOL_WAIT_BUCKETS
+)
+PASSWORD_HASH_DURATION = _metric(
+    'Histogram', 'password_hash_duration_seconds', 'Time spent running bcrypt, by operation',
+    ['operation'], buckets=PASSWORD_HASH_BUCKETS
+)
+PASSWORD_HASH_QUEUE_WAIT = _metric(
+    'Histogram', 'password_hash_queue_wait_seconds', 'Time spent waiting for a free hashing slot',
+    ['operation'], buckets=PASSWORD_HASH_BUCKETS
+)
+PASSWORD_HASH_REJECTED = _metric(
+    'Counter', 'password_hash_rejected', 'Hashing requests turned away because the hashing pool was full',
+    ['operation']
+)
+
+def _time_pool_checkouts(pool):
+    """Observe how long each checkout from a pool takes, including waiting for a free connection"""
+    connect = pool.connect
+    
+    def timed_connect():
+        started = time.perf_counter()
+        try:
+            return connect()
+        finally:
+            DB_POOL_CHECKOUT_WAIT.observe(time.perf_counter() - started)
+    
+    pool.connect = timed_connect
+
+def _request_labels():
+    return request.blueprint or 'app', request.endpoint or UNMATCHED_ENDPOINT
+
+class RequestMetrics:
+    """
+    Prometheus metrics for request latency, status codes, in-flight
+    requests and database pool waits, served at ``/metrics``.
+    
+    Under gunicorn set ``PROMETHEUS_MULTIPROC_DIR`` before the workers start
+    so every worker writes to shared files and a scrape of any worker
+    reports totals across all of them (see gunicorn.conf.py).
+    
+    The endpoint only answers scrapers from ``METRICS_ALLOWED_IPS`` or
+    presenting ``METRICS_TOKEN`` as a bearer token.
+    """
+    
+    def __init__(self, path='/metrics', allowed_networks=(), token=None):
+        self.path = path
+        self.allowed_networks = allowed_networks
+        self.token = token
+    
+    def init_app(self, app):
+        """Hook the request lifecycle and the database pool, and register the metrics endpoint"""
+        if not app.config.get('METRICS_ENABLED', True):
+            return
+        self.path = app.config.get('METRICS_PATH', self.path)
+        self.token = app.config.get('METRICS_TOKEN') or None
+        self.allowed_networks = tuple(
+            ipaddress.ip_network(network.strip(), strict=False)
+            for network in app.config.get('METRICS_ALLOWED_IPS', '').split(',')
+            if network.strip()
+        )
+        
+        app.before_request(self._start)
+        app.after_request(self._record_status)
+        app.teardown_request(self._finish)
+        
+        from app import db, limiter
+        with app.app_context():
+            engine = db.engine
+        _time_pool_checkouts(engine.pool)
+        # Engine.dispose() swaps in a new pool
+        event.listen(engine, 'engine_disposed', lambda engine: _time_pool_checkouts(engine.pool))
+        
+        app.add_url_rule(self.path, 'metrics', self._metrics)
+        limiter.exempt(app.view_functions['metrics'])
+    
+    def _start(self):
+        if request.endpoint == 'metrics':
+            return
+        g.metrics_started = time.perf_counter()
+        REQUESTS_IN_PROGRESS.labels(*_request_labels()).inc()
+    
+    def _record_status(self, response):
+        g.metrics_status = response.status_code
+        return response
+    
+    def _finish(self, exception=None):
+        # Runs after streamed bodies finish, so exports are timed in full
+        started = g.pop('metrics_started', None)
+        if started is None:
+            return
+        
+        blueprint, endpoint = _request_labels()
+        REQUESTS_IN_PROGRESS.labels(blueprint, endpoint).dec()
+        REQUEST_LATENCY.labels(blueprint, endpoint, request.method).observe(time.perf_counter() - started)
+        REQUEST_COUNT.labels(blueprint, endpoint, request.method, str(g.get('metrics_status', 500))).inc()
+        
+        stats = g.get('query_stats')
+        if stats is not None:
+            REQUEST_DB_TIME.labels(blueprint, endpoint).observe(stats.duration)
+    
+    def _is_authorized(self):
+        """Check the scraper's address against the allowlist, or its bearer token"""
+        if self.token:
+            scheme, _, credentials = request.headers.get('Authorization', '').partition(' ')
+            if scheme.lower() == 'bearer' and hmac.compare_digest(credentials.encode(), self.token.encode()):
+                return True
+        
+        try:
+            address = ipaddress.ip_address(request.remote_addr or '')
+        except ValueError:
+            return False
+        return any(address in network for network in self.allowed_networks)
+    
+    def _metrics(self):
+        """Expose every metric in the Prometheus text format"""
+        from app.utils.response import error_response
+        if not self._is_authorized():
+            return error_response("Forbidden", 403)
+        if prometheus_client is None:
+            return error_response("Metrics unavailable: prometheus_client is not installed", 503)
+        
+        if os.environ.get('PROMETHEUS_MULTIPROC_DIR'):
+            registry = prometheus_client.CollectorRegistry()
+            multiprocess.MultiProcessCollector(registry)
+        else:
+            registry = prometheus_client.REGISTRY
+        return Response(prometheus_client.generate_latest(registry), content_type=prometheus_client.CONTENT_TYPE_LATEST)
+
+request_metrics = RequestMetrics()
\ No newline at end of file
@@ -0,0 +1,136 @@
+import json
+import os
+import threading
+import time
+from collections import namedtuple
+from pathlib import Path
+
+# File mapping each combined payload key to its mock data file
+STRUCTURE_FILE = 'api.json'
+
+# A loaded file: when its mtime was last checked, its (mtime, size) version,
+# the parsed data and the encoded response body
+MockDataEntry = namedtuple('MockDataEntry', ['checked_at', 'version', 'data', 'body'])
+
+class MockDataNotFoundError(LookupError):
+    """Raised when a mock data file is missing"""
+    
+    def __init__(self, filename):
+        super().__init__(f"Mock data file {filename} not found")
+        self.filename = filename
+
+class MockDataStore:
+    """In-memory store of mock data files kept as pre-encoded JSON response bodies"""
+    
+    def __init__(self, directory=None, check_interval=1.0):
+        self.directory = Path(directory or Path(__file__).parent.parent.parent / 'mockData')
+        self.check_interval = check_interval
+        self._json = None
+        self._dumps = json.dumps
+        self._sort_keys = True
+        self._indent = False
+        self._entries = {}
+        self._combined = None
+        self._lock = threading.Lock()
+    
+    def init_app(self, app):
+        """Encode with the app's JSON provider and preload every mapped file"""
+        self.directory = Path(app.config.get('MOCKDATA_DIR', self.directory))
+        self.check_interval = app.config.get('MOCKDATA_CHECK_INTERVAL', self.check_interval)
+        self._json = app.json
+        self._dumps = app.json.dumps
+        self._sort_keys = app.json.sort_keys
+        # jsonify pretty-prints in debug mode unless the provider is set compact
+        self._indent = (app.json.compact is None and app.debug) or app.json.compact is False
+        self.clear()
+        
+        try:
+            self.combined()
+        except (MockDataNotFoundError, ValueError):
+            pass  # Reported per request by the mockdata endpoints
+    
+    def _encode(self, data):
+        """Encode data as the same response body jsonify would produce"""
+        if self._json is None:
+            return (self._dumps(data) + '\n').encode('utf-8')
+        return self._json.response(data).get_data()
+    
+    def _version(self, path):
+        """Return a file's (mtime, size) version, or None when it is missing"""
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+    
+    def entry(self, filename):
+        """
+        Return the loaded entry for a file, reloading it when it changed.
+        
+        File mtimes are checked at most once per ``check_interval`` seconds,
+        so a burst of requests is served from memory without touching disk.
+        """
+        entry = self._entries.get(filename)
+        now = time.monotonic()
+        if entry is not None and now - entry.checked_at < self.check_interval:
+            return entry
+        
+        with self._lock:
+            path = self.directory / filename
+            version = self._version(path)
+            if version is None:
+                self._entries.pop(filename, None)
+                raise MockDataNotFoundError(filename)
+            
+            entry = self._entries.get(filename)
+            if entry is None or entry.version != version:
+                with open(path, 'r') as f:
+                    data = json.load(f)
+                body = self._encode(data)
+                entry = MockDataEntry(now, version, data, body)
+            else:
+                entry = entry._replace(checked_at=now)
+            
+            self._entries[filename] = entry
+            return entry
+    
+    def body(self, filename):
+        """Return a file's pre-encoded JSON response body"""
+        return self.entry(filename).body
+    
+    def combined(self):
+        """
+        Return the combined payload of every file mapped in the structure file.
+        
+        Compact payloads are spliced together from the files' encoded bodies;
+        indented ones are encoded whole. Either way the payload is cached
+        until one of the files changes, so it is not re-encoded per request.
+        """
+        structure = self.entry(STRUCTURE_FILE)
+        entries = [(key, self.entry(filename)) for key, filename in structure.data.items()]
+        if self._sort_keys:
+            entries.sort(key=lambda item: item[0])
+        
+        versions = (structure.version, *[(key, entry.version) for key, entry in entries])
+        combined = self._combined
+        if combined is not None and combined[0] == versions:
+            return combined[1]
+        
+        if self._indent:
+            body = self._encode({key: entry.data for key, entry in entries})
+        else:
+            parts = [
+                self._dumps(key).encode('utf-8') + b':' + entry.body.rstrip(b'\n')
+                for key, entry in entries
+            ]
+            body = b'{' + b','.join(parts) + b'}\n'
+        self._combined = (versions, body)
+        return body
+    
+    def clear(self):
+        """Drop every loaded file"""
+        with self._lock:
+            self._entries.clear()
+            self._combined = None
+
+mock_store = MockDataStore()
\ No newline at end of file
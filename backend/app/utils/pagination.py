@@ -0,0 +1,72 @@
+import base64
+import json
+import uuid
+from datetime import date, datetime
+
+from sqlalchemy import and_, or_
+
+class InvalidCursorError(ValueError):
+    """Raised when a pagination cursor cannot be decoded"""
+
+class KeysetPagination:
+    """A single page of keyset-paginated results"""
+    
+    def __init__(self, items, per_page, next_cursor=None, total=None):
+        self.items = items
+        self.per_page = per_page
+        self.next_cursor = next_cursor
+        self.total = total
+    
+    @property
+    def has_next(self):
+        return self.next_cursor is not None
+
+def encode_cursor(sort_value, row_id):
+    """Encode a (sort value, id) pair as an opaque URL-safe cursor"""
+    payload = json.dumps([sort_value.isoformat(), str(row_id)], separators=(',', ':'))
+    return base64.urlsafe_b64encode(payload.encode('utf-8')).decode('ascii').rstrip('=')
+
+def decode_cursor(cursor, sort_column):
+    """Decode a cursor into a (sort value, id) pair for the given sort column"""
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        sort_value, row_id = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')))
+        
+        if sort_column.type.python_type is datetime:
+            sort_value = datetime.fromisoformat(sort_value)
+        else:
+            sort_value = date.fromisoformat(sort_value)
+        
+        return sort_value, uuid.UUID(row_id)
+    except (ValueError, TypeError, UnicodeError):
+        raise InvalidCursorError("Invalid pagination cursor")
+
+def keyset_paginate(query, sort_column, id_column, cursor, per_page, with_total=False):
+    """
+    Paginate a query newest-first on (sort_column, id_column) without OFFSET.
+    
+    An empty cursor returns the first page. The total row count is only
+    computed when with_total is set, since it requires a full COUNT(*).
+    """
+    per_page = max(per_page, 1)
+    total = query.order_by(None).count() if with_total else None
+    
+    if cursor:
+        sort_value, row_id = decode_cursor(cursor, sort_column)
+        query = query.filter(or_(
+            sort_column < sort_value,
+            and_(sort_column == sort_value, id_column < row_id)
+        ))
+    
+    query = query.order_by(sort_column.desc(), id_column.desc())
+    rows = query.limit(per_page + 1).all()
+    
+    next_cursor = None
+    if len(rows) > per_page:
+        rows = rows[:per_page]
+        last = rows[-1]
+        next_cursor = encode_cursor(
+            getattr(last, sort_column.key), getattr(last, id_column.key)
+        )
+    
+    return KeysetPagination(rows, per_page, next_cursor, total)
@@ -0,0 +1,65 @@
+import os
+import threading
+import time
+
+import bcrypt
+
+from app.utils.metrics import PASSWORD_HASH_DURATION, PASSWORD_HASH_QUEUE_WAIT, PASSWORD_HASH_REJECTED
+
+class PasswordHashingBusy(RuntimeError):
+    """Raised when no hashing slot frees up within the queue timeout"""
+
+class PasswordHasher:
+    """
+    bcrypt hashing at the configured cost, capped to a fixed number of
+    concurrent hashes per process.
+    
+    bcrypt releases the GIL, so requests beyond the cap wait for a slot
+    (up to ``queue_timeout`` seconds) instead of competing for every core
+    and starving other endpoints during a burst of logins.
+    """
+    
+    def __init__(self, rounds=12, concurrency=None, queue_timeout=5.0):
+        self.rounds = rounds
+        self.queue_timeout = queue_timeout
+        self._slots = threading.BoundedSemaphore(concurrency or os.cpu_count() or 1)
+    
+    def init_app(self, app):
+        """Read the cost and hashing pool limits from the application config"""
+        self.rounds = app.config.get('BCRYPT_LOG_ROUNDS', self.rounds)
+        self.queue_timeout = app.config.get('PASSWORD_HASH_QUEUE_TIMEOUT', self.queue_timeout)
+        concurrency = app.config.get('PASSWORD_HASH_CONCURRENCY') or os.cpu_count() or 1
+        self._slots = threading.BoundedSemaphore(concurrency)
+    
+    def _run(self, operation, function, *args):
+        """Run a bcrypt call once a hashing slot is free, recording wait and hashing time"""
+        queued = time.perf_counter()
+        if not self._slots.acquire(timeout=self.queue_timeout):
+            PASSWORD_HASH_REJECTED.labels(operation).inc()
+            raise PasswordHashingBusy(f"No password hashing slot free within {self.queue_timeout}s")
+        
+        started = time.perf_counter()
+        PASSWORD_HASH_QUEUE_WAIT.labels(operation).observe(started - queued)
+        try:
+            return function(*args)
+        finally:
+            self._slots.release()
+            PASSWORD_HASH_DURATION.labels(operation).observe(time.perf_counter() - started)
+    
+    def hash(self, password):
+        """Hash a password at the configured cost"""
+        salt = bcrypt.gensalt(rounds=self.rounds)
+        return self._run('hash', bcrypt.hashpw, password.encode('utf-8'), salt).decode('utf-8')
+    
+    def verify(self, password, password_hash):
+        """Check a password against a stored hash"""
+        return self._run('verify', bcrypt.checkpw, password.encode('utf-8'), password_hash.encode('utf-8'))
+    
+    def needs_rehash(self, password_hash):
+        """Check whether a stored hash was made at a different cost than the configured one"""
+        try:
+            return int(password_hash.split('$')[2]) != self.rounds
+        except (IndexError, ValueError):
+            return False
+
+password_hasher = PasswordHasher()
\ No newline at end of file
@@ -0,0 +1,128 @@
+import re
+import time
+
+from flask import current_app, g, has_app_context, request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+# Longest statement text kept in a slow-request log entry
+STATEMENT_MAX_LENGTH = 500
+
+class RequestQueryStats:
+    """SQL statements issued while serving one request"""
+    
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.count = 0
+        self.duration = 0.0
+        self.statements = {}
+        self.status_code = None
+    
+    def add(self, statement, duration):
+        """Record one executed statement and how long it took"""
+        self.count += 1
+        self.duration += duration
+        count, total = self.statements.get(statement, (0, 0.0))
+        self.statements[statement] = (count + 1, total + duration)
+    
+    def top_statements(self, limit):
+        """Return the ``(statement, count, seconds)`` entries that took longest in total"""
+        ranked = sorted(self.statements.items(), key=lambda item: item[1][1], reverse=True)
+        return [(statement, count, total) for statement, (count, total) in ranked[:limit]]
+
+def _current_stats():
+    """Return the stats being collected for the current request, if any"""
+    return g.get('query_stats') if has_app_context() else None
+
+@event.listens_for(Engine, 'before_cursor_execute')
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault('query_stats_started', []).append(time.perf_counter())
+
+@event.listens_for(Engine, 'after_cursor_execute')
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started = conn.info.get('query_stats_started')
+    if not started:
+        return
+    duration = time.perf_counter() - started.pop()
+    
+    stats = _current_stats()
+    if stats is not None:
+        stats.add(statement, duration)
+
+@event.listens_for(Engine, 'handle_error')
+def _handle_error(context):
+    # A failed statement never reaches after_cursor_execute
+    started = context.connection.info.get('query_stats_started') if context.connection is not None else None
+    if started:
+        started.pop()
+
+class QueryInstrumentation:
+    """
+    Count SQL statements and database time per request.
+    
+    Every response carries ``X-DB-Query-Count`` and a ``Server-Timing``
+    header, and requests over the configured time or query thresholds are
+    logged with their route, parameters and most expensive statements.
+    """
+    
+    def __init__(self, headers=True, slow_request_ms=500, slow_request_queries=25, top_statements=5):
+        self.headers = headers
+        self.slow_request_ms = slow_request_ms
+        self.slow_request_queries = slow_request_queries
+        self.top_statements = top_statements
+    
+    def init_app(self, app):
+        """Read thresholds from the application config and hook the request lifecycle"""
+        self.headers = app.config.get('QUERY_STATS_HEADERS', self.headers)
+        self.slow_request_ms = app.config.get('SLOW_REQUEST_THRESHOLD_MS', self.slow_request_ms)
+        self.slow_request_queries = app.config.get('SLOW_REQUEST_QUERY_THRESHOLD', self.slow_request_queries)
+        self.top_statements = app.config.get('SLOW_REQUEST_TOP_STATEMENTS', self.top_statements)
+        
+        app.before_request(self._start)
+        app.after_request(self._add_headers)
+        app.teardown_request(self._finish)
+    
+    def _start(self):
+        g.query_stats = RequestQueryStats()
+    
+    def _add_headers(self, response):
+        stats = _current_stats()
+        if stats is None:
+            return response
+        
+        stats.status_code = response.status_code
+        if self.headers:
+            elapsed_ms = (time.perf_counter() - stats.started) * 1000
+            response.headers['X-DB-Query-Count'] = str(stats.count)
+            response.headers.add(
+                'Server-Timing',
+                f'db;dur={stats.duration * 1000:.2f};desc="{stats.count} queries", app;dur={elapsed_ms:.2f}'
+            )
+        return response
+    
+    def _finish(self, exception=None):
+        # Runs after streamed bodies finish, so export queries are included
+        stats = g.get('query_stats')
+        if stats is None:
+            return
+        
+        elapsed_ms = (time.perf_counter() - stats.started) * 1000
+        slow = self.slow_request_ms and elapsed_ms >= self.slow_request_ms
+        chatty = self.slow_request_queries and stats.count >= self.slow_request_queries
+        if not (slow or chatty):
+            return
+        
+        lines = [
+            f'Slow request {request.method} {request.path} ({request.endpoint}) -> {stats.status_code or 500}: '
+            f'{elapsed_ms:.1f}ms, {stats.count} queries, {stats.duration * 1000:.1f}ms in database',
+            f'  view args: {request.view_args or {}}',
+            f'  query args: {request.args.to_dict(flat=False)}'
+        ]
+        for statement, count, total in stats.top_statements(self.top_statements):
+            text = re.sub(r'\s+', ' ', statement).strip()
+            if len(text) > STATEMENT_MAX_LENGTH:
+                text = text[:STATEMENT_MAX_LENGTH] + '...'
+            lines.append(f'  {count}x {total * 1000:.1f}ms  {text}')
+        current_app.logger.warning('\n'.join(lines))
+
+query_instrumentation = QueryInstrumentation()
\ No newline at end of file
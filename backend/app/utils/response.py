@@ -1,4 +1,4 @@
-from flask import jsonify
+from flask import current_app, jsonify
 from datetime import datetime
 
 def success_response(data=None, message="Success", status_code=200):
@@ -7,7 +7,7 @@ def success_response(data=None, message="Success", status_code=200):
         "success": True,
         "message": message,
         "data": data,
-        "timestamp": datetime.utcnow().isoformat()
+        "timestamp": datetime.utcnow()
     }
     return jsonify(response), status_code
 
@@ -19,7 +19,7 @@ def error_response(message="Error", status_code=400, details=None):
             "message": message,
             "code": status_code
         },
-        "timestamp": datetime.utcnow().isoformat()
+        "timestamp": datetime.utcnow()
     }
     
     if details:
@@ -43,11 +43,46 @@ def paginated_response(data, page, per_page, total, message="Success"):
             "has_next": page < total_pages,
             "has_prev": page > 1
         },
-        "timestamp": datetime.utcnow().isoformat()
+        "timestamp": datetime.utcnow()
     }
     
     return jsonify(response), 200
 
+def cursor_paginated_response(data, per_page, next_cursor, total=None, message="Success"):
+    """Create a cursor (keyset) paginated response"""
+    pagination = {
+        "per_page": per_page,
+        "next_cursor": next_cursor,
+        "has_next": next_cursor is not None
+    }
+    
+    if total is not None:
+        pagination["total"] = total
+    
+    response = {
+        "success": True,
+        "message": message,
+        "data": data,
+        "pagination": pagination,
+        "timestamp": datetime.utcnow()
+    }
+    
+    return jsonify(response), 200
+
+def etag_response(response, etag):
+    """Attach a weak ETag to a response so clients can revalidate it"""
+    body, status_code = response
+    body.set_etag(etag, weak=True)
+    body.headers["Cache-Control"] = "private, no-cache"
+    return body, status_code
+
+def not_modified_response(etag):
+    """Create an empty 304 response for a matching If-None-Match"""
+    response = current_app.response_class(status=304)
+    response.set_etag(etag, weak=True)
+    response.headers["Cache-Control"] = "private, no-cache"
+    return response
+
 def validation_error_response(errors, message="Validation failed"):
     """Create a validation error response"""
     return error_response(
@@ -0,0 +1,15 @@
+from sqlalchemy import null
+
+def as_rows(query, model, columns=None):
+    """
+    Restrict a model query to plain result rows for the model's columns.
+    
+    Rows skip ORM instance hydration and identity-map bookkeeping, and expose
+    each column as an attribute, so they can be passed to ``model.serialize``.
+    When ``columns`` is given, every other column is selected as a NULL
+    literal so it is never read from the table but rows keep their shape.
+    """
+    return query.with_entities(*[
+        column if columns is None or column.key in columns else null().label(column.key)
+        for column in model.__table__.columns
+    ])
\ No newline at end of file
@@ -1,12 +1,83 @@
 from app import db
 from app.models.user import User
 from app.models.business import Business
-from app.models.expense import ExpenseCategory
-from app.models.wallet import Wallet
+from app.models.invoice import Invoice, InvoiceItem
+from app.models.expense import Expense, ExpenseCategory
+from app.models.wallet import Wallet, Transaction, BalanceCheckpoint
+from app.models.payment import Payment
+from app.models.payroll import Employee, Payroll
 from app.models.credit import CreditProfile
-from datetime import datetime, date
+from app.models.dashboard import DashboardAggregate, CONTRIBUTIONS
+from app.utils.passwords import password_hasher
+from datetime import datetime, date, timedelta
+from decimal import Decimal
+from sqlalchemy import insert
+from types import SimpleNamespace
+import random
 import uuid
 
+# Expense categories every seeded business starts with
+DEFAULT_EXPENSE_CATEGORIES = [
+    {
+        'name': 'Office Supplies',
+        'description': 'Office equipment and supplies',
+        'color': '#3B82F6',
+        'icon': 'briefcase'
+    },
+    {
+        'name': 'Travel & Entertainment',
+        'description': 'Business travel and entertainment expenses',
+        'color': '#10B981',
+        'icon': 'airplane'
+    },
+    {
+        'name': 'Marketing & Advertising',
+        'description': 'Marketing and advertising expenses',
+        'color': '#F59E0B',
+        'icon': 'megaphone'
+    },
+    {
+        'name': 'Software & Subscriptions',
+        'description': 'Software licenses and subscriptions',
+        'color': '#8B5CF6',
+        'icon': 'computer'
+    },
+    {
+        'name': 'Utilities',
+        'description': 'Electricity, water, internet, etc.',
+        'color': '#EF4444',
+        'icon': 'lightning'
+    },
+    {
+        'name': 'Professional Services',
+        'description': 'Legal, accounting, consulting fees',
+        'color': '#06B6D4',
+        'icon': 'user-tie'
+    }
+]
+
+# Wallets every seeded business starts with
+DEFAULT_WALLETS = [
+    {
+        'name': 'Operating Account',
+        'wallet_type': 'operating',
+        'currency': 'USD',
+        'balance': 50000.00
+    },
+    {
+        'name': 'Tax Reserve',
+        'wallet_type': 'tax_reserve',
+        'currency': 'USD',
+        'balance': 15000.00
+    },
+    {
+        'name': 'Savings Account',
+        'wallet_type': 'savings',
+        'currency': 'USD',
+        'balance': 100000.00
+    }
+]
+
 def seed_database():
     """Seed the database with initial data"""
     
@@ -64,46 +135,7 @@ def seed_database():
     db.session.flush()
     
     # Create default expense categories
-    default_categories = [
-        {
-            'name': 'Office Supplies',
-            'description': 'Office equipment and supplies',
-            'color': '#3B82F6',
-            'icon': 'briefcase'
-        },
-        {
-            'name': 'Travel & Entertainment',
-            'description': 'Business travel and entertainment expenses',
-            'color': '#10B981',
-            'icon': 'airplane'
-        },
-        {
-            'name': 'Marketing & Advertising',
-            'description': 'Marketing and advertising expenses',
-            'color': '#F59E0B',
-            'icon': 'megaphone'
-        },
-        {
-            'name': 'Software & Subscriptions',
-            'description': 'Software licenses and subscriptions',
-            'color': '#8B5CF6',
-            'icon': 'computer'
-        },
-        {
-            'name': 'Utilities',
-            'description': 'Electricity, water, internet, etc.',
-            'color': '#EF4444',
-            'icon': 'lightning'
-        },
-        {
-            'name': 'Professional Services',
-            'description': 'Legal, accounting, consulting fees',
-            'color': '#06B6D4',
-            'icon': 'user-tie'
-        }
-    ]
-    
-    for category_data in default_categories:
+    for category_data in DEFAULT_EXPENSE_CATEGORIES:
         category = ExpenseCategory(
             name=category_data['name'],
             description=category_data['description'],
@@ -114,28 +146,7 @@ def seed_database():
         db.session.add(category)
     
     # Create default wallets
-    default_wallets = [
-        {
-            'name': 'Operating Account',
-            'wallet_type': 'operating',
-            'currency': 'USD',
-            'balance': 50000.00
-        },
-        {
-            'name': 'Tax Reserve',
-            'wallet_type': 'tax_reserve',
-            'currency': 'USD',
-            'balance': 15000.00
-        },
-        {
-            'name': 'Savings Account',
-            'wallet_type': 'savings',
-            'currency': 'USD',
-            'balance': 100000.00
-        }
-    ]
-    
-    for wallet_data in default_wallets:
+    for wallet_data in DEFAULT_WALLETS:
         wallet = Wallet(
             name=wallet_data['name'],
             wallet_type=wallet_data['wallet_type'],
@@ -181,6 +192,367 @@ def seed_database():
     print(f"📊 Credit profile created with sample data")
     print(f"📁 Default expense categories created")
 
+# Last day of the synthetic history, fixed so a seed always yields the same rows
+SYNTHETIC_END_DATE = date(2025, 12, 31)
+SYNTHETIC_HISTORY_DAYS = 365
+
+# Rows generated per business at size 1; business sizes are log-normal, so a
+# few large tenants dominate like in production (~2,300 rows per business)
+SYNTHETIC_VOLUMES = {
+    'invoices': 120,
+    'expenses': 300,
+    'transactions_per_wallet': 400,
+    'payments': 150,
+    'employees': 12
+}
+
+SYNTHETIC_INVOICE_STATUSES = (('paid', 55), ('sent', 20), ('overdue', 10), ('draft', 10), ('cancelled', 5))
+SYNTHETIC_EXPENSE_STATUSES = (('approved', 70), ('pending', 20), ('rejected', 10))
+SYNTHETIC_PAYMENT_STATUSES = (('completed', 80), ('pending', 10), ('failed', 7), ('processing', 3))
+SYNTHETIC_PAY_FREQUENCIES = (('monthly', 50), ('biweekly', 40), ('weekly', 10))
+SYNTHETIC_FIRST_NAMES = ('Alex', 'Sam', 'Jordan', 'Taylor', 'Morgan', 'Casey', 'Riley', 'Jamie', 'Avery', 'Quinn')
+SYNTHETIC_LAST_NAMES = ('Smith', 'Garcia', 'Chen', 'Patel', 'Johnson', 'Nguyen', 'Brown', 'Kim', 'Lopez', 'Wilson')
+SYNTHETIC_COMPANY_WORDS = ('Summit', 'Harbor', 'Cedar', 'Northwind', 'Bright', 'Atlas', 'Blue', 'Pioneer', 'Granite', 'Maple')
+SYNTHETIC_INDUSTRIES = ('Technology', 'Retail', 'Construction', 'Healthcare', 'Hospitality', 'Consulting')
+SYNTHETIC_VENDORS = ('Staples', 'Delta', 'Google Ads', 'AWS', 'PG&E', 'Deloitte', 'Uber', 'Slack', 'Comcast', 'FedEx')
+SYNTHETIC_DEPARTMENTS = ('Engineering', 'Sales', 'Operations', 'Finance', 'Support')
+
+class _BulkWriter:
+    """Buffer generated rows and insert them as executemany batches
+    
+    Buffers are flushed together in the order models were first added, so
+    parents are always inserted before the rows referencing them. Rows of
+    models the dashboard aggregates are recorded as they are written.
+    """
+    
+    def __init__(self, batch_size):
+        self.batch_size = batch_size
+        self.buffers = {}
+        self.buffered = 0
+        self.counts = {}
+    
+    def add(self, model, row):
+        """Buffer a row, writing every buffer once the batch is full"""
+        self.buffers.setdefault(model, []).append(row)
+        self.buffered += 1
+        if self.buffered >= self.batch_size:
+            self.flush()
+    
+    def flush(self):
+        """Insert and commit every buffered row"""
+        for model, rows in self.buffers.items():
+            if not rows:
+                continue
+            db.session.execute(insert(model), rows)
+            if model in CONTRIBUTIONS:
+                DashboardAggregate.record(model, rows)
+            self.counts[model.__tablename__] = self.counts.get(model.__tablename__, 0) + len(rows)
+            self.buffers[model] = []
+        self.buffered = 0
+        db.session.commit()
+
+def _choice(rng, weighted):
+    """Pick a value from (value, weight) pairs"""
+    values, weights = zip(*weighted)
+    return rng.choices(values, weights)[0]
+
+def _money(value):
+    """Round a generated amount to cents"""
+    return Decimal(str(round(value, 2)))
+
+def _synthetic_id(rng):
+    """Draw a UUID from the RNG so ids are reproducible"""
+    return uuid.UUID(int=rng.getrandbits(128), version=4)
+
+def _synthetic_time(rng, day):
+    """Draw a time during business hours on a day"""
+    return datetime.combine(day, datetime.min.time()) + timedelta(seconds=rng.randrange(8 * 3600, 20 * 3600))
+
+def _pay_periods(frequency, start, end):
+    """Yield (start_date, end_date) pay periods of a frequency ending by end"""
+    if frequency == 'monthly':
+        current = start.replace(day=1)
+        while current <= end:
+            next_month = (current.replace(day=28) + timedelta(days=4)).replace(day=1)
+            if next_month - timedelta(days=1) <= end:
+                yield current, next_month - timedelta(days=1)
+            current = next_month
+    else:
+        length = timedelta(days=7 if frequency == 'weekly' else 14)
+        current = start
+        while current + length - timedelta(days=1) <= end:
+            yield current, current + length - timedelta(days=1)
+            current += length
+
+def _seed_synthetic_business(writer, rng, index, password_hash, start, end):
+    """Generate one business and its year of activity"""
+    days = (end - start).days
+    size = min(max(rng.lognormvariate(0, 0.75), 0.2), 10)
+    
+    def volume(key):
+        return max(1, int(SYNTHETIC_VOLUMES[key] * size * rng.uniform(0.8, 1.2)))
+    
+    def random_day():
+        return start + timedelta(days=rng.randrange(days + 1))
+    
+    # Owner and business
+    owner_id = _synthetic_id(rng)
+    first_name, last_name = rng.choice(SYNTHETIC_FIRST_NAMES), rng.choice(SYNTHETIC_LAST_NAMES)
+    writer.add(User, {
+        'id': owner_id,
+        'email': f'owner{index:06d}@loadtest.example.com',
+        'password_hash': password_hash,
+        'first_name': first_name,
+        'last_name': last_name,
+        'role': 'business_owner',
+        'is_active': True,
+        'is_verified': True,
+        'created_at': _synthetic_time(rng, start)
+    })
+    
+    business_id = _synthetic_id(rng)
+    name = f"{rng.choice(SYNTHETIC_COMPANY_WORDS)} {rng.choice(SYNTHETIC_COMPANY_WORDS)} {index:06d}"
+    writer.add(Business, {
+        'id': business_id,
+        'name': name,
+        'legal_name': f'{name} LLC',
+        'business_type': 'llc',
+        'industry': rng.choice(SYNTHETIC_INDUSTRIES),
+        'country': 'USA',
+        'currency': 'USD',
+        'settings': {},
+        'is_active': True,
+        'subscription_plan': _choice(rng, (('free', 40), ('basic', 30), ('pro', 25), ('enterprise', 5))),
+        'subscription_status': 'active',
+        'owner_id': owner_id,
+        'created_at': _synthetic_time(rng, start)
+    })
+    
+    category_ids = []
+    for category_data in DEFAULT_EXPENSE_CATEGORIES:
+        category_ids.append(_synthetic_id(rng))
+        writer.add(ExpenseCategory, dict(category_data, id=category_ids[-1], is_active=True, business_id=business_id))
+    
+    # Wallets with a running balance and daily checkpoints
+    wallet_ids = []
+    for wallet_data in DEFAULT_WALLETS:
+        wallet_id = _synthetic_id(rng)
+        wallet_ids.append(wallet_id)
+        balance = _money(wallet_data['balance'] * size)
+        times = sorted(_synthetic_time(rng, random_day()) for _ in range(volume('transactions_per_wallet')))
+        closing = {}
+        transactions = []
+        for created_at in times:
+            amount = _money(rng.lognormvariate(5.5, 1.0))
+            transaction_type = 'debit' if amount < balance and rng.random() < 0.55 else 'credit'
+            balance += amount if transaction_type == 'credit' else -amount
+            closing[created_at.date()] = balance
+            transactions.append({
+                'id': _synthetic_id(rng),
+                'transaction_type': transaction_type,
+                'amount': amount,
+                'description': f"{'Deposit' if transaction_type == 'credit' else 'Withdrawal'} #{len(transactions) + 1}",
+                'balance_after': balance,
+                'transaction_metadata': {},
+                'tags': [],
+                'created_at': created_at,
+                'wallet_id': wallet_id
+            })
+        
+        writer.add(Wallet, {
+            'id': wallet_id,
+            'name': wallet_data['name'],
+            'wallet_type': wallet_data['wallet_type'],
+            'currency': wallet_data['currency'],
+            'balance': balance,
+            'is_active': True,
+            'settings': {},
+            'business_id': business_id,
+            'created_at': _synthetic_time(rng, start)
+        })
+        for transaction in transactions:
+            writer.add(Transaction, transaction)
+        for day, day_balance in closing.items():
+            writer.add(BalanceCheckpoint, {
+                'id': _synthetic_id(rng),
+                'wallet_id': wallet_id,
+                'day': day,
+                'balance': day_balance,
+                'created_at': datetime.combine(day, datetime.max.time()),
+                'updated_at': datetime.combine(day, datetime.max.time())
+            })
+    
+    # Invoices with items
+    for number in range(1, volume('invoices') + 1):
+        invoice_id = _synthetic_id(rng)
+        issue_date = random_day()
+        status = _choice(rng, SYNTHETIC_INVOICE_STATUSES)
+        items = []
+        for _ in range(rng.randint(1, 5)):
+            quantity = Decimal(rng.randint(1, 10))
+            unit_price = _money(rng.lognormvariate(4.5, 0.8))
+            items.append({
+                'id': _synthetic_id(rng),
+                'description': rng.choice(('Consulting hours', 'Software license', 'Support plan', 'Hardware', 'Training')),
+                'quantity': quantity,
+                'unit_price': unit_price,
+                'total': quantity * unit_price,
+                'invoice_id': invoice_id
+            })
+        
+        subtotal = sum((item['total'] for item in items), Decimal('0'))
+        paid = status == 'paid'
+        writer.add(Invoice, {
+            'id': invoice_id,
+            'invoice_number': f'INV-{index:06d}-{number:05d}',
+            'status': status,
+            'client_name': f"{rng.choice(SYNTHETIC_COMPANY_WORDS)} {rng.choice(('Corp', 'Labs', 'Group', 'Partners'))}",
+            'issue_date': issue_date,
+            'due_date': issue_date + timedelta(days=30),
+            'payment_terms': 'Net 30',
+            'subtotal': subtotal,
+            'tax_amount': Decimal('0'),
+            'discount_amount': Decimal('0'),
+            'total_amount': subtotal,
+            'currency': 'USD',
+            'paid_amount': subtotal if paid else Decimal('0'),
+            'paid_date': _synthetic_time(rng, min(issue_date + timedelta(days=rng.randint(1, 45)), end)) if paid else None,
+            'payment_method': 'bank_transfer' if paid else None,
+            'business_id': business_id,
+            'created_at': _synthetic_time(rng, issue_date)
+        })
+        for item in items:
+            writer.add(InvoiceItem, item)
+    
+    # Expenses
+    for _ in range(volume('expenses')):
+        expense_date = random_day()
+        status = _choice(rng, SYNTHETIC_EXPENSE_STATUSES)
+        reviewed = status != 'pending'
+        writer.add(Expense, {
+            'id': _synthetic_id(rng),
+            'description': f'{rng.choice(SYNTHETIC_VENDORS)} purchase',
+            'amount': _money(rng.lognormvariate(4.2, 1.1)),
+            'currency': 'USD',
+            'date': expense_date,
+            'payment_method': rng.choice(('card', 'bank_transfer', 'cash')),
+            'vendor': rng.choice(SYNTHETIC_VENDORS),
+            'status': status,
+            'approved_by': owner_id if reviewed else None,
+            'approved_at': _synthetic_time(rng, expense_date) if reviewed else None,
+            'tags': [],
+            'business_id': business_id,
+            'category_id': rng.choice(category_ids),
+            'created_by': owner_id,
+            'created_at': _synthetic_time(rng, expense_date)
+        })
+    
+    # Payments
+    for number in range(1, volume('payments') + 1):
+        created_at = _synthetic_time(rng, random_day())
+        status = _choice(rng, SYNTHETIC_PAYMENT_STATUSES)
+        payment_type = 'incoming' if rng.random() < 0.6 else 'outgoing'
+        writer.add(Payment, {
+            'id': _synthetic_id(rng),
+            'payment_type': payment_type,
+            'amount': _money(rng.lognormvariate(6.0, 1.0)),
+            'currency': 'USD',
+            'status': status,
+            'payment_method': rng.choice(('stripe', 'bank_transfer', 'cash')),
+            'payer_name': f'{rng.choice(SYNTHETIC_COMPANY_WORDS)} Corp' if payment_type == 'incoming' else name,
+            'payee_name': name if payment_type == 'incoming' else rng.choice(SYNTHETIC_VENDORS),
+            'description': f'Payment {number}',
+            'reference': f'PAY-{index:06d}-{number:05d}',
+            'processed_at': created_at + timedelta(hours=rng.randint(1, 48)) if status != 'pending' else None,
+            'failure_reason': 'Card declined' if status == 'failed' else None,
+            'payment_metadata': {},
+            'business_id': business_id,
+            'wallet_id': wallet_ids[0],
+            'created_at': created_at
+        })
+    
+    # Employees and their payroll history
+    employees = []
+    for number in range(1, volume('employees') + 1):
+        salaried = rng.random() < 0.7
+        employee = SimpleNamespace(
+            id=_synthetic_id(rng),
+            hire_date=start - timedelta(days=rng.randrange(0, 3 * 365)) if rng.random() < 0.8 else random_day(),
+            pay_frequency=_choice(rng, SYNTHETIC_PAY_FREQUENCIES),
+            salary=_money(rng.lognormvariate(11.1, 0.35)) if salaried else None,
+            hourly_rate=None if salaried else _money(rng.uniform(18, 60)),
+            tax_withholding=Decimal(str(round(rng.uniform(0.1, 0.3), 4)))
+        )
+        employees.append(employee)
+        writer.add(Employee, {
+            'id': employee.id,
+            'employee_id': f'EMP-{index:06d}-{number:04d}',
+            'first_name': rng.choice(SYNTHETIC_FIRST_NAMES),
+            'last_name': rng.choice(SYNTHETIC_LAST_NAMES),
+            'position': 'Staff',
+            'department': rng.choice(SYNTHETIC_DEPARTMENTS),
+            'hire_date': employee.hire_date,
+            'employment_status': 'active',
+            'salary': employee.salary,
+            'hourly_rate': employee.hourly_rate,
+            'pay_frequency': employee.pay_frequency,
+            'currency': 'USD',
+            'tax_withholding': employee.tax_withholding,
+            'business_id': business_id,
+            'created_at': _synthetic_time(rng, min(employee.hire_date, end))
+        })
+    
+    for frequency, _ in SYNTHETIC_PAY_FREQUENCIES:
+        paid_employees = [employee for employee in employees if employee.pay_frequency == frequency]
+        if not paid_employees:
+            continue
+        for period_start, period_end in _pay_periods(frequency, start, end):
+            eligible = [employee for employee in paid_employees if employee.hire_date <= period_end]
+            amounts = Payroll.calculate_run(
+                eligible, frequency, social_security_rate='0.062', medicare_rate='0.0145'
+            )
+            paid_at = _synthetic_time(rng, period_end)
+            for employee_amounts in amounts:
+                writer.add(Payroll, dict(
+                    employee_amounts,
+                    id=_synthetic_id(rng),
+                    payroll_period=frequency,
+                    start_date=period_start,
+                    end_date=period_end,
+                    currency='USD',
+                    status='paid',
+                    payment_method='bank_transfer',
+                    payment_date=paid_at,
+                    payroll_metadata={},
+                    business_id=business_id,
+                    created_at=paid_at
+                ))
+
+def seed_scale(scale, seed=42, batch_size=5000, end=SYNTHETIC_END_DATE):
+    """
+    Generate ``scale`` synthetic businesses with a year of activity each.
+    
+    Everything is drawn from one RNG seeded with ``seed`` (ids included), so
+    the same scale and seed always produce the same dataset. Rows are
+    written with executemany batches of ``batch_size`` and committed per
+    batch, keeping memory flat for million-row datasets. Intended for an
+    otherwise empty database. Returns the row count per table.
+    """
+    rng = random.Random(seed)
+    start = end - timedelta(days=SYNTHETIC_HISTORY_DAYS - 1)
+    password_hash = password_hasher.hash('loadtest123456')
+    
+    writer = _BulkWriter(batch_size)
+    for index in range(1, scale + 1):
+        _seed_synthetic_business(writer, rng, index, password_hash, start, end)
+    writer.flush()
+    
+    print(f"✅ Generated {scale} synthetic businesses (seed {seed})")
+    for table, count in writer.counts.items():
+        print(f"   {table}: {count}")
+    print(f"📧 Owners: owner000001@loadtest.example.com ... / loadtest123456")
+    return writer.counts
+
 def clear_database():
     """Clear all data from the database"""
     try:
@@ -0,0 +1,134 @@
+import threading
+import time
+from collections import OrderedDict
+
+from flask import g
+from flask_jwt_extended import get_jwt_identity
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session, make_transient_to_detached
+
+from app import db
+from app.models.business import Business
+from app.utils.validators import parse_uuid
+
+class TenantCache:
+    """Bounded in-process TTL cache of Business snapshots keyed by owner id
+    
+    Every worker process holds its own cache and ``invalidate`` only reaches
+    that process, so the TTL bounds how stale other workers can be.
+    """
+    
+    def __init__(self, max_size=1024, ttl=30):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def init_app(self, app):
+        """Read cache limits from the application config"""
+        self.max_size = app.config.get('TENANT_CACHE_MAX_SIZE', self.max_size)
+        self.ttl = app.config.get('TENANT_CACHE_TTL', self.ttl)
+        self.clear()
+    
+    def get(self, key):
+        """Return the cached snapshot for key, or None if missing or expired"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            
+            expires_at, snapshot = entry
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                return None
+            
+            self._entries.move_to_end(key)
+            return snapshot
+    
+    def set(self, key, snapshot):
+        """Store a snapshot, evicting the least recently used entry when full"""
+        if self.ttl <= 0 or self.max_size <= 0:
+            return
+        
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, snapshot)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+    
+    def invalidate(self, key):
+        """Drop the cached snapshot for key"""
+        with self._lock:
+            self._entries.pop(key, None)
+    
+    def clear(self):
+        """Drop every cached snapshot"""
+        with self._lock:
+            self._entries.clear()
+
+tenant_cache = TenantCache()
+
+def _snapshot(business):
+    """Build a detached copy of a business holding only its column values"""
+    columns = inspect(Business).column_attrs
+    snapshot = Business(**{attr.key: getattr(business, attr.key) for attr in columns})
+    make_transient_to_detached(snapshot)
+    return snapshot
+
+def get_current_business():
+    """
+    Resolve the current user's business once per request.
+    
+    Lookups are served from the tenant cache when possible; cached snapshots
+    are merged into the request session without emitting a SELECT. Commits
+    that change a business evict it here; other worker processes see the
+    change once their entry expires.
+    """
+    if 'current_business' in g:
+        return g.current_business
+    
+    current_user_id = parse_uuid(get_jwt_identity())
+    if current_user_id is None:
+        g.current_business = None
+        return None
+    
+    snapshot = tenant_cache.get(str(current_user_id))
+    if snapshot is not None:
+        business = db.session.merge(snapshot, load=False)
+    else:
+        business = Business.query.filter_by(owner_id=current_user_id).first()
+        if business is not None:
+            tenant_cache.set(str(current_user_id), _snapshot(business))
+    
+    g.current_business = business
+    return business
+
+def _pending_owner_ids(session):
+    return session.info.setdefault('tenant_cache_evictions', set())
+
+@event.listens_for(Business, 'after_update')
+@event.listens_for(Business, 'after_delete')
+def _track_business_change(mapper, connection, target):
+    """Remember which owners' cached businesses a flush has changed"""
+    state = inspect(target)
+    if state.session is None:
+        return
+    
+    owner_ids = _pending_owner_ids(state.session)
+    owner_ids.add(str(target.owner_id))
+    for previous_owner_id in state.attrs.owner_id.history.deleted or ():
+        owner_ids.add(str(previous_owner_id))
+
+@event.listens_for(Session, 'after_commit')
+def _evict_committed_businesses(session):
+    """Evict cached businesses once their changes are committed"""
+    owner_ids = session.info.pop('tenant_cache_evictions', None)
+    if not owner_ids:
+        return
+    
+    for owner_id in owner_ids:
+        tenant_cache.invalidate(owner_id)
+
+@event.listens_for(Session, 'after_rollback')
+def _discard_pending_evictions(session):
+    session.info.pop('tenant_cache_evictions', None)
@@ -1,5 +1,7 @@
 import re
 from datetime import datetime
+from decimal import Decimal, InvalidOperation
+import uuid
 
 def validate_email(email):
     """Validate email format"""
@@ -40,6 +42,22 @@ def validate_uuid(uuid_string):
     pattern = r'^[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}$'
     return re.match(pattern, uuid_string.lower()) is not None
 
+def parse_uuid(value):
+    """Parse an id given as a string into a UUID, or return None if it is not one
+    
+    Ids from JSON bodies, query strings and token identities must be bound
+    as UUID objects, since not every driver accepts strings for UUID columns.
+    """
+    if isinstance(value, uuid.UUID):
+        return value
+    if not isinstance(value, str):
+        return None
+    
+    try:
+        return uuid.UUID(value)
+    except ValueError:
+        return None
+
 def validate_date(date_string):
     """Validate date format (YYYY-MM-DD)"""
     if not date_string:
@@ -73,6 +91,34 @@ def validate_amount(amount):
     except (ValueError, TypeError):
         return False
 
+def parse_amount(amount, max_digits=10, places=2):
+    """Parse a non-negative monetary amount that fits a Numeric(max_digits, places) column
+    
+    Returns the amount as a Decimal, or None when it is missing, not a number
+    (booleans included), not finite, negative or too large once rounded.
+    """
+    if isinstance(amount, bool) or not isinstance(amount, (int, float, str, Decimal)):
+        return None
+    
+    try:
+        value = Decimal(str(amount).strip())
+    except InvalidOperation:
+        return None
+    
+    limit = Decimal(10) ** (max_digits - places)
+    if not value.is_finite() or value < 0:
+        return None
+    if value >= limit or value.quantize(Decimal(1).scaleb(-places)) >= limit:
+        return None
+    return value
+
+def validate_length(value, max_length):
+    """Validate that an optional string fits a column of max_length characters"""
+    if value is None:
+        return True
+    
+    return isinstance(value, str) and len(value) <= max_length
+
 def validate_currency(currency):
     """Validate currency code (3-letter ISO)"""
     if not currency:
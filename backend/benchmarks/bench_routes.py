@@ -0,0 +1,561 @@
+#!/usr/bin/env python3
+"""
+Route-level benchmarks for every API blueprint.
+
+Boots ``create_app('testing')`` against a freshly seeded database for each
+data size, drives list, detail, create and state-transition endpoints
+through the Flask test client and records latency percentiles, SQL queries
+per request and allocations per request to a JSON results file.
+
+Usage (from the backend directory):
+    python benchmarks/bench_routes.py run --scales 1,10,50
+    python benchmarks/bench_routes.py run --database-url postgresql://localhost/smb_finance_os_bench
+    python benchmarks/bench_routes.py compare benchmarks/results/<old>.json benchmarks/results/<new>.json
+
+Every database benchmarked is dropped and recreated, so only point
+``--database-url`` at a throwaway database.
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+import uuid
+from collections import namedtuple
+from datetime import date, datetime, timedelta
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BACKEND_DIR))
+
+# Local Postgres benchmarked alongside SQLite when it accepts connections
+DEFAULT_POSTGRES_URL = os.getenv('DATABASE_BENCH_URL', 'postgresql://localhost/smb_finance_os_bench')
+
+# Synthetic businesses generated per run
+DEFAULT_SCALES = '1,10'
+
+# Owner whose business every tenant-scoped request runs as
+BENCH_OWNER_EMAIL = 'owner000001@loadtest.example.com'
+
+RESULTS_DIR = BACKEND_DIR / 'benchmarks' / 'results'
+
+# One benchmarked request. ``path`` and ``body`` are formatted with the run's
+# fixture ids; ``prepare`` creates per-iteration records (untimed) and
+# returns extra path parameters; ``admin`` sends the admin token instead.
+Case = namedtuple('Case', ['name', 'method', 'path', 'body', 'prepare', 'admin'], defaults=(None, None, False))
+
+def _today():
+    return date.today().isoformat()
+
+def _create(client, headers, path, body):
+    """Create a record through the API, returning its id"""
+    response = client.post(path, headers=headers, json=body)
+    if response.status_code != 201:
+        raise RuntimeError(f'POST {path} returned {response.status_code}: {response.get_data(as_text=True)[:200]}')
+    return response.get_json()['data']['id']
+
+def _invoice_body(iteration=0):
+    return {
+        'client_name': f'Benchmark Client {iteration}',
+        'issue_date': _today(),
+        'due_date': (date.today() + timedelta(days=30)).isoformat(),
+        'items': [
+            {'description': 'Consulting', 'quantity': 2, 'unit_price': 150},
+            {'description': 'Support', 'quantity': 1, 'unit_price': 75}
+        ]
+    }
+
+def _payment_body(iteration=0):
+    return {'payment_type': 'incoming', 'amount': 125.5, 'description': f'Benchmark payment {iteration}'}
+
+def _tax_record_body(iteration=0):
+    return {'tax_type': 'sales_tax', 'tax_rate': 8.25, 'taxable_amount': 1000 + iteration}
+
+def _new_invoice(client, headers, fixtures):
+    return {'invoice_id': _create(client, headers, '/api/v1/invoices/', _invoice_body())}
+
+def _new_payment(client, headers, fixtures):
+    return {'payment_id': _create(client, headers, '/api/v1/payments/', _payment_body())}
+
+def _new_payments(client, headers, fixtures):
+    return {'payment_ids': [_create(client, headers, '/api/v1/payments/', _payment_body()) for _ in range(10)]}
+
+def _new_payroll(client, headers, fixtures):
+    return {'payroll_id': _create(client, headers, '/api/v1/payroll/payrolls', {
+        'employee_id': fixtures['employee_id'],
+        'payroll_period': 'monthly',
+        'start_date': date.today().replace(day=1).isoformat(),
+        'end_date': _today(),
+        'regular_hours': 160
+    })}
+
+def _new_tax_record(client, headers, fixtures):
+    return {'record_id': _create(client, headers, '/api/v1/tax/records', _tax_record_body())}
+
+def _filed_tax_record(client, headers, fixtures):
+    params = _new_tax_record(client, headers, fixtures)
+    client.post(f"/api/v1/tax/records/{params['record_id']}/file", headers=headers, json={})
+    return params
+
+CASES = [
+    # Auth, users and businesses
+    Case('auth.profile', 'GET', '/api/v1/auth/profile'),
+    Case('users.list', 'GET', '/api/v1/users/?per_page=20', admin=True),
+    Case('users.detail', 'GET', '/api/v1/users/{user_id}'),
+    Case('users.stats', 'GET', '/api/v1/users/stats', admin=True),
+    Case('businesses.list', 'GET', '/api/v1/businesses/?per_page=20', admin=True),
+    Case('businesses.mine', 'GET', '/api/v1/businesses/my-business'),
+    Case('businesses.detail', 'GET', '/api/v1/businesses/{business_id}'),
+    Case('businesses.stats', 'GET', '/api/v1/businesses/stats', admin=True),
+    
+    # Dashboard
+    Case('dashboard.get', 'GET', '/api/v1/dashboard?month={month}'),
+    
+    # Invoices
+    Case('invoices.list', 'GET', '/api/v1/invoices/?per_page=20'),
+    Case('invoices.list_filtered', 'GET', '/api/v1/invoices/?status=paid&per_page=20'),
+    Case('invoices.detail', 'GET', '/api/v1/invoices/{invoice_id}'),
+    Case('invoices.create', 'POST', '/api/v1/invoices/', _invoice_body),
+    Case('invoices.bulk_create', 'POST', '/api/v1/invoices/bulk',
+         lambda iteration: {'invoices': [_invoice_body(iteration) for _ in range(10)]}),
+    Case('invoices.mark_paid', 'POST', '/api/v1/invoices/{invoice_id}/mark-paid',
+         lambda iteration: {'payment_method': 'bank_transfer'}, _new_invoice),
+    
+    # Expenses
+    Case('expenses.list', 'GET', '/api/v1/expenses/?per_page=20'),
+    Case('expenses.list_filtered', 'GET', '/api/v1/expenses/?status=approved&category_id={category_id}&per_page=20'),
+    Case('expenses.detail', 'GET', '/api/v1/expenses/{expense_id}'),
+    Case('expenses.categories', 'GET', '/api/v1/expenses/categories'),
+    Case('expenses.export_csv', 'GET', '/api/v1/expenses/export.csv'),
+    Case('expenses.create', 'POST', '/api/v1/expenses/',
+         lambda iteration: {'description': f'Benchmark expense {iteration}', 'amount': 42.5,
+                            'date': _today(), 'category_id': '{category_id}'}),
+    
+    # Wallets
+    Case('wallet.list', 'GET', '/api/v1/wallet/'),
+    Case('wallet.detail', 'GET', '/api/v1/wallet/{wallet_id}'),
+    Case('wallet.transactions', 'GET', '/api/v1/wallet/{wallet_id}/transactions?per_page=20'),
+    Case('wallet.transactions_deep_page', 'GET', '/api/v1/wallet/{wallet_id}/transactions?page=20&per_page=20'),
+    Case('wallet.transactions_export', 'GET', '/api/v1/wallet/{wallet_id}/transactions/export'),
+    Case('wallet.balance_at', 'GET', '/api/v1/wallet/{wallet_id}/balance?at={balance_at}'),
+    Case('wallet.add_funds', 'POST', '/api/v1/wallet/{wallet_id}/add-funds',
+         lambda iteration: {'amount': 10, 'description': f'Benchmark deposit {iteration}'}),
+    Case('wallet.transfer', 'POST', '/api/v1/wallet/{wallet_id}/transfer',
+         lambda iteration: {'to_wallet_id': '{other_wallet_id}', 'amount': 1, 'description': f'Benchmark transfer {iteration}'}),
+    
+    # Payments
+    Case('payments.list', 'GET', '/api/v1/payments/?per_page=20'),
+    Case('payments.list_filtered', 'GET', '/api/v1/payments/?status=completed&payment_type=incoming&per_page=20'),
+    Case('payments.detail', 'GET', '/api/v1/payments/{payment_id}'),
+    Case('payments.create', 'POST', '/api/v1/payments/', _payment_body),
+    Case('payments.process', 'POST', '/api/v1/payments/{payment_id}/process', None, _new_payment),
+    Case('payments.fail', 'POST', '/api/v1/payments/{payment_id}/fail',
+         lambda iteration: {'reason': 'Card declined'}, _new_payment),
+    Case('payments.bulk_process', 'POST', '/api/v1/payments/bulk/status',
+         lambda iteration: {'action': 'process', 'payment_ids': '{payment_ids}'}, _new_payments),
+    
+    # Tax
+    Case('tax.records', 'GET', '/api/v1/tax/records?per_page=20'),
+    Case('tax.periods', 'GET', '/api/v1/tax/periods'),
+    Case('tax.create', 'POST', '/api/v1/tax/records', _tax_record_body),
+    Case('tax.file', 'POST', '/api/v1/tax/records/{record_id}/file', lambda iteration: {}, _new_tax_record),
+    Case('tax.pay', 'POST', '/api/v1/tax/records/{record_id}/pay', lambda iteration: {}, _filed_tax_record),
+    
+    # Credit
+    Case('credit.profile', 'GET', '/api/v1/credit/profile'),
+    Case('credit.scores', 'GET', '/api/v1/credit/scores'),
+    Case('credit.lending_readiness', 'GET', '/api/v1/credit/lending-readiness'),
+    Case('credit.assess', 'POST', '/api/v1/credit/profile/assess',
+         lambda iteration: {'payment_history_score': 80 + iteration % 10}),
+    
+    # Payroll
+    Case('payroll.employees', 'GET', '/api/v1/payroll/employees?per_page=20'),
+    Case('payroll.employee_detail', 'GET', '/api/v1/payroll/employees/{employee_id}'),
+    Case('payroll.payrolls', 'GET', '/api/v1/payroll/payrolls?per_page=20'),
+    Case('payroll.payroll_detail', 'GET', '/api/v1/payroll/payrolls/{payroll_id}'),
+    Case('payroll.employee_create', 'POST', '/api/v1/payroll/employees',
+         lambda iteration: {'employee_id': f'BENCH-{uuid.uuid4().hex[:12]}', 'first_name': 'Bench',
+                            'last_name': f'Mark{iteration}', 'hire_date': _today(), 'salary': 60000}),
+    Case('payroll.process', 'POST', '/api/v1/payroll/payrolls/{payroll_id}/process', None, _new_payroll),
+    
+    # Mock data
+    Case('mockdata.combined', 'GET', '/api/mockdata'),
+    Case('mockdata.invoices', 'GET', '/api/mockdata/invoices')
+]
+
+def _fill(value, params):
+    """Substitute ``{name}`` placeholders in a body, keeping non-string values as they are"""
+    if isinstance(value, dict):
+        return {key: _fill(item, params) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_fill(item, params) for item in value]
+    if isinstance(value, str) and value.startswith('{') and value.endswith('}') and value[1:-1] in params:
+        return params[value[1:-1]]
+    if isinstance(value, str):
+        return value.format(**params)
+    return value
+
+def _percentile(samples, percent):
+    """Linearly interpolated percentile of a sorted list"""
+    if len(samples) == 1:
+        return samples[0]
+    position = (len(samples) - 1) * percent / 100
+    lower = int(position)
+    upper = min(lower + 1, len(samples) - 1)
+    return samples[lower] + (samples[upper] - samples[lower]) * (position - lower)
+
+def _latency_summary(samples):
+    samples = sorted(samples)
+    return {
+        'min': round(samples[0], 3),
+        'mean': round(statistics.fmean(samples), 3),
+        'p50': round(_percentile(samples, 50), 3),
+        'p90': round(_percentile(samples, 90), 3),
+        'p95': round(_percentile(samples, 95), 3),
+        'p99': round(_percentile(samples, 99), 3),
+        'max': round(samples[-1], 3)
+    }
+
+class QueryCounter:
+    """Count SQL statements sent through an engine"""
+    
+    def __init__(self, engine):
+        from sqlalchemy import event
+        self.count = 0
+        event.listen(engine, 'before_cursor_execute', self._increment)
+    
+    def _increment(self, *args):
+        self.count += 1
+
+def _database_available(url):
+    """Check that a database accepts connections"""
+    from sqlalchemy import create_engine
+    
+    try:
+        engine = create_engine(url)
+        with engine.connect():
+            pass
+        engine.dispose()
+        return True
+    except Exception as e:
+        print(f'⏭️  Skipping {url.split("@")[-1]}: {str(e).splitlines()[0]}')
+        return False
+
+def _build_app(database_url):
+    """Create the testing app bound to the benchmark database"""
+    from config.testing import TestingConfig
+    
+    TestingConfig.SQLALCHEMY_DATABASE_URI = database_url
+    from app import create_app, limiter
+    
+    app = create_app('testing')
+    limiter.enabled = False  # Benchmarks send far more than the per-hour limit
+    return app
+
+def _seed(scale, seed, batch_size):
+    """Recreate the schema and generate the dataset, returning the row count per table"""
+    from app import db
+    from app.utils.seed import seed_scale, seed_database
+    from app.utils.tenant import tenant_cache
+    
+    db.drop_all()
+    db.create_all()
+    with contextlib.redirect_stdout(io.StringIO()):
+        counts = seed_scale(scale, seed=seed, batch_size=batch_size)
+        seed_database()  # Adds the admin user
+    tenant_cache.clear()
+    return counts
+
+def _fixtures():
+    """Look up the benchmark owner's records and mint access tokens"""
+    from flask_jwt_extended import create_access_token
+    from app.models import User, Business, Invoice, Expense, ExpenseCategory, Wallet, Payment, Employee, Payroll
+    
+    owner = User.query.filter_by(email=BENCH_OWNER_EMAIL).one()
+    admin = User.query.filter_by(role='admin').first()
+    business = Business.query.filter_by(owner_id=owner.id).one()
+    
+    def latest(model):
+        return model.query.filter_by(business_id=business.id).order_by(model.created_at.desc()).first()
+    
+    wallets = Wallet.query.filter_by(business_id=business.id, currency=business.currency).order_by(Wallet.created_at).all()
+    fixtures = {
+        'user_id': str(owner.id),
+        'business_id': str(business.id),
+        'invoice_id': str(latest(Invoice).id),
+        'expense_id': str(latest(Expense).id),
+        'category_id': str(ExpenseCategory.query.filter_by(business_id=business.id).order_by(ExpenseCategory.name).first().id),
+        'wallet_id': str(wallets[0].id),
+        'other_wallet_id': str(wallets[-1].id),
+        'payment_id': str(latest(Payment).id),
+        'employee_id': str(latest(Employee).id),
+        'payroll_id': str(latest(Payroll).id),
+        'month': datetime.utcnow().strftime('%Y-%m'),
+        'balance_at': (date.today() - timedelta(days=180)).isoformat()
+    }
+    owner_headers = {'Authorization': f'Bearer {create_access_token(identity=fixtures["user_id"])}'}
+    admin_headers = {'Authorization': f'Bearer {create_access_token(identity=str(admin.id))}'}
+    return fixtures, owner_headers, admin_headers
+
+def _run_case(case, client, fixtures, headers, counter, iterations, warmup, alloc_iterations):
+    """Time one case, returning its result entry"""
+    latencies, queries, peaks, retained, statuses = [], [], [], [], {}
+    
+    def request(iteration, measure_allocations=False):
+        params = dict(fixtures)
+        if case.prepare:
+            params.update(case.prepare(client, headers, fixtures))
+        path = case.path.format(**params)
+        body = _fill(case.body(iteration), params) if case.body else None
+        
+        if measure_allocations:
+            tracemalloc.reset_peak()
+            before = tracemalloc.get_traced_memory()[0]
+        counter.count = 0
+        started = time.perf_counter()
+        response = client.open(path, method=case.method, headers=headers, json=body)
+        response.get_data()  # Drain streamed bodies
+        elapsed = (time.perf_counter() - started) * 1000
+        query_count = counter.count
+        if measure_allocations:
+            current, peak = tracemalloc.get_traced_memory()
+            peaks.append((peak - before) / 1024)
+            retained.append((current - before) / 1024)
+        response.close()
+        return response.status_code, elapsed, query_count
+    
+    for iteration in range(warmup):
+        request(iteration)
+    
+    for iteration in range(iterations):
+        status, elapsed, query_count = request(warmup + iteration)
+        latencies.append(elapsed)
+        queries.append(query_count)
+        statuses[str(status)] = statuses.get(str(status), 0) + 1
+    
+    # Allocations are traced in a separate pass so tracing overhead stays out of the latencies
+    tracemalloc.start()
+    try:
+        for iteration in range(alloc_iterations):
+            request(warmup + iterations + iteration, measure_allocations=True)
+    finally:
+        tracemalloc.stop()
+    
+    return {
+        'case': case.name,
+        'method': case.method,
+        'path': case.path,
+        'iterations': iterations,
+        'statuses': statuses,
+        'ok': all(int(status) < 400 for status in statuses),
+        'latency_ms': _latency_summary(latencies),
+        'queries': {'mean': round(statistics.fmean(queries), 2), 'max': max(queries)},
+        'alloc_kib': {
+            'peak': round(statistics.median(peaks), 1) if peaks else None,
+            'retained': round(statistics.median(retained), 1) if retained else None
+        }
+    }
+
+def _benchmark_database(label, url, args, cases):
+    """Seed the database at each scale and run every case, returning result entries"""
+    from app import db
+    
+    app = _build_app(url)
+    results = []
+    
+    with app.app_context():
+        counter = QueryCounter(db.engine)
+    client = app.test_client()
+    
+    for scale in args.scales:
+        started = time.perf_counter()
+        with app.app_context():
+            counts = _seed(scale, args.seed, args.batch_size)
+            fixtures, owner_headers, admin_headers = _fixtures()
+        print(f'🌱 {label}: scale {scale} seeded {sum(counts.values())} rows in {time.perf_counter() - started:.1f}s')
+        
+        # Requests run outside any app context, so each gets its own session as in production
+        response = client.post('/api/v1/credit/profile', headers=owner_headers, json={
+            'annual_revenue': 750000, 'monthly_cash_flow': 25000, 'business_age_months': 36
+        })
+        if response.status_code != 201:
+            raise RuntimeError(f'Could not create credit profile: {response.status_code}')
+        
+        for case in cases:
+            headers = admin_headers if case.admin else owner_headers
+            result = _run_case(case, client, fixtures, headers, counter,
+                               args.iterations, args.warmup, args.alloc_iterations)
+            result.update({'database': label, 'scale': scale, 'rows': sum(counts.values())})
+            results.append(result)
+            
+            latency = result['latency_ms']
+            flag = '' if result['ok'] else f"  ⚠️  statuses {result['statuses']}"
+            print(f"   {case.name:<34} p50 {latency['p50']:>8.2f}ms  p95 {latency['p95']:>8.2f}ms  "
+                  f"queries {result['queries']['mean']:>6.1f}  peak {result['alloc_kib']['peak']:>8.1f}KiB{flag}")
+    
+    with app.app_context():
+        db.drop_all()
+    return results
+
+def _git(*args):
+    try:
+        return subprocess.run(['git', *args], cwd=BACKEND_DIR, capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def _environment():
+    import flask
+    import sqlalchemy
+    
+    status = _git('status', '--porcelain', '--untracked-files=no')
+    return {
+        'commit': _git('rev-parse', 'HEAD'),
+        'dirty': bool(status) if status is not None else None,
+        'timestamp': datetime.utcnow().isoformat() + 'Z',
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'flask': flask.__version__ if hasattr(flask, '__version__') else None,
+        'sqlalchemy': sqlalchemy.__version__
+    }
+
+def run(args):
+    """Run the benchmarks and write the results file"""
+    import warnings
+    warnings.filterwarnings('ignore')  # Legacy Query.get() calls warn on every request
+    
+    cases = [case for case in CASES if not args.only or any(case.name.startswith(prefix) for prefix in args.only)]
+    if not cases:
+        print('❌ No cases match --only')
+        return 2
+    
+    databases = []
+    with tempfile.TemporaryDirectory() as directory:
+        if not args.database_url:
+            databases.append(('sqlite', f'sqlite:///{directory}/bench.db'))
+            if not args.skip_postgres and _database_available(DEFAULT_POSTGRES_URL):
+                databases.append(('postgresql', DEFAULT_POSTGRES_URL))
+        for url in args.database_url or []:
+            if _database_available(url):
+                databases.append((url.split(':')[0].split('+')[0], url))
+        
+        results = []
+        for label, url in databases:
+            results.extend(_benchmark_database(label, url, args, cases))
+    
+    environment = _environment()
+    output = Path(args.output) if args.output else RESULTS_DIR / f"{(environment['commit'] or 'unknown')[:12]}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    with open(output, 'w') as f:
+        json.dump({
+            'environment': environment,
+            'settings': {
+                'scales': args.scales,
+                'seed': args.seed,
+                'iterations': args.iterations,
+                'warmup': args.warmup,
+                'alloc_iterations': args.alloc_iterations
+            },
+            'results': results
+        }, f, indent=2)
+    
+    print(f'📄 Results written to {output}')
+    failures = [result for result in results if not result['ok']]
+    if failures:
+        print(f"⚠️  {len(failures)} cases returned errors: {', '.join(sorted({result['case'] for result in failures}))}")
+    return 0
+
+def compare(args):
+    """Compare two results files, exiting non-zero when a case regressed"""
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    with open(args.current) as f:
+        current = json.load(f)
+    
+    def key(result):
+        return result['database'], result['scale'], result['case']
+    
+    previous = {key(result): result for result in baseline['results']}
+    regressions = []
+    print(f"Baseline {(baseline['environment'].get('commit') or 'unknown')[:12]}  →  "
+          f"current {(current['environment'].get('commit') or 'unknown')[:12]}")
+    print(f"{'database':<11}{'scale':>6}  {'case':<34}{'p50 ms':>18}{'p95 ms':>18}{'queries':>14}")
+    
+    for result in current['results']:
+        old = previous.pop(key(result), None)
+        if old is None:
+            print(f"{result['database']:<11}{result['scale']:>6}  {result['case']:<34}  (new)")
+            continue
+        
+        p50_ratio = result['latency_ms']['p50'] / max(old['latency_ms']['p50'], 1e-6)
+        p95_ratio = result['latency_ms']['p95'] / max(old['latency_ms']['p95'], 1e-6)
+        query_delta = result['queries']['mean'] - old['queries']['mean']
+        
+        reasons = []
+        if p50_ratio > 1 + args.threshold:
+            reasons.append(f'p50 +{(p50_ratio - 1) * 100:.0f}%')
+        if p95_ratio > 1 + args.threshold:
+            reasons.append(f'p95 +{(p95_ratio - 1) * 100:.0f}%')
+        if query_delta >= args.query_threshold:
+            reasons.append(f'+{query_delta:g} queries')
+        if old['ok'] and not result['ok']:
+            reasons.append(f"statuses {result['statuses']}")
+        if reasons:
+            regressions.append((key(result), reasons))
+        
+        print(f"{result['database']:<11}{result['scale']:>6}  {result['case']:<34}"
+              f"{old['latency_ms']['p50']:>8.2f}→{result['latency_ms']['p50']:<8.2f}"
+              f"{old['latency_ms']['p95']:>9.2f}→{result['latency_ms']['p95']:<8.2f}"
+              f"{old['queries']['mean']:>6g}→{result['queries']['mean']:<6g}"
+              f"{'  ❌ ' + ', '.join(reasons) if reasons else ''}")
+    
+    for (database, scale, case) in previous:
+        print(f'{database:<11}{scale:>6}  {case:<34}  (removed)')
+    
+    if regressions:
+        print(f'❌ {len(regressions)} regressions over the {args.threshold:.0%} latency threshold')
+        return 1
+    print('✅ No regressions')
+    return 0
+
+def _scales(value):
+    return [int(scale) for scale in value.split(',') if scale.strip()]
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmark every API blueprint route')
+    commands = parser.add_subparsers(dest='command', required=True)
+    
+    run_parser = commands.add_parser('run', help='Seed, benchmark and write a results file')
+    run_parser.add_argument('--scales', type=_scales, default=_scales(DEFAULT_SCALES),
+                            help=f'Comma-separated synthetic business counts (default {DEFAULT_SCALES})')
+    run_parser.add_argument('--seed', type=int, default=42, help='Dataset RNG seed')
+    run_parser.add_argument('--batch-size', type=int, default=5000, help='Rows per seeding batch')
+    run_parser.add_argument('--iterations', type=int, default=50, help='Timed requests per case')
+    run_parser.add_argument('--warmup', type=int, default=3, help='Untimed requests per case')
+    run_parser.add_argument('--alloc-iterations', type=int, default=5, help='Allocation-traced requests per case')
+    run_parser.add_argument('--database-url', action='append',
+                            help='Database to benchmark instead of SQLite and local Postgres (repeatable)')
+    run_parser.add_argument('--skip-postgres', action='store_true', help='Only benchmark SQLite')
+    run_parser.add_argument('--only', action='append', help='Only run cases whose name starts with this prefix (repeatable)')
+    run_parser.add_argument('--output', help='Results file (default benchmarks/results/<commit>.json)')
+    
+    compare_parser = commands.add_parser('compare', help='Compare two results files')
+    compare_parser.add_argument('baseline')
+    compare_parser.add_argument('current')
+    compare_parser.add_argument('--threshold', type=float, default=0.25,
+                                help='Relative p50/p95 increase reported as a regression (default 0.25)')
+    compare_parser.add_argument('--query-threshold', type=float, default=1,
+                                help='Increase in mean queries per request reported as a regression (default 1)')
+    
+    args = parser.parse_args(argv)
+    return run(args) if args.command == 'run' else compare(args)
+
+if __name__ == '__main__':
+    sys.exit(main())
\ No newline at end of file
@@ -38,8 +38,51 @@ class DevelopmentConfig:
     RATELIMIT_STORAGE_URL = os.getenv('RATELIMIT_STORAGE_URL', 'memory://')
     RATELIMIT_DEFAULT = os.getenv('RATELIMIT_DEFAULT', '100/hour')
     
+    # Tenant Resolution Cache
+    # Evictions on commit only reach the process that made the change; other
+    # workers serve their cached business until it expires, so keep this short
+    TENANT_CACHE_TTL = int(os.getenv('TENANT_CACHE_TTL', 30))  # seconds
+    TENANT_CACHE_MAX_SIZE = int(os.getenv('TENANT_CACHE_MAX_SIZE', 1024))
+    
+    # Current User Cache
+    # As with the tenant cache, evictions only reach the process that made the
+    # change; other workers see role or is_active changes once this expires
+    USER_CACHE_TTL = int(os.getenv('USER_CACHE_TTL', 30))  # seconds
+    USER_CACHE_MAX_SIZE = int(os.getenv('USER_CACHE_MAX_SIZE', 1024))
+    
+    # Mock Data Store
+    MOCKDATA_CHECK_INTERVAL = float(os.getenv('MOCKDATA_CHECK_INTERVAL', 1.0))  # seconds between file mtime checks
+    
+    # Exports
+    EXPORT_BATCH_SIZE = int(os.getenv('EXPORT_BATCH_SIZE', 1000))  # rows fetched per round trip
+    
+    # Bulk Operations
+    BULK_MAX_ROWS = int(os.getenv('BULK_MAX_ROWS', 1000))  # rows accepted per bulk request
+    IMPORT_BATCH_SIZE = int(os.getenv('IMPORT_BATCH_SIZE', 1000))  # rows inserted per batch
+    
+    # Transaction Archival
+    TRANSACTION_HOT_MONTHS = int(os.getenv('TRANSACTION_HOT_MONTHS', 12))  # closed months kept in the live table
+    
+    # Query Instrumentation
+    QUERY_STATS_HEADERS = os.getenv('QUERY_STATS_HEADERS', 'true').lower() == 'true'  # X-DB-Query-Count / Server-Timing
+    SLOW_REQUEST_THRESHOLD_MS = float(os.getenv('SLOW_REQUEST_THRESHOLD_MS', 500))  # 0 disables
+    SLOW_REQUEST_QUERY_THRESHOLD = int(os.getenv('SLOW_REQUEST_QUERY_THRESHOLD', 25))  # 0 disables
+    SLOW_REQUEST_TOP_STATEMENTS = int(os.getenv('SLOW_REQUEST_TOP_STATEMENTS', 5))  # statements logged per slow request
+    
+    # Metrics
+    METRICS_ENABLED = os.getenv('METRICS_ENABLED', 'true').lower() == 'true'  # Prometheus /metrics endpoint
+    METRICS_ALLOWED_IPS = os.getenv('METRICS_ALLOWED_IPS', '127.0.0.1,::1')  # scraper addresses or networks, comma-separated
+    METRICS_TOKEN = os.getenv('METRICS_TOKEN')  # bearer token accepted from any address
+    
+    # Health Checks
+    HEALTH_DB_TIMEOUT_MS = int(os.getenv('HEALTH_DB_TIMEOUT_MS', 1000))  # readiness ping statement timeout
+    HEALTH_CHECK_MIGRATIONS = os.getenv('HEALTH_CHECK_MIGRATIONS', 'true').lower() == 'true'
+    HEALTH_MIGRATION_CACHE_SECONDS = float(os.getenv('HEALTH_MIGRATION_CACHE_SECONDS', 5))  # between migration head reads
+    
     # Security
     BCRYPT_LOG_ROUNDS = int(os.getenv('BCRYPT_LOG_ROUNDS', 12))
+    PASSWORD_HASH_CONCURRENCY = int(os.getenv('PASSWORD_HASH_CONCURRENCY', 0))  # concurrent bcrypt hashes, 0 = CPU count
+    PASSWORD_HASH_QUEUE_TIMEOUT = float(os.getenv('PASSWORD_HASH_QUEUE_TIMEOUT', 5))  # seconds to wait for a hashing slot
     
     # External Services
     STRIPE_SECRET_KEY = os.getenv('STRIPE_SECRET_KEY', '')
@@ -32,8 +32,47 @@ class TestingConfig:
     RATELIMIT_STORAGE_URL = 'memory://'
     RATELIMIT_DEFAULT = '1000/hour'
     
+    # Tenant Resolution Cache
+    TENANT_CACHE_TTL = 60
+    TENANT_CACHE_MAX_SIZE = 1024
+    
+    # Current User Cache
+    USER_CACHE_TTL = 30
+    USER_CACHE_MAX_SIZE = 1024
+    
+    # Mock Data Store
+    MOCKDATA_CHECK_INTERVAL = 0  # seconds between file mtime checks
+    
+    # Exports
+    EXPORT_BATCH_SIZE = 100  # rows fetched per round trip
+    
+    # Bulk Operations
+    BULK_MAX_ROWS = 1000  # rows accepted per bulk request
+    IMPORT_BATCH_SIZE = 100  # rows inserted per batch
+    
+    # Transaction Archival
+    TRANSACTION_HOT_MONTHS = 12  # closed months kept in the live table
+    
+    # Query Instrumentation
+    QUERY_STATS_HEADERS = True  # X-DB-Query-Count / Server-Timing
+    SLOW_REQUEST_THRESHOLD_MS = 0  # 0 disables
+    SLOW_REQUEST_QUERY_THRESHOLD = 0  # 0 disables
+    SLOW_REQUEST_TOP_STATEMENTS = 5  # statements logged per slow request
+    
+    # Metrics
+    METRICS_ENABLED = True  # Prometheus /metrics endpoint
+    METRICS_ALLOWED_IPS = '127.0.0.1,::1'  # scraper addresses or networks, comma-separated
+    METRICS_TOKEN = None  # bearer token accepted from any address
+    
+    # Health Checks
+    HEALTH_DB_TIMEOUT_MS = 1000  # readiness ping statement timeout
+    HEALTH_CHECK_MIGRATIONS = True
+    HEALTH_MIGRATION_CACHE_SECONDS = 5  # between migration head reads
+    
     # Security
     BCRYPT_LOG_ROUNDS = 4  # Faster for testing
+    PASSWORD_HASH_CONCURRENCY = 2  # concurrent bcrypt hashes
+    PASSWORD_HASH_QUEUE_TIMEOUT = 5  # seconds to wait for a hashing slot
     
     # External Services (mock)
     STRIPE_SECRET_KEY = 'sk_test_mock'
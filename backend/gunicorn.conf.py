@@ -0,0 +1,31 @@
+"""
+Gunicorn configuration for Trident Financial OS
+
+    gunicorn -c gunicorn.conf.py "app:create_app('production')"
+"""
+
+import os
+import shutil
+
+bind = os.getenv('GUNICORN_BIND', '0.0.0.0:5000')
+workers = int(os.getenv('GUNICORN_WORKERS', 4))
+threads = int(os.getenv('GUNICORN_THREADS', 1))
+timeout = int(os.getenv('GUNICORN_TIMEOUT', 30))
+
+# Prometheus metrics are written by every worker to files in this directory
+# and merged on scrape; it must be set before the app (and prometheus_client)
+# is imported in the workers
+metrics_dir = os.environ.setdefault('PROMETHEUS_MULTIPROC_DIR', '/tmp/trident-metrics')
+
+def on_starting(server):
+    """Start from an empty metrics directory so stale worker files are not merged"""
+    shutil.rmtree(metrics_dir, ignore_errors=True)
+    os.makedirs(metrics_dir, exist_ok=True)
+
+def child_exit(server, worker):
+    """Drop a dead worker's live gauges from the merged metrics"""
+    try:
+        from prometheus_client import multiprocess
+    except ImportError:  # pragma: no cover - prometheus_client is optional
+        return
+    multiprocess.mark_process_dead(worker.pid, metrics_dir)
\ No newline at end of file
@@ -4,6 +4,7 @@ Trident Financial OS - Flask Application Entry Point
 """
 
 import os
+import click
 from app import create_app, db
 from app.models import *  # Import all models
 from flask_migrate import upgrade
@@ -37,13 +38,44 @@ def init_db():
         print("Database tables created successfully!")
 
 @app.cli.command()
-def seed_db():
+@click.option('--scale', default=0, help='Generate this many synthetic businesses for load testing')
+@click.option('--seed', 'rng_seed', default=42, help='Random seed for the synthetic dataset')
+@click.option('--batch-size', default=5000, help='Rows inserted per batch')
+def seed_db(scale, rng_seed, batch_size):
     """Seed the database with initial data"""
-    from app.utils.seed import seed_database
+    from app.utils.seed import seed_database, seed_scale
     with app.app_context():
-        seed_database()
+        if scale > 0:
+            seed_scale(scale, seed=rng_seed, batch_size=batch_size)
+        else:
+            seed_database()
         print("Database seeded successfully!")
 
+@app.cli.command()
+def rebuild_checkpoints():
+    """Rebuild daily wallet balance checkpoints from transaction history"""
+    with app.app_context():
+        count = BalanceCheckpoint.rebuild()
+        db.session.commit()
+        print(f"Rebuilt {count} balance checkpoints!")
+
+@app.cli.command()
+def archive_transactions():
+    """Move transactions from closed months into compressed archive segments"""
+    with app.app_context():
+        cutoff = TransactionArchive.closed_month_cutoff(app.config['TRANSACTION_HOT_MONTHS'])
+        count = TransactionArchive.archive_before(cutoff)
+        db.session.commit()
+        print(f"Archived {count} transactions created before {cutoff:%Y-%m-%d}!")
+
+@app.cli.command()
+def rebuild_dashboard():
+    """Recompute dashboard aggregates from invoices, expenses, payments and wallets"""
+    with app.app_context():
+        count = DashboardAggregate.rebuild()
+        db.session.commit()
+        print(f"Rebuilt {count} dashboard aggregates!")
+
 @app.cli.command()
 def test():
     """Run the test suite"""
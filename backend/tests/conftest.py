@@ -0,0 +1,129 @@
+from datetime import datetime, timedelta
+from decimal import Decimal
+import os
+import sys
+import uuid
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# CI provides PostgreSQL as DATABASE_URL; fall back to in-memory SQLite locally
+os.environ.setdefault('DATABASE_TEST_URL', os.getenv('DATABASE_URL') or 'sqlite://')
+
+from flask_jwt_extended import create_access_token
+from sqlalchemy import insert
+
+from app import create_app, db, limiter
+from app.models.business import Business
+from app.models.user import User
+from app.models.wallet import Wallet, Transaction, BalanceCheckpoint
+
+# Transactions every 3 days from January, so several closed months get archived
+HISTORY_START = datetime(2024, 1, 1, 9, 30)
+HISTORY_STEP = timedelta(days=3, hours=5)
+HISTORY_LENGTH = 40
+
+@pytest.fixture(scope='session')
+def app():
+    """Application built from the testing config"""
+    app = create_app('testing')
+    # Tests page through endpoints far faster than the per-route limits allow
+    limiter.enabled = False
+    return app
+
+@pytest.fixture(autouse=True)
+def _push_request_context():
+    """Override pytest-flask's fixture of the same name
+    
+    It keeps a request context pushed for the whole test, which test client
+    requests would then share (along with ``g`` and the database session).
+    """
+
+@pytest.fixture(autouse=True)
+def database(app):
+    """Fresh schema for every test
+    
+    No app context is held while the test runs: requests through the test
+    client must get their own context (and session), as they do in production.
+    """
+    with app.app_context():
+        db.create_all()
+    yield db
+    with app.app_context():
+        db.session.remove()
+        db.drop_all()
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+@pytest.fixture
+def business(app):
+    """A business and its owner, returned as (business_id, owner_id)"""
+    with app.app_context():
+        user = User(
+            email='owner@example.com',
+            password='password123',
+            first_name='Test',
+            last_name='Owner'
+        )
+        db.session.add(user)
+        db.session.flush()
+        
+        business = Business(name='Test Business', owner_id=user.id, currency='USD')
+        db.session.add(business)
+        db.session.commit()
+        return business.id, user.id
+
+@pytest.fixture
+def auth_headers(app, business):
+    """Bearer token headers for the business owner"""
+    with app.app_context():
+        token = create_access_token(identity=str(business[1]))
+    return {'Authorization': f'Bearer {token}'}
+
+@pytest.fixture
+def wallet_history(app, business):
+    """A wallet with a few months of history, returned as (wallet_id, history)
+    
+    ``history`` lists (created_at, balance_after) for every transaction,
+    oldest first, to check lookups against.
+    """
+    business_id = business[0]
+    with app.app_context():
+        wallet = Wallet(
+            name='Operating',
+            currency='USD',
+            balance=Decimal('0'),
+            business_id=business_id,
+            created_at=HISTORY_START - timedelta(days=30)
+        )
+        db.session.add(wallet)
+        db.session.flush()
+        
+        balance = Decimal('0')
+        history = []
+        rows = []
+        for position in range(HISTORY_LENGTH):
+            created_at = HISTORY_START + position * HISTORY_STEP
+            transaction_type = 'debit' if position % 4 == 3 else 'credit'
+            amount = Decimal(25 + position)
+            balance += amount if transaction_type == 'credit' else -amount
+            history.append((created_at, balance))
+            rows.append({
+                'id': uuid.uuid4(),
+                'wallet_id': wallet.id,
+                'transaction_type': transaction_type,
+                'amount': amount,
+                'description': f'Transaction {position}',
+                'balance_after': balance,
+                'transaction_metadata': {},
+                'tags': [],
+                'created_at': created_at
+            })
+        db.session.execute(insert(Transaction), rows)
+        wallet.balance = balance
+        BalanceCheckpoint.rebuild(wallet.id)
+        db.session.commit()
+        return wallet.id, history
\ No newline at end of file
@@ -0,0 +1,52 @@
+VALID_INVOICE = {
+    'client_name': 'Client',
+    'issue_date': '2024-01-01',
+    'due_date': '2024-02-01',
+    'items': [{'description': 'Work', 'unit_price': '12.50', 'quantity': 2}]
+}
+
+def _item(**values):
+    return dict(VALID_INVOICE, items=[dict({'description': 'Work', 'unit_price': 5}, **values)])
+
+INVALID_INVOICES = [
+    # Types
+    dict(VALID_INVOICE, issue_date=123),
+    dict(VALID_INVOICE, client_name=['Client']),
+    dict(VALID_INVOICE, client_email=42),
+    dict(VALID_INVOICE, currency={'code': 'USD'}),
+    _item(description=7),
+    _item(unit_price=True),
+    _item(unit_price=None),
+    # Values that are not finite or below zero
+    _item(unit_price='inf'),
+    _item(unit_price='NaN'),
+    _item(quantity=-1),
+    # Values that do not fit their columns
+    dict(VALID_INVOICE, currency='USDX'),
+    dict(VALID_INVOICE, client_phone='5' * 21),
+    dict(VALID_INVOICE, client_email='a' * 250 + '@example.com'),
+    _item(description='w' * 501),
+    _item(unit_price='1e20'),
+    _item(unit_price='99999999.999'),
+    _item(unit_price=60000, quantity=2000),
+    dict(VALID_INVOICE, items=[{'description': 'Work', 'unit_price': 60000000}] * 2),
+    # Missing fields
+    {'client_name': 'Missing dates'},
+    'not an invoice'
+]
+
+def test_bulk_invoices_report_row_errors(client, auth_headers, business):
+    response = client.post('/api/v1/invoices/bulk', headers=auth_headers, json={
+        'invoices': [VALID_INVOICE] + INVALID_INVOICES + [_item(unit_price='99999999.99')]
+    })
+    assert response.status_code == 201, response.json
+    
+    data = response.json['data']
+    assert data['created'] == 2
+    assert data['failed'] == len(INVALID_INVOICES)
+    assert [result['status'] for result in data['results']] == (
+        ['created'] + ['error'] * len(INVALID_INVOICES) + ['created']
+    )
+    
+    listed = client.get('/api/v1/invoices/', headers=auth_headers).json['data']
+    assert sorted(invoice['financial']['total_amount'] for invoice in listed) == [25, 99999999.99]
\ No newline at end of file
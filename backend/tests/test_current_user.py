@@ -0,0 +1,54 @@
+from sqlalchemy import update
+
+from app import db
+from app.models.user import User
+from app.utils.current_user import user_cache, SNAPSHOT_COLUMNS
+
+def _cached_snapshot(client, auth_headers, owner_id):
+    """Warm the user cache through a route that only checks the role"""
+    user_cache.clear()
+    response = client.get('/api/v1/users/', headers=auth_headers)
+    assert response.status_code == 403
+    return user_cache.get(str(owner_id))
+
+def test_snapshot_only_holds_role_and_active_columns(client, auth_headers, business):
+    snapshot = _cached_snapshot(client, auth_headers, business[1])
+    assert snapshot is not None
+    assert set(SNAPSHOT_COLUMNS) <= set(vars(snapshot))
+    assert 'password_hash' not in vars(snapshot)
+    assert 'email' not in vars(snapshot)
+
+def test_password_change_checks_the_stored_hash(app, client, auth_headers, business):
+    owner_id = business[1]
+    _cached_snapshot(client, auth_headers, owner_id)
+    
+    # Another worker changes the password; this process' cache is not told
+    with app.app_context():
+        new_hash = db.session.get(User, owner_id)._hash_password('rotated-secret')
+        db.session.execute(update(User).where(User.id == owner_id).values(password_hash=new_hash))
+        db.session.commit()
+    assert user_cache.get(str(owner_id)) is not None
+    
+    response = client.post('/api/v1/auth/change-password', headers=auth_headers, json={
+        'current_password': 'password123', 'new_password': 'attacker-choice'
+    })
+    assert response.status_code == 401
+    
+    response = client.post('/api/v1/auth/change-password', headers=auth_headers, json={
+        'current_password': 'rotated-secret', 'new_password': 'another-secret'
+    })
+    assert response.status_code == 200, response.json
+
+def test_profile_update_returns_stored_values(app, client, auth_headers, business):
+    owner_id = business[1]
+    _cached_snapshot(client, auth_headers, owner_id)
+    
+    with app.app_context():
+        db.session.execute(update(User).where(User.id == owner_id).values(phone='+15550100'))
+        db.session.commit()
+    
+    response = client.put('/api/v1/auth/profile', headers=auth_headers, json={'first_name': 'Renamed'})
+    assert response.status_code == 200, response.json
+    user = response.json['data']['user']
+    assert user['first_name'] == 'Renamed'
+    assert user['phone'] == '+15550100'
\ No newline at end of file
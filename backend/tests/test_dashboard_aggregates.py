@@ -0,0 +1,223 @@
+from datetime import date
+from decimal import Decimal
+import io
+
+import pytest
+from sqlalchemy import event
+
+from app import db
+from app.models.dashboard import DashboardAggregate
+from app.models.expense import Expense, ExpenseCategory
+from app.models.invoice import Invoice
+from app.models.payment import Payment
+from app.models.wallet import Wallet
+
+def _aggregates(business_id):
+    """Current aggregate rows for a business, leaving out rows that net to zero"""
+    return {
+        (row.metric, row.period, row.dimension): (row.value, row.count)
+        for row in DashboardAggregate.query.filter_by(business_id=business_id)
+        if row.value or row.count
+    }
+
+def _assert_matches_rebuild(app, business_id):
+    with app.app_context():
+        incremental = _aggregates(business_id)
+        DashboardAggregate.rebuild(business_id)
+        db.session.commit()
+        rebuilt = _aggregates(business_id)
+    assert incremental == rebuilt
+    return rebuilt
+
+@pytest.fixture
+def records(app, business):
+    """Categories, wallets and a few records written through the ORM, returned as ids"""
+    business_id, owner_id = business
+    with app.app_context():
+        travel = ExpenseCategory(name='Travel', business_id=business_id)
+        office = ExpenseCategory(name='Office', business_id=business_id)
+        operating = Wallet(name='Operating', currency='USD', balance=Decimal('1000'), business_id=business_id)
+        savings = Wallet(name='Savings', currency='USD', balance=Decimal('250'), business_id=business_id)
+        euro = Wallet(name='Euro', currency='EUR', balance=Decimal('80'), business_id=business_id)
+        db.session.add_all([travel, office, operating, savings, euro])
+        db.session.flush()
+        
+        invoices = [
+            Invoice(
+                invoice_number=f'INV-TEST-{position}',
+                client_name=f'Client {position}',
+                issue_date=date(2024, 1, 5),
+                due_date=date(2024, 2, 5),
+                total_amount=Decimal(100 * (position + 1)),
+                status='sent' if position else 'draft',
+                business_id=business_id
+            )
+            for position in range(3)
+        ]
+        expenses = [
+            Expense(
+                description=f'Expense {position}',
+                amount=Decimal(10 + position),
+                date=date(2024, 1, 10 + position),
+                category_id=(travel.id, office.id, None)[position % 3],
+                business_id=business_id,
+                created_by=owner_id
+            )
+            for position in range(4)
+        ]
+        payments = [
+            Payment(
+                payment_type=('incoming', 'outgoing')[position % 2],
+                amount=Decimal(40 + position),
+                status='pending',
+                business_id=business_id
+            )
+            for position in range(4)
+        ]
+        db.session.add_all(invoices + expenses + payments)
+        db.session.commit()
+        
+        return {
+            'categories': (travel.id, office.id),
+            'wallets': (operating.id, savings.id, euro.id),
+            'invoices': [invoice.id for invoice in invoices],
+            'expenses': [expense.id for expense in expenses],
+            'payments': [payment.id for payment in payments]
+        }
+
+def test_orm_writes_match_rebuild(app, business, records):
+    business_id = business[0]
+    travel_id = records['categories'][0]
+    operating_id, savings_id, euro_id = records['wallets']
+    
+    with app.app_context():
+        # Invoices: send, pay, cancel and delete
+        first, second, third = (db.session.get(Invoice, invoice_id) for invoice_id in records['invoices'])
+        first.status = 'sent'
+        first.paid_amount = Decimal('30')
+        second.mark_as_paid(Decimal('150'))
+        third.total_amount = Decimal('275')
+        db.session.commit()
+        third.status = 'cancelled'
+        db.session.delete(first)
+        db.session.commit()
+        
+        # Expenses: change amount, category and month, reject and delete
+        first, second, third, fourth = (db.session.get(Expense, expense_id) for expense_id in records['expenses'])
+        first.amount = Decimal('99.50')
+        second.category_id = travel_id
+        second.date = date(2024, 2, 1)
+        third.status = 'rejected'
+        db.session.delete(fourth)
+        db.session.commit()
+        third.status = 'approved'
+        db.session.commit()
+        
+        # Payments: complete some, fail one
+        first, second, third, _ = (db.session.get(Payment, payment_id) for payment_id in records['payments'])
+        first.complete_payment()
+        second.process_payment()
+        db.session.commit()
+        second.complete_payment()
+        third.fail_payment('Declined')
+        db.session.commit()
+        
+        # Wallets: move funds, transfer, deactivate
+        operating, savings, euro = (db.session.get(Wallet, wallet_id) for wallet_id in (operating_id, savings_id, euro_id))
+        operating.add_funds(Decimal('500'), 'Deposit')
+        operating.add_funds(Decimal('120'), 'Rent', transaction_type='debit')
+        Wallet.transfer(operating, savings, Decimal('75'), 'Move to savings')
+        db.session.commit()
+        euro.is_active = False
+        db.session.commit()
+    
+    rebuilt = _assert_matches_rebuild(app, business_id)
+    assert rebuilt[('wallet_balance', '', 'USD')] == (Decimal('1630.00'), 2)
+    assert ('wallet_balance', '', 'EUR') not in rebuilt
+
+def test_aggregates_are_written_after_wallet_locks(app, business, records):
+    operating_id, savings_id, _ = records['wallets']
+    
+    with app.app_context():
+        statements = []
+        engine = db.engine
+        
+        def capture(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement.split(None, 3)[:3])
+        
+        event.listen(engine, 'before_cursor_execute', capture)
+        try:
+            operating, savings = (db.session.get(Wallet, wallet_id) for wallet_id in (operating_id, savings_id))
+            Wallet.transfer(operating, savings, Decimal('10'), 'Move')
+            Wallet.transfer(savings, operating, Decimal('4'), 'Back')
+            savings.add_funds(Decimal('25'), 'Deposit')
+            db.session.commit()
+        finally:
+            event.remove(engine, 'before_cursor_execute', capture)
+    
+    touched = [' '.join(words).lower() for words in statements]
+    aggregate_writes = [position for position, words in enumerate(touched) if 'dashboard_aggregates' in words]
+    wallet_writes = [position for position, words in enumerate(touched) if words.startswith('update wallets')]
+    # One upsert for the whole transaction, after every wallet row is locked
+    assert len(aggregate_writes) == 1
+    assert len(wallet_writes) == 5
+    assert aggregate_writes[0] > max(wallet_writes)
+    
+    _assert_matches_rebuild(app, business[0])
+
+def test_bulk_and_route_writes_match_rebuild(app, client, auth_headers, business, records):
+    business_id = business[0]
+    
+    response = client.post('/api/v1/invoices/bulk', headers=auth_headers, json={'invoices': [
+        {
+            'client_name': f'Bulk client {position}',
+            'issue_date': '2024-03-01',
+            'due_date': '2024-04-01',
+            'items': [{'description': 'Work', 'unit_price': 50, 'quantity': position + 1}]
+        }
+        for position in range(3)
+    ]})
+    assert response.status_code == 201, response.json
+    
+    response = client.post(
+        f"/api/v1/invoices/{records['invoices'][1]}/mark-paid",
+        headers=auth_headers, json={'amount': 120}
+    )
+    assert response.status_code == 200, response.json
+    
+    upload = 'description,amount,date,category\nFlights,300,2024-03-04,Travel\nPaper,12.5,2024-03-09,Office\nMisc,7,2024-04-02,\n'
+    response = client.post(
+        '/api/v1/expenses/import', headers=auth_headers,
+        data={'file': (io.BytesIO(upload.encode('utf-8')), 'expenses.csv')}
+    )
+    assert response.status_code == 201, response.json
+    assert response.json['data']['imported'] == 3
+    
+    response = client.put(
+        f"/api/v1/expenses/{records['expenses'][0]}", headers=auth_headers,
+        json={'amount': 42, 'date': '2024-03-15'}
+    )
+    assert response.status_code == 200, response.json
+    
+    response = client.delete(f"/api/v1/expenses/{records['expenses'][1]}", headers=auth_headers)
+    assert response.status_code == 200, response.json
+    
+    response = client.post('/api/v1/payments/bulk/status', headers=auth_headers, json={
+        'action': 'complete',
+        'payment_ids': [str(payment_id) for payment_id in records['payments'][:3]]
+    })
+    assert response.status_code == 200, response.json
+    
+    rebuilt = _assert_matches_rebuild(app, business_id)
+    # The imported flight plus the first expense, moved to March
+    assert rebuilt[('expenses', '2024-03', str(records['categories'][0]))] == (Decimal('342.00'), 2)
+
+def test_dashboard_reads_aggregates(app, client, auth_headers, business, records):
+    response = client.get('/api/v1/dashboard', headers=auth_headers, query_string={'month': '2024-1'})
+    assert response.status_code == 200, response.json
+    
+    data = response.json['data']
+    assert data['period'] == '2024-01'
+    assert data['expenses']['total'] == 10 + 11 + 12 + 13
+    assert data['expenses']['count'] == 4
+    assert data['receivables']['outstanding'] == 200 + 300
\ No newline at end of file
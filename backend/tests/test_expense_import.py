@@ -0,0 +1,50 @@
+import io
+from decimal import Decimal
+
+from app import db
+from app.models.expense import Expense
+
+def _import(client, auth_headers, text):
+    return client.post(
+        '/api/v1/expenses/import', headers=auth_headers,
+        data={'file': (io.BytesIO(text.encode('utf-8')), 'expenses.csv')}
+    )
+
+def test_import_reads_multipart_upload(app, client, auth_headers, business):
+    # Byte order mark, CRLF line endings and a quoted field spanning lines
+    upload = '\ufeffDescription,Amount,Date,Vendor\r\n"Team\r\nlunch",42.50,2024-03-04,Cafe\r\nPaper,7,2024-03-09,\r\n'
+    response = _import(client, auth_headers, upload)
+    assert response.status_code == 201, response.json
+    assert response.json['data'] == {'imported': 2, 'failed': 0, 'errors': []}
+    
+    with app.app_context():
+        rows = {expense.description: expense for expense in Expense.query.filter_by(business_id=business[0])}
+        assert rows['Team\r\nlunch'].amount == Decimal('42.50')
+        assert rows['Team\r\nlunch'].vendor == 'Cafe'
+        assert rows['Paper'].vendor is None
+
+def test_import_reports_unstorable_rows(app, client, auth_headers, business):
+    upload = '\n'.join([
+        'description,amount,date,vendor',
+        'Good,10,2024-03-04,',
+        'Infinite,inf,2024-03-04,',
+        'Spelled out,Infinity,2024-03-04,',
+        'Not a number,NaN,2024-03-04,',
+        'Too large,1e20,2024-03-04,',
+        'Rounds too large,99999999.999,2024-03-04,',
+        'Negative,-5,2024-03-04,',
+        'Words,ten,2024-03-04,',
+        f"Long vendor,5,2024-03-04,{'v' * 256}",
+        'Largest,99999999.99,2024-03-04,'
+    ]) + '\n'
+    response = _import(client, auth_headers, upload)
+    assert response.status_code == 201, response.json
+    
+    data = response.json['data']
+    assert data['imported'] == 2
+    assert data['failed'] == 8
+    assert [error['line'] for error in data['errors']] == list(range(3, 11))
+    
+    with app.app_context():
+        amounts = sorted(amount for amount, in db.session.query(Expense.amount).filter_by(business_id=business[0]))
+        assert amounts == [Decimal('10.00'), Decimal('99999999.99')]
\ No newline at end of file
@@ -0,0 +1,50 @@
+import uuid
+
+import pytest
+
+@pytest.mark.parametrize('path', [
+    '/api/v1/expenses/not-a-uuid',
+    '/api/v1/invoices/not-a-uuid',
+    '/api/v1/wallet/not-a-uuid/transactions',
+    '/api/v1/users/not-a-uuid'
+])
+def test_malformed_path_ids_are_not_found(client, auth_headers, path):
+    assert client.get(path, headers=auth_headers).status_code == 404
+
+def test_users_can_read_only_their_own_profile(client, auth_headers, business):
+    owner_id = business[1]
+    response = client.get(f'/api/v1/users/{owner_id}', headers=auth_headers)
+    assert response.status_code == 200, response.json
+    assert response.json['data']['id'] == str(owner_id)
+    
+    response = client.get(f'/api/v1/users/{uuid.uuid4()}', headers=auth_headers)
+    assert response.status_code == 403
+
+@pytest.mark.parametrize('path, query_string', [
+    ('/api/v1/expenses/', {'category_id': 'nope'}),
+    ('/api/v1/expenses/export.csv', {'category_id': 'nope'}),
+    ('/api/v1/payroll/payrolls', {'employee_id': 'nope'}),
+    ('/api/v1/tax/records', {'period_id': 'nope'})
+])
+def test_malformed_id_filters_are_rejected(client, auth_headers, business, path, query_string):
+    response = client.get(path, headers=auth_headers, query_string=query_string)
+    assert response.status_code == 400
+
+def test_body_ids_are_bound_as_uuids(client, auth_headers, business):
+    response = client.post('/api/v1/expenses/categories', headers=auth_headers, json={'name': 'Travel'})
+    assert response.status_code == 201, response.json
+    category_id = response.json['data']['id']
+    
+    response = client.post('/api/v1/expenses/', headers=auth_headers, json={
+        'description': 'Flight', 'amount': 120, 'date': '2024-03-04', 'category_id': category_id
+    })
+    assert response.status_code == 201, response.json
+    assert response.json['data']['category_id'] == category_id
+    
+    response = client.get('/api/v1/expenses/', headers=auth_headers, query_string={'category_id': category_id})
+    assert [expense['description'] for expense in response.json['data']] == ['Flight']
+    
+    response = client.post('/api/v1/expenses/', headers=auth_headers, json={
+        'description': 'Flight', 'amount': 120, 'date': '2024-03-04', 'category_id': 'nope'
+    })
+    assert response.status_code == 400
\ No newline at end of file
@@ -0,0 +1,60 @@
+from datetime import date
+from decimal import Decimal
+
+import pytest
+
+from app import db
+from app.models.expense import Expense
+
+@pytest.fixture
+def expense_ids(app, business):
+    """Expenses sharing dates, so the keyset has to break ties on id"""
+    business_id, owner_id = business
+    with app.app_context():
+        expenses = [
+            Expense(
+                description=f'Expense {position}',
+                amount=Decimal('10'),
+                date=date(2024, 1, 1 + position // 3),
+                business_id=business_id,
+                created_by=owner_id
+            )
+            for position in range(14)
+        ]
+        db.session.add_all(expenses)
+        db.session.commit()
+        return {str(expense.id) for expense in expenses}
+
+@pytest.mark.parametrize('per_page', [1, 4, 14, 100])
+def test_cursor_pages_cover_every_row_once(client, auth_headers, expense_ids, per_page):
+    seen = []
+    cursor = ''
+    while True:
+        response = client.get('/api/v1/expenses/', headers=auth_headers, query_string={
+            'cursor': cursor, 'per_page': per_page, 'include_total': 'true'
+        })
+        assert response.status_code == 200, response.json
+        assert response.json['pagination']['total'] == len(expense_ids)
+        assert len(response.json['data']) <= per_page
+        seen += [(row['date'], row['id']) for row in response.json['data']]
+        
+        cursor = response.json['pagination']['next_cursor']
+        if cursor is None:
+            break
+    
+    assert {row_id for _, row_id in seen} == expense_ids
+    assert len(seen) == len(expense_ids)
+    assert seen == sorted(seen, reverse=True)
+
+@pytest.mark.parametrize('query_string', [
+    {'cursor': '', 'per_page': 0},
+    {'cursor': '', 'per_page': -5},
+    {'page': 1, 'per_page': 0}
+])
+def test_per_page_below_one_is_rejected(client, auth_headers, expense_ids, query_string):
+    response = client.get('/api/v1/expenses/', headers=auth_headers, query_string=query_string)
+    assert response.status_code == 400
+
+def test_invalid_cursor_is_rejected(client, auth_headers, expense_ids):
+    response = client.get('/api/v1/expenses/', headers=auth_headers, query_string={'cursor': 'not-a-cursor'})
+    assert response.status_code == 400
\ No newline at end of file
@@ -0,0 +1,72 @@
+from datetime import date
+from decimal import Decimal
+import uuid
+
+import pytest
+
+from app import db
+from app.models.payroll import Employee
+
+@pytest.fixture
+def employee_ids(app, business):
+    """Two active hourly employees paid weekly, returned as string ids"""
+    with app.app_context():
+        employees = [
+            Employee(
+                employee_id=f'EMP-{position}',
+                first_name='Test',
+                last_name=f'Employee {position}',
+                hire_date=date(2023, 1, 1),
+                hourly_rate=Decimal('20'),
+                pay_frequency='weekly',
+                business_id=business[0]
+            )
+            for position in range(2)
+        ]
+        db.session.add_all(employees)
+        db.session.commit()
+        return [str(employee.id) for employee in employees]
+
+def _run(client, auth_headers, **values):
+    return client.post('/api/v1/payroll/payrolls/run', headers=auth_headers, json=dict({
+        'payroll_period': 'weekly',
+        'start_date': '2024-03-04',
+        'end_date': '2024-03-10'
+    }, **values))
+
+def test_run_pays_every_employee(client, auth_headers, employee_ids):
+    first, second = employee_ids
+    response = _run(
+        client, auth_headers,
+        hours={first: {'regular_hours': 40, 'overtime_hours': 2}},
+        social_security_rate='0.062', medicare_rate=0.0145
+    )
+    assert response.status_code == 201, response.json
+    
+    data = response.json['data']
+    assert data['created'] == 2
+    gross = {payroll['employee_id']: payroll['gross_pay'] for payroll in data['payrolls']}
+    assert gross == {first: 860, second: 800}
+    # Social security 53.32 + 49.60, medicare 12.47 + 11.60
+    assert data['totals']['total_deductions'] == 126.99
+
+@pytest.mark.parametrize('rate', ['abc', 'NaN', 'inf', -0.01, 1.5, True, [0.1]])
+@pytest.mark.parametrize('key', ['social_security_rate', 'medicare_rate'])
+def test_run_rejects_invalid_rates(client, auth_headers, employee_ids, key, rate):
+    response = _run(client, auth_headers, **{key: rate})
+    assert response.status_code == 400, response.json
+
+@pytest.mark.parametrize('entry', [{'regular_hours': -1}, {'overtime_hours': '5'}, {'regular_hours': True}, 40])
+def test_run_rejects_invalid_hours(client, auth_headers, employee_ids, entry):
+    response = _run(client, auth_headers, hours={employee_ids[0]: entry})
+    assert response.status_code == 400
+    assert employee_ids[0] in response.json['error']['message']
+
+def test_run_rejects_hours_for_employees_outside_the_run(client, auth_headers, employee_ids):
+    stranger = str(uuid.uuid4())
+    response = _run(client, auth_headers, hours={employee_ids[0]: {'regular_hours': 40}, stranger: {'regular_hours': 8}})
+    assert response.status_code == 400
+    assert stranger in response.json['error']['message']
+    
+    # Nothing was paid, so the run can still go ahead
+    assert _run(client, auth_headers).status_code == 201
\ No newline at end of file
@@ -0,0 +1,92 @@
+from datetime import datetime
+
+from app import db
+from app.models.wallet import Transaction, TransactionArchive
+
+ARCHIVE_CUTOFF = datetime(2024, 3, 1)
+
+def _offset_pages(client, headers, wallet_id, per_page, **params):
+    """Fetch every page of a wallet's transactions by page number"""
+    pages = []
+    page = 1
+    while True:
+        response = client.get(
+            f'/api/v1/wallet/{wallet_id}/transactions',
+            headers=headers,
+            query_string=dict(params, page=page, per_page=per_page)
+        )
+        assert response.status_code == 200, response.json
+        pages.append((response.json['data'], response.json['pagination']))
+        if not response.json['pagination']['has_next']:
+            return pages
+        page += 1
+
+def _cursor_pages(client, headers, wallet_id, per_page, **params):
+    """Fetch every page of a wallet's transactions by following cursors"""
+    pages = []
+    cursor = ''
+    while True:
+        response = client.get(
+            f'/api/v1/wallet/{wallet_id}/transactions',
+            headers=headers,
+            query_string=dict(params, cursor=cursor, per_page=per_page, include_total='true')
+        )
+        assert response.status_code == 200, response.json
+        pages.append((response.json['data'], response.json['pagination']))
+        cursor = response.json['pagination']['next_cursor']
+        if cursor is None:
+            return pages
+
+def _all_pages(client, headers, wallet_id):
+    return {
+        (mode, per_page, transaction_type): fetch(
+            client, headers, wallet_id, per_page,
+            **({'transaction_type': transaction_type} if transaction_type else {})
+        )
+        for mode, fetch in (('page', _offset_pages), ('cursor', _cursor_pages))
+        for per_page in (1, 7, 100)
+        for transaction_type in (None, 'debit')
+    }
+
+def _archive(app):
+    with app.app_context():
+        archived = TransactionArchive.archive_before(ARCHIVE_CUTOFF)
+        db.session.commit()
+        return archived
+
+def test_archived_pages_match_pre_archive_results(app, client, auth_headers, wallet_history):
+    wallet_id, history = wallet_history
+    before = _all_pages(client, auth_headers, wallet_id)
+    
+    archived = _archive(app)
+    assert archived == sum(1 for created_at, _ in history if created_at < ARCHIVE_CUTOFF)
+    with app.app_context():
+        assert Transaction.query.filter_by(wallet_id=wallet_id).count() == len(history) - archived
+    
+    after = _all_pages(client, auth_headers, wallet_id)
+    assert after == before
+    
+    # Every transaction appears exactly once, newest first
+    rows = [row for data, _ in before[('cursor', 7, None)] for row in data]
+    assert len({row['id'] for row in rows}) == len(history)
+    assert [row['created_at'] for row in rows] == sorted((row['created_at'] for row in rows), reverse=True)
+
+def test_archived_totals_match_pre_archive_totals(app, client, auth_headers, wallet_history):
+    wallet_id, history = wallet_history
+    
+    def totals():
+        return {
+            transaction_type: client.get(
+                f'/api/v1/wallet/{wallet_id}/transactions',
+                headers=auth_headers,
+                query_string={'transaction_type': transaction_type} if transaction_type else {}
+            ).json['pagination']['total']
+            for transaction_type in (None, 'credit', 'debit')
+        }
+    
+    before = totals()
+    assert before[None] == len(history)
+    assert before['credit'] + before['debit'] == len(history)
+    
+    _archive(app)
+    assert totals() == before
\ No newline at end of file
@@ -0,0 +1,45 @@
+from datetime import datetime, timedelta
+from decimal import Decimal
+
+import pytest
+
+from app import db
+from app.models.wallet import Wallet, BalanceCheckpoint, TransactionArchive
+
+def _brute_force_balance(history, at):
+    """Balance after the last transaction at or before ``at``, zero before the first"""
+    balance = Decimal('0')
+    for created_at, balance_after in history:
+        if created_at > at:
+            break
+        balance = balance_after
+    return balance
+
+def _probe_times(history):
+    """Points in time around, between and on every transaction"""
+    times = [history[0][0] - timedelta(days=10), history[-1][0] + timedelta(days=10)]
+    for created_at, _ in history:
+        times += [created_at, created_at - timedelta(seconds=1), created_at + timedelta(hours=12)]
+    return times
+
+@pytest.mark.parametrize('archived', [False, True])
+def test_balance_at_matches_brute_force(app, wallet_history, archived):
+    wallet_id, history = wallet_history
+    with app.app_context():
+        if archived:
+            assert TransactionArchive.archive_before(datetime(2024, 3, 1)) > 0
+            db.session.commit()
+        
+        wallet = db.session.get(Wallet, wallet_id)
+        for at in _probe_times(history):
+            assert wallet.balance_at(at) == _brute_force_balance(history, at), at
+
+def test_balance_at_without_checkpoints_matches_brute_force(app, wallet_history):
+    wallet_id, history = wallet_history
+    with app.app_context():
+        BalanceCheckpoint.query.delete()
+        db.session.commit()
+        
+        wallet = db.session.get(Wallet, wallet_id)
+        for at in _probe_times(history):
+            assert wallet.balance_at(at) == _brute_force_balance(history, at), at
\ No newline at end of file